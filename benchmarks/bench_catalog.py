@@ -0,0 +1,189 @@
+"""
+Набор замеров скорости и памяти основных путей каталога на синтетических данных.
+
+Запуск из корня проекта:
+    python -m benchmarks.bench_catalog --products 100000 --output results.json
+    python -m benchmarks.bench_catalog --products 100000 --compare results.json --threshold 0.2
+"""
+
+import argparse
+import json
+import os
+import platform
+import random
+import sys
+import tempfile
+import time
+import tracemalloc
+
+from src.load_products import load_categories_from_json
+from src.main import Category, Order, Product
+from src.product_logging import bulk_load
+
+
+def generate_catalog(products: int, categories: int = 10, seed: int = 0) -> list:
+    """Создает данные каталога в формате products.json: смесь Product, Smartphone и LawnGrass."""
+    rng = random.Random(seed)
+    data = [
+        {"name": f"Категория {i}", "description": "Синтетическая категория", "products": []} for i in range(categories)
+    ]
+    for i in range(products):
+        product = {
+            "name": f"Товар {i}",
+            "description": "Синтетический товар",
+            "price": round(rng.uniform(10, 200000), 2),
+            "quantity": rng.randint(1, 100),
+        }
+        kind = rng.random()
+        if kind < 0.3:
+            product.update(
+                efficiency=rng.choice(["A16", "SD8", "Tensor"]),
+                model=rng.choice(["Pro", "Max", "Lite"]),
+                memory=rng.choice([128, 256, 512]),
+                color=rng.choice(["Gray", "Black", "White"]),
+            )
+        elif kind < 0.5:
+            product.update(
+                country=rng.choice(["Россия", "Германия", "Нидерланды"]),
+                germination_period=rng.choice(["1 неделя", "2 недели", "3 недели"]),
+                color=rng.choice(["Зелёный", "Изумрудный"]),
+            )
+        data[i % categories]["products"].append(product)
+    return data
+
+
+def _measure(func, memory: bool, repeat: int, setup=None) -> dict:
+    """
+    Лучшее время из repeat запусков и пиковая память отдельного запуска под tracemalloc.
+    setup, если задан, вызывается перед каждым запуском и в замер не входит.
+    """
+    timings = []
+    for _ in range(repeat):
+        if setup is not None:
+            setup()
+        start = time.perf_counter()
+        func()
+        timings.append(time.perf_counter() - start)
+    result = {"seconds": min(timings)}
+    if memory:
+        if setup is not None:
+            setup()
+        tracemalloc.start()
+        func()
+        result["peak_bytes"] = tracemalloc.get_traced_memory()[1]
+        tracemalloc.stop()
+    return result
+
+
+def run(products: int, categories: int = 10, memory: bool = True, repeat: int = 3, seed: int = 0) -> dict:
+    """Выполняет все замеры и возвращает результаты в виде словаря для сохранения в JSON."""
+    data = generate_catalog(products, categories, seed)
+    records = [record for category in data for record in category["products"]]
+    with tempfile.TemporaryDirectory() as tmp:
+        file_path = os.path.join(tmp, "catalog.json")
+        with open(file_path, "w", encoding="utf-8") as file:
+            json.dump(data, file, ensure_ascii=False)
+
+        loaded = load_categories_from_json(file_path)
+        biggest = max(loaded, key=lambda category: len(category.products))
+        # Отдельная категория над теми же товарами, созданная один раз вне замеров
+        with bulk_load():
+            rendered = Category(biggest.name, biggest.description, list(biggest.products))
+        sample = biggest.products[: min(len(biggest.products), 10000)]
+
+        def new_products():
+            # Товары сохраняются в список, как при загрузке: иначе не учитывается работа сборщика мусора
+            with bulk_load():
+                return [Product.new_product(record) for record in records]
+
+        def new_products_bulk():
+            return Product.new_products(records)
+
+        def middle_price():
+            for category in loaded:
+                category.middle_price()
+
+        def reset_render_caches():
+            Product.render_cache.clear()
+            rendered._formatted = None
+
+        def formatted_products():
+            rendered.formatted_products()
+
+        def orders():
+            for product in sample:
+                Order(product, 1)
+
+        benchmarks = {
+            "load_categories_from_json": lambda: load_categories_from_json(file_path),
+            "new_product": new_products,
+            "new_products": new_products_bulk,
+            "middle_price": middle_price,
+            "formatted_products": formatted_products,
+            "order_creation": orders,
+        }
+        setups = {"formatted_products": reset_render_caches}
+        results = {name: _measure(func, memory, repeat, setups.get(name)) for name, func in benchmarks.items()}
+
+    return {
+        "meta": {
+            "products": products,
+            "categories": categories,
+            "repeat": repeat,
+            "python": platform.python_version(),
+            "machine": platform.machine(),
+            "timestamp": time.time(),
+        },
+        "results": results,
+    }
+
+
+def compare_results(current: dict, baseline: dict, threshold: float = 0.2) -> list:
+    """
+    Сравнивает результаты с базовыми и возвращает список регрессий - строк с описанием
+    замеров, у которых время или пиковая память выросли больше чем на threshold.
+    """
+    regressions = []
+    for name, result in current["results"].items():
+        base = baseline["results"].get(name)
+        if base is None:
+            continue
+        for metric in ("seconds", "peak_bytes"):
+            if metric in result and metric in base and base[metric] > 0:
+                change = result[metric] / base[metric] - 1
+                if change > threshold:
+                    regressions.append(f"{name}.{metric}: {base[metric]:.6g} -> {result[metric]:.6g} (+{change:.0%})")
+    return regressions
+
+
+def main(argv=None) -> int:
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--products", type=int, default=10000, help="число товаров (от 10^3 до 10^7)")
+    parser.add_argument("--categories", type=int, default=10)
+    parser.add_argument("--repeat", type=int, default=3, help="число запусков, берется лучшее время")
+    parser.add_argument("--no-memory", action="store_true", help="не замерять пиковую память")
+    parser.add_argument("--output", help="файл для сохранения результатов в JSON")
+    parser.add_argument("--compare", help="файл с базовыми результатами для проверки регрессий")
+    parser.add_argument("--threshold", type=float, default=0.2, help="допустимый рост относительно базы")
+    args = parser.parse_args(argv)
+
+    current = run(args.products, args.categories, memory=not args.no_memory, repeat=args.repeat)
+    for name, result in current["results"].items():
+        peak = f", пик памяти {result['peak_bytes'] / 2**20:.1f} МБ" if "peak_bytes" in result else ""
+        print(f"{name}: {result['seconds'] * 1000:.1f} мс{peak}")
+
+    if args.output:
+        with open(args.output, "w", encoding="utf-8") as file:
+            json.dump(current, file, ensure_ascii=False, indent=2)
+
+    if args.compare:
+        with open(args.compare, encoding="utf-8") as file:
+            regressions = compare_results(current, json.load(file), args.threshold)
+        for regression in regressions:
+            print(f"Регрессия: {regression}", file=sys.stderr)
+        return 1 if regressions else 0
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
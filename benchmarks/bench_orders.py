@@ -0,0 +1,49 @@
+"""
+Замер пропускной способности OrderEngine.
+
+Запуск из корня проекта:
+    python -m benchmarks.bench_orders --products 10000 --orders 200000 --batch 1000 --min-rate 5000
+"""
+
+import argparse
+import random
+import sys
+import time
+
+from src.main import Product
+from src.order_engine import OrderEngine
+from src.product_logging import bulk_load
+
+
+def run(products: int, orders: int, batch: int, seed: int = 0) -> float:
+    """Возвращает число обработанных строк заказа в секунду."""
+    rng = random.Random(seed)
+    with bulk_load():
+        catalog = [Product(f"Товар {i}", "Описание", rng.uniform(10, 1000), 10**9) for i in range(products)]
+    lines = [(rng.choice(catalog), rng.randint(1, 5)) for _ in range(orders)]
+
+    engine = OrderEngine()
+    start = time.perf_counter()
+    for offset in range(0, orders, batch):
+        engine.process(lines[offset:offset + batch])
+    return orders / (time.perf_counter() - start)
+
+
+def main(argv=None) -> int:
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--products", type=int, default=10000)
+    parser.add_argument("--orders", type=int, default=200000)
+    parser.add_argument("--batch", type=int, default=1000)
+    parser.add_argument("--min-rate", type=float, default=5000, help="минимально допустимое число строк в секунду")
+    args = parser.parse_args(argv)
+
+    rate = run(args.products, args.orders, args.batch)
+    print(f"OrderEngine: {rate:,.0f} строк заказа в секунду (пакеты по {args.batch})")
+    if rate < args.min_rate:
+        print(f"Ниже порога {args.min_rate:,.0f} строк в секунду", file=sys.stderr)
+        return 1
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
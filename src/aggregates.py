@@ -0,0 +1,115 @@
+from typing import List, Sequence
+
+import numpy as np
+
+from src.product_store import ProductStore
+
+
+def _columns(products, classes: list):
+    """
+    Возвращает цены, остатки и коды классов товаров в виде массивов NumPy.
+    Коды указывают на позицию класса в общем списке classes, который дополняется по ходу.
+    """
+    if isinstance(products, ProductStore):
+        store_classes, kinds, prices, quantities = products.columns()
+        remap = np.array([_class_code(cls, classes) for cls in store_classes] or [0], dtype=np.intp)
+        return (
+            np.asarray(memoryview(prices)),
+            np.asarray(memoryview(quantities)),
+            remap[np.asarray(memoryview(kinds))],
+        )
+
+    count = len(products)
+    prices = np.fromiter((product.price for product in products), dtype=np.float64, count=count)
+    quantities = np.fromiter((product.quantity for product in products), dtype=np.int64, count=count)
+    codes = np.fromiter((_class_code(type(product), classes) for product in products), dtype=np.intp, count=count)
+    return prices, quantities, codes
+
+
+def _class_code(cls, classes: list) -> int:
+    if cls not in classes:
+        classes.append(cls)
+    return classes.index(cls)
+
+
+def _middle_price(total_value: float, total_quantity: int):
+    return round(total_value / total_quantity, 2) if total_quantity > 0 else 0
+
+
+def categories_stats(categories: Sequence, percentiles: Sequence[float] = (50,)) -> List[dict]:
+    """
+    Считает сводные показатели сразу для списка категорий.
+
+    Цены и остатки всех категорий склеиваются в общие массивы, после чего суммы по
+    категориям и по классам товаров считаются одним проходом np.bincount. Для каждой
+    категории возвращается словарь: count, total_quantity, total_value, middle_price
+    (как у Category.middle_price), min_price, max_price, percentiles (процентили цены
+    по товарам, без учета остатков) и by_type - те же суммы в разрезе классов товаров.
+    """
+    classes: list = []
+    columns = [_columns(category.products, classes) for category in categories]
+    sizes = np.array([len(prices) for prices, _, _ in columns], dtype=np.intp)
+    starts = np.concatenate(([0], np.cumsum(sizes)[:-1])).astype(np.intp)
+    n_categories = len(columns)
+    n_classes = max(len(classes), 1)
+
+    prices = np.concatenate([c[0] for c in columns] or [np.empty(0)]).astype(np.float64, copy=False)
+    quantities = np.concatenate([c[1] for c in columns] or [np.empty(0, dtype=np.int64)])
+    codes = np.concatenate([c[2] for c in columns] or [np.empty(0, dtype=np.intp)])
+    category_ids = np.repeat(np.arange(n_categories), sizes)
+    values = prices * quantities
+
+    counts = np.bincount(category_ids, minlength=n_categories)
+    total_quantities = np.bincount(category_ids, weights=quantities, minlength=n_categories)
+    total_values = np.bincount(category_ids, weights=values, minlength=n_categories)
+
+    nonempty = sizes > 0
+    min_prices = np.zeros(n_categories)
+    max_prices = np.zeros(n_categories)
+    if nonempty.any():
+        min_prices[nonempty] = np.minimum.reduceat(prices, starts[nonempty])
+        max_prices[nonempty] = np.maximum.reduceat(prices, starts[nonempty])
+
+    pairs = category_ids * n_classes + codes
+    type_counts = np.bincount(pairs, minlength=n_categories * n_classes).reshape(n_categories, n_classes)
+    type_quantities = np.bincount(pairs, weights=quantities, minlength=n_categories * n_classes).reshape(
+        n_categories, n_classes
+    )
+    type_values = np.bincount(pairs, weights=values, minlength=n_categories * n_classes).reshape(
+        n_categories, n_classes
+    )
+
+    result = []
+    for i in range(n_categories):
+        segment = prices[starts[i]:starts[i] + sizes[i]]
+        if sizes[i]:
+            price_percentiles = np.percentile(segment, percentiles)
+        else:
+            price_percentiles = np.zeros(len(percentiles))
+        by_type = {}
+        for code, cls in enumerate(classes):
+            if type_counts[i, code]:
+                by_type[cls.__name__] = {
+                    "count": int(type_counts[i, code]),
+                    "total_quantity": int(type_quantities[i, code]),
+                    "total_value": float(type_values[i, code]),
+                    "middle_price": _middle_price(float(type_values[i, code]), int(type_quantities[i, code])),
+                }
+        result.append(
+            {
+                "count": int(counts[i]),
+                "total_quantity": int(total_quantities[i]),
+                "total_value": float(total_values[i]),
+                "middle_price": _middle_price(float(total_values[i]), int(total_quantities[i])),
+                "min_price": float(min_prices[i]),
+                "max_price": float(max_prices[i]),
+                "percentiles": {p: float(v) for p, v in zip(percentiles, price_percentiles)},
+                "by_type": by_type,
+            }
+        )
+    return result
+
+
+def category_stats(category, percentiles: Sequence[float] = (50,)) -> dict:
+    """Считает сводные показатели одной категории (см. categories_stats)."""
+    return categories_stats([category], percentiles)[0]
@@ -0,0 +1,53 @@
+import asyncio
+
+from src import json_backend
+from src.load_products import _data_file_path
+
+
+def _load_categories(file_path: str) -> list:
+    """Та же загрузка, что в load_categories_from_json: mmap, типизированный разбор с msgspec, пачки товаров."""
+    from src.main import Category  # Локальный импорт, чтобы избежать циклического импорта
+
+    data = json_backend.load_file(file_path, typed=json_backend.typed_available())
+    return [Category(*category) for category in json_backend.iter_categories(data)]
+
+
+async def aload_categories_from_json(file_name: str = "products.json") -> list:
+    """
+    Асинхронный вариант load_categories_from_json без интерактивного запроса имени файла.
+    Чтение, разбор JSON и создание объектов выполняются в отдельном потоке, поэтому цикл
+    событий не блокируется. Ошибки (FileNotFoundError, json.JSONDecodeError и др.) пробрасываются.
+    """
+    return await asyncio.to_thread(_load_categories, _data_file_path(file_name))
+
+
+async def aload_many(file_names, limit: int = 8):
+    """
+    Загружает несколько каталогов параллельно, не больше limit одновременно.
+    Возвращает (categories, errors): категории всех успешно загруженных файлов в порядке
+    file_names и словарь {имя файла: текст ошибки}.
+    """
+    semaphore = asyncio.Semaphore(limit)
+
+    async def load(file_name):
+        async with semaphore:
+            return await aload_categories_from_json(file_name)
+
+    file_names = list(file_names)
+    results = await asyncio.gather(*(load(file_name) for file_name in file_names), return_exceptions=True)
+    categories = []
+    errors = {}
+    for file_name, result in zip(file_names, results):
+        if isinstance(result, Exception):
+            errors[file_name] = f"{type(result).__name__}: {result}"
+        else:
+            categories.extend(result)
+    return categories, errors
+
+
+async def aiter_products(category, batch_size: int = 1000):
+    """Асинхронно перебирает товары категории, отдавая управление циклу событий каждые batch_size товаров."""
+    for number, product in enumerate(category, 1):
+        yield product
+        if number % batch_size == 0:
+            await asyncio.sleep(0)
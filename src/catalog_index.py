@@ -0,0 +1,161 @@
+from bisect import bisect_left, bisect_right
+
+_MISSING = object()
+
+
+class _SortedIndex:
+    """Отсортированный индекс по числовому полю: поиск диапазона за O(log n) через bisect."""
+
+    def __init__(self):
+        self._keys = []
+        self._items = []
+        self._current = {}
+
+    def update(self, product, value):
+        product_id = id(product)
+        old = self._current.get(product_id, _MISSING)
+        if old == value:
+            return
+        if old is not _MISSING:
+            self.discard(product)
+        key = (value, product_id)
+        position = bisect_left(self._keys, key)
+        self._keys.insert(position, key)
+        self._items.insert(position, product)
+        self._current[product_id] = value
+
+    def discard(self, product):
+        product_id = id(product)
+        value = self._current.pop(product_id, _MISSING)
+        if value is _MISSING:
+            return
+        position = bisect_left(self._keys, (value, product_id))
+        del self._keys[position]
+        del self._items[position]
+
+    def range(self, low=None, high=None) -> list:
+        start = 0 if low is None else bisect_left(self._keys, (low,))
+        end = len(self._keys) if high is None else bisect_right(self._keys, (high, float("inf")))
+        return self._items[start:end]
+
+
+class _HashIndex:
+    """Индекс по значению поля: значение -> {id товара: товар}."""
+
+    def __init__(self):
+        self._buckets = {}
+        self._current = {}
+
+    def update(self, product, value):
+        product_id = id(product)
+        old = self._current.get(product_id, _MISSING)
+        if old is not _MISSING:
+            if old == value:
+                return
+            self.discard(product)
+        self._buckets.setdefault(value, {})[product_id] = product
+        self._current[product_id] = value
+
+    def discard(self, product):
+        product_id = id(product)
+        value = self._current.pop(product_id, _MISSING)
+        if value is _MISSING:
+            return
+        bucket = self._buckets[value]
+        del bucket[product_id]
+        if not bucket:
+            del self._buckets[value]
+
+    def get(self, value) -> dict:
+        return self._buckets.get(value, {})
+
+
+class CatalogIndex:
+    """
+    Индексы по товарам загруженных категорий: хеш-индекс по имени, отсортированные индексы
+    по цене и остатку и вторичные индексы по полям подклассов (memory, color, country).
+
+    Индекс подписывается на категории, поэтому add_product и изменения полей товаров
+    (в том числе цены через сеттер) отражаются в нем автоматически. Товар, входящий
+    в несколько категорий, индексируется один раз.
+    """
+
+    attributes = ("memory", "color", "country")
+
+    def __init__(self, categories=()):
+        self._occurrences = {}
+        self._by_name = _HashIndex()
+        self._by_price = _SortedIndex()
+        self._by_quantity = _SortedIndex()
+        self._by_attribute = {attribute: _HashIndex() for attribute in self.attributes}
+        for category in categories:
+            self.add_category(category)
+
+    def add_category(self, category):
+        for product in category:
+            self._add(product)
+        category.add_listener(self._on_change)
+
+    def _on_change(self, product, field, old, new):
+        if field == "products":
+            if new is not None:
+                self._add(new)
+            else:
+                self._remove(old)
+        elif id(product) in self._occurrences:
+            self._reindex(product)
+
+    def _add(self, product):
+        product_id = id(product)
+        self._occurrences[product_id] = self._occurrences.get(product_id, 0) + 1
+        self._reindex(product)
+
+    def _remove(self, product):
+        product_id = id(product)
+        self._occurrences[product_id] -= 1
+        if self._occurrences[product_id]:
+            return
+        del self._occurrences[product_id]
+        self._by_name.discard(product)
+        self._by_price.discard(product)
+        self._by_quantity.discard(product)
+        for index in self._by_attribute.values():
+            index.discard(product)
+
+    def _reindex(self, product):
+        self._by_name.update(product, product.name)
+        self._by_price.update(product, product.price)
+        self._by_quantity.update(product, product.quantity)
+        for attribute, index in self._by_attribute.items():
+            value = getattr(product, attribute, _MISSING)
+            if value is _MISSING:
+                index.discard(product)
+            else:
+                index.update(product, value)
+
+    def __len__(self):
+        return len(self._occurrences)
+
+    def get(self, name: str) -> list:
+        """Товары с заданным именем."""
+        return list(self._by_name.get(name).values())
+
+    def price_range(self, low: float = None, high: float = None) -> list:
+        """Товары с ценой в диапазоне [low, high], по возрастанию цены."""
+        return self._by_price.range(low, high)
+
+    def quantity_range(self, low: int = None, high: int = None) -> list:
+        """Товары с остатком в диапазоне [low, high], по возрастанию остатка."""
+        return self._by_quantity.range(low, high)
+
+    def find(self, **attributes) -> list:
+        """Товары, у которых все переданные поля подклассов равны заданным, например find(color="Gray", memory=512)."""
+        buckets = []
+        for attribute, value in attributes.items():
+            if attribute not in self._by_attribute:
+                raise ValueError(f"Поле '{attribute}' не индексируется")
+            buckets.append(self._by_attribute[attribute].get(value))
+        if not buckets:
+            return []
+        buckets.sort(key=len)
+        return [product for product_id, product in buckets[0].items() if all(product_id in b for b in buckets[1:])]
@@ -0,0 +1,188 @@
+import pandas as pd
+
+from src.product_logging import bulk_load
+from src.product_store import ProductStore
+
+try:
+    import pyarrow
+    import pyarrow.parquet
+except ImportError:
+    pyarrow = None
+
+# Типы колонок с поддержкой пропусков: поля подклассов у остальных товаров пустые.
+# Колонка price дробная, поэтому целые цены отмечаются в int_price, как в ProductStore
+_DTYPES = {"price": "Float64", "quantity": "Int64", "memory": "Int64", "int_price": "boolean"}
+
+# Максимум строк на лист XLSX, следующий пакет пишется на новый лист
+XLSX_MAX_ROWS = 1_048_575
+
+
+def export_columns() -> list:
+    """Колонки выгрузки: категория, тип товара, поля всех зарегистрированных классов товаров и признак целой цены."""
+    from src.main import Product  # Локальный импорт, чтобы избежать циклического импорта
+
+    columns = ["category", "category_description", "type"]
+    for cls in Product.registry.values():
+        columns.extend(field for field in cls.fields if field not in columns)
+    columns.append("int_price")
+    return columns
+
+
+def _iter_rows(categories):
+    """Отдает (категория, класс товара, поля товара) для всех товаров по порядку."""
+    for category in categories:
+        products = category.products
+        if isinstance(products, ProductStore):
+            # Поля берутся прямо из колонок хранилища, объекты товаров не создаются
+            classes, kinds = products.columns()[:2]
+            for index in range(len(products)):
+                yield category, classes[kinds[index]], products.record(index)
+        else:
+            for product in products:
+                yield category, type(product), product.to_dict()
+
+
+def iter_frames(categories, chunk_size: int = 50_000):
+    """
+    Превращает категории в последовательность DataFrame не больше chunk_size строк с одинаковой схемой.
+    Пустые категории в выгрузку не попадают: каждая строка - это товар.
+    """
+    columns = export_columns()
+    dtypes = [_DTYPES.get(column, "string") for column in columns]
+    batch = {column: [] for column in columns}
+    size = 0
+    for category, cls, record in _iter_rows(categories):
+        record["category"] = category.name
+        record["category_description"] = category.description
+        record["type"] = cls.product_type
+        record["int_price"] = type(record["price"]) is int
+        for column in columns:
+            batch[column].append(record.get(column))
+        size += 1
+        if size == chunk_size:
+            yield _frame(batch, columns, dtypes)
+            batch = {column: [] for column in columns}
+            size = 0
+    if size:
+        yield _frame(batch, columns, dtypes)
+
+
+def _frame(batch: dict, columns: list, dtypes: list) -> pd.DataFrame:
+    return pd.DataFrame({column: pd.array(batch[column], dtype=dtype) for column, dtype in zip(columns, dtypes)})
+
+
+def export_csv(categories, file_path: str, chunk_size: int = 50_000) -> int:
+    """Выгружает каталог в CSV пакетами по chunk_size строк. Возвращает число строк."""
+    rows = 0
+    with open(file_path, "w", encoding="utf-8", newline="") as file:
+        for frame in iter_frames(categories, chunk_size):
+            frame.to_csv(file, header=rows == 0, index=False)
+            rows += len(frame)
+        if rows == 0:
+            pd.DataFrame(columns=export_columns()).to_csv(file, index=False)
+    return rows
+
+
+def export_xlsx(categories, file_path: str, chunk_size: int = 50_000) -> int:
+    """
+    Выгружает каталог в XLSX через потоковую запись openpyxl (write_only), пакетами по chunk_size строк.
+    Если строк больше, чем помещается на лист, выгрузка продолжается на следующих листах.
+    Возвращает число строк.
+    """
+    from openpyxl import Workbook
+
+    columns = export_columns()
+    workbook = Workbook(write_only=True)
+    sheet = None
+    sheet_rows = rows = 0
+    for frame in iter_frames(categories, chunk_size):
+        frame = frame.astype(object).where(frame.notna(), None)
+        for row in frame.itertuples(index=False, name=None):
+            if sheet is None or sheet_rows == XLSX_MAX_ROWS:
+                title = "catalog" if sheet is None else f"catalog_{len(workbook.worksheets) + 1}"
+                sheet = workbook.create_sheet(title)
+                sheet.append(columns)
+                sheet_rows = 0
+            sheet.append(row)
+            sheet_rows += 1
+            rows += 1
+    if sheet is None:
+        workbook.create_sheet("catalog").append(columns)
+    workbook.save(file_path)
+    return rows
+
+
+def _require_pyarrow():
+    if pyarrow is None:
+        raise ImportError("Для работы с Parquet нужен пакет pyarrow")
+
+
+def export_parquet(categories, file_path: str, chunk_size: int = 50_000) -> int:
+    """Выгружает каталог в Parquet: каждый пакет из chunk_size строк - отдельная группа строк. Нужен pyarrow."""
+    _require_pyarrow()
+    writer = None
+    rows = 0
+    try:
+        for frame in iter_frames(categories, chunk_size):
+            table = pyarrow.Table.from_pandas(frame, preserve_index=False)
+            if writer is None:
+                writer = pyarrow.parquet.ParquetWriter(file_path, table.schema)
+            writer.write_table(table)
+            rows += len(frame)
+    finally:
+        if writer is not None:
+            writer.close()
+    if writer is None:
+        columns = export_columns()
+        empty = pd.DataFrame({c: pd.array([], dtype=_DTYPES.get(c, "string")) for c in columns})
+        pyarrow.parquet.write_table(pyarrow.Table.from_pandas(empty, preserve_index=False), file_path)
+    return rows
+
+
+def categories_from_frames(frames) -> list:
+    """
+    Собирает категории из DataFrame в формате iter_frames. Товары создаются пачкой
+    через Product.new_products по колонке type; порядок категорий и товаров сохраняется.
+    """
+    from src.main import Category, Product  # Локальный импорт, чтобы избежать циклического импорта
+
+    categories = {}
+    for frame in frames:
+        values = {column: frame[column].tolist() for column in frame.columns}
+        # Файлы, выгруженные без колонки int_price, загружаются с дробными ценами
+        int_prices = values.get("int_price") or [False] * len(frame)
+        for index, name in enumerate(values["category"]):
+            cls = Product.registry[values["type"][index]]
+            record = {field: values[field][index] for field in cls.fields}
+            record["type"] = cls.product_type
+            if int_prices[index] is True:
+                record["price"] = int(record["price"])
+            category = categories.get(name)
+            if category is None:
+                category = categories[name] = (values["category_description"][index], [])
+            category[1].append(record)
+
+    with bulk_load():
+        return [
+            Category(name, description, Product.new_products(records))
+            for name, (description, records) in categories.items()
+        ]
+
+
+def load_categories_from_csv(file_path: str, chunk_size: int = 50_000) -> list:
+    """Загружает каталог из CSV, выгруженного export_csv, читая файл пакетами."""
+    columns = export_columns()
+    dtypes = {column: _DTYPES.get(column, "string") for column in columns}
+    with pd.read_csv(file_path, dtype=dtypes, chunksize=chunk_size, keep_default_na=False, na_values=[""]) as reader:
+        return categories_from_frames(reader)
+
+
+def load_categories_from_parquet(file_path: str) -> list:
+    """
+    Быстрая альтернатива load_categories_from_json: загружает каталог из Parquet,
+    выгруженного export_parquet, по группам строк. Нужен pyarrow.
+    """
+    _require_pyarrow()
+    parquet_file = pyarrow.parquet.ParquetFile(file_path)
+    frames = (parquet_file.read_row_group(index).to_pandas() for index in range(parquet_file.num_row_groups))
+    return categories_from_frames(frames)
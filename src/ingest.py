@@ -0,0 +1,62 @@
+import glob
+import json
+import os
+from concurrent.futures import ProcessPoolExecutor
+
+from src import json_backend
+from src.load_products import _data_file_path
+
+
+def _parse_file(file_path: str):
+    """
+    Разбирает и проверяет один файл каталога в рабочем процессе.
+    Возвращает (file_path, [(name, description, products)], ошибка или None).
+    Объекты Category здесь не создаются, чтобы счетчики класса менялись только в основном процессе.
+    """
+    try:
+        data = json_backend.load_file(file_path, typed=json_backend.typed_available())
+        parsed = list(json_backend.iter_categories(data))
+        return file_path, parsed, None
+    except (OSError, json.JSONDecodeError, KeyError, TypeError, ValueError) as e:
+        return file_path, [], f"{type(e).__name__}: {e}"
+
+
+def _find_files(path: str):
+    path = _data_file_path(path)
+    if os.path.isdir(path):
+        path = os.path.join(path, "*.json")
+    return sorted(glob.glob(path))
+
+
+def load_categories_from_dir(path: str = ".", max_workers: int = None):
+    """
+    Загружает каталог из многих JSON-файлов параллельно в пуле процессов.
+
+    path - каталог (берутся все *.json) или glob-шаблон; относительные пути считаются от data.
+    Файлы разбираются и проверяются в рабочих процессах, категории с одинаковым именем
+    объединяются. Ошибка в одном файле не прерывает загрузку остальных.
+    Возвращает (categories, errors), где errors - словарь {путь к файлу: текст ошибки}.
+    """
+    from src.main import Category  # Локальный импорт, чтобы избежать циклического импорта
+
+    files = _find_files(path)
+    categories = {}
+    errors = {}
+    if not files:
+        return [], errors
+
+    with ProcessPoolExecutor(max_workers=max_workers) as executor:
+        for file_path, parsed, error in executor.map(_parse_file, files):
+            if error is not None:
+                errors[file_path] = error
+                continue
+            for name, description, products in parsed:
+                category = categories.get(name)
+                if category is None:
+                    # Счетчики Category обновляются здесь, в основном процессе
+                    categories[name] = Category(name, description, products)
+                    continue
+                for product in products:
+                    category.add_product(product)
+
+    return list(categories.values()), errors
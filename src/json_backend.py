@@ -0,0 +1,188 @@
+import json
+import logging
+import mmap
+import operator
+import os
+from contextlib import contextmanager
+
+import numpy as np
+
+from src import product_logging
+
+try:
+    import msgspec
+except ImportError:
+    msgspec = None
+
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
+
+def _stdlib_loads(data):
+    # json.loads не принимает memoryview, поэтому здесь байты копируются
+    return json.loads(data if isinstance(data, (str, bytes)) else bytes(data))
+
+
+def _orjson_loads(data):
+    return orjson.loads(data)
+
+
+def _msgspec_loads(data, decoder=None):
+    try:
+        return (decoder or msgspec.json).decode(data)
+    except msgspec.ValidationError as e:
+        raise ValueError(str(e)) from None
+    except msgspec.DecodeError as e:
+        raise json.JSONDecodeError(str(e), "", 0) from None
+
+
+# Доступные парсеры. По умолчанию используется orjson, если он установлен, иначе stdlib;
+# msgspec (с разбором в типизированные записи) включается только явно через set_backend
+BACKENDS = {}
+if orjson is not None:
+    BACKENDS["orjson"] = _orjson_loads
+if msgspec is not None:
+    BACKENDS["msgspec"] = _msgspec_loads
+BACKENDS["json"] = _stdlib_loads
+
+_backend = "orjson" if orjson is not None else "json"
+
+
+def available_backends() -> tuple:
+    return tuple(BACKENDS)
+
+
+def get_backend() -> str:
+    return _backend
+
+
+def set_backend(name: str):
+    """Выбирает парсер JSON для всех загрузчиков каталога."""
+    global _backend
+    if name not in BACKENDS:
+        raise ValueError(f"JSON-парсер '{name}' недоступен, доступны: {', '.join(BACKENDS)}")
+    _backend = name
+
+
+def loads(data, backend: str = None):
+    """Разбирает JSON из bytes, bytearray или memoryview выбранным парсером."""
+    return BACKENDS[backend or _backend](data)
+
+
+@contextmanager
+def _mapped(file_path: str):
+    """Отдает содержимое файла как memoryview над mmap, без декодирования в str и копирования."""
+    with open(file_path, "rb") as file:
+        try:
+            size = os.fstat(file.fileno()).st_size
+        except OSError:  # В том числе io.UnsupportedOperation: у потока нет файлового дескриптора
+            size = None
+        if size is None:
+            yield file.read()
+        elif size == 0:
+            # Пустой файл нельзя отобразить в память
+            yield b""
+        else:
+            with mmap.mmap(file.fileno(), 0, access=mmap.ACCESS_READ) as mapped, memoryview(mapped) as view:
+                yield view
+
+
+def typed_available() -> bool:
+    """Можно ли разбирать каталог сразу в типизированные записи (нужен msgspec)."""
+    return _backend == "msgspec"
+
+
+def load_file(file_path: str, backend: str = None, typed: bool = False):
+    """
+    Читает и разбирает JSON-файл через mmap.
+    С typed=True (только для msgspec) каталог разбирается сразу в типизированные записи
+    категорий и товаров без промежуточных словарей; их разворачивает iter_categories.
+    """
+    backend = backend or _backend
+    with _mapped(file_path) as data:
+        if typed:
+            if backend != "msgspec":
+                raise ValueError("Разбор в типизированные записи доступен только с msgspec")
+            return _msgspec_loads(data, _typed_decoder())
+        return loads(data, backend)
+
+
+_typed = {}
+
+
+def _typed_decoder():
+    """Декодер списка категорий со структурой записи товара, покрывающей поля всех зарегистрированных классов."""
+    from src.main import Product  # Локальный импорт, чтобы избежать циклического импорта
+
+    key = tuple(Product.registry)
+    if _typed.get("key") != key:
+        extra = []
+        for target in Product.registry.values():
+            extra.extend(field for field in target.fields if field not in Product.fields and field not in extra)
+        record = msgspec.defstruct(
+            "ProductRecord",
+            # int | float: целая цена остается int, как при разборе в словари
+            [("name", str), ("description", str), ("price", int | float), ("quantity", int)]
+            + [(field, object, msgspec.UNSET) for field in extra + ["type"]],
+        )
+        category = msgspec.defstruct(
+            "CategoryRecord", [("name", str), ("description", str), ("products", list[record])]
+        )
+        _typed.update(key=key, extra=tuple(extra), decoder=msgspec.json.Decoder(list[category]))
+    return _typed["decoder"]
+
+
+def _products_from_records(records) -> list:
+    """Аналог Product.new_products для типизированных записей: те же проверки и те же ошибки."""
+    from src.main import Product  # Локальный импорт, чтобы избежать циклического импорта
+
+    markers = [(c.marker_field, c) for c in Product.registry.values() if c.marker_field is not None]
+    getters = {target: operator.attrgetter(*target.fields) for target in Product.registry.values()}
+    classes = []
+    rows = []
+    for number, record in enumerate(records):
+        if record.type is not msgspec.UNSET:
+            target = Product._resolve_class({"type": record.type})
+        else:
+            target = Product
+            for marker, candidate in markers:
+                if getattr(record, marker) is not msgspec.UNSET:
+                    target = candidate
+                    break
+        values = getters[target](record)
+        foreign = [
+            f for f in _typed["extra"] if f not in target._field_set and getattr(record, f) is not msgspec.UNSET
+        ]
+        if foreign or msgspec.UNSET in values:
+            present = [f for f in target.fields + tuple(foreign) if getattr(record, f) is not msgspec.UNSET]
+            raise TypeError(f"Товар #{number}: поля {sorted(present)} не соответствуют классу {target.__name__}")
+        classes.append(target)
+        rows.append(values)
+
+    prices = np.fromiter((record.price for record in records), dtype=np.float64, count=len(records))
+    quantities = np.fromiter((record.quantity for record in records), dtype=np.float64, count=len(records))
+    invalid = np.flatnonzero((prices <= 0) | (quantities <= 0))
+    if invalid.size:
+        number = int(invalid[0])
+        raise ValueError(f"Товар #{number} '{records[number].name}': цена и количество должны быть больше нуля")
+
+    products = [target._restore_values(values) for target, values in zip(classes, rows)]
+    if not product_logging.is_suppressed() and product_logging.logger.isEnabledFor(logging.INFO):
+        product_logging.logger.info("Создано товаров пачкой: %d", len(products))
+    return products
+
+
+def iter_categories(data):
+    """
+    Перебирает разобранный каталог (словари или типизированные записи) и отдает
+    (name, description, products) с уже созданными товарами.
+    """
+    from src.main import Product  # Локальный импорт, чтобы избежать циклического импорта
+
+    for cat in data:
+        if isinstance(cat, dict):
+            yield cat["name"], cat["description"], Product.new_products(cat["products"])
+        else:
+            yield cat.name, cat.description, _products_from_records(cat.products)
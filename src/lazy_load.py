@@ -0,0 +1,170 @@
+import json
+import mmap
+import os
+import re
+
+from src import json_backend
+from src.load_products import _data_file_path
+from src.main import Category, Product
+from src.product_logging import bulk_load
+
+# Строки JSON целиком и структурные символы: скобки внутри строк не считаются
+_TOKENS = re.compile(rb'"(?:[^"\\]|\\.)*"|[\[\]{}:,]', re.DOTALL)
+
+
+class LazyCategory(Category):
+    """
+    Категория, товары которой разбираются и создаются при первом обращении к products
+    (а значит, и к __iter__, formatted_products, middle_price, add_product и т. д.).
+    До этого у категории есть только имя и описание; Category.product_count
+    увеличивается в момент загрузки товаров.
+    """
+
+    def __init__(self, name: str, description: str, loader):
+        self._loader = loader
+        self._loading = False
+        self._products = []
+        super().__init__(name, description, [])
+
+    @property
+    def products(self):
+        if self._loader is not None:
+            # Другие потоки ждут окончания загрузки на блокировке категории;
+            # повторный вход из _set_products в том же потоке сразу получает товары
+            with self._lock:
+                if self._loader is not None and not self._loading:
+                    self._loading = True
+                    try:
+                        self._set_products(self._loader())
+                        self._loader = None
+                    finally:
+                        self._loading = False
+        return self._products
+
+    @products.setter
+    def products(self, products):
+        self._products = products
+
+    @property
+    def is_loaded(self) -> bool:
+        return self._loader is None
+
+    def _totals(self):
+        self.products  # Накопленные суммы появляются только после загрузки товаров
+        return super()._totals()
+
+
+def _source_stamp(file_path: str) -> list:
+    stat = os.stat(file_path)
+    return [stat.st_size, stat.st_mtime_ns]
+
+
+def build_category_index(file_name: str = "products.json") -> dict:
+    """
+    Один раз просматривает JSON-файл каталога, не создавая товаров, и строит индекс:
+    для каждой категории имя, описание и байтовые смещения [start, end) ее массива products.
+    В индекс также записываются размер и mtime файла, чтобы распознать устаревший индекс.
+    """
+    file_path = _data_file_path(file_name)
+    categories = []
+    with open(file_path, "rb") as file:
+        if os.fstat(file.fileno()).st_size == 0:
+            raise json.JSONDecodeError("Пустой файл каталога", "", 0)
+        with mmap.mmap(file.fileno(), 0, access=mmap.ACCESS_READ) as data:
+            depth = 0
+            key = None
+            expect_value = False
+            current = None
+            products_start = None
+            for match in _TOKENS.finditer(data):
+                token = match.group()
+                char = token[:1]
+                if char in b"[{":
+                    depth += 1
+                    if depth == 2:
+                        current = {}
+                    elif depth == 3 and expect_value and key == "products":
+                        products_start = match.start()
+                    expect_value = False
+                elif char in b"]}":
+                    if depth == 3 and products_start is not None and char == b"]":
+                        current["start"], current["end"] = products_start, match.end()
+                        products_start = None
+                    elif depth == 2:
+                        categories.append(current)
+                    depth -= 1
+                elif depth != 2:
+                    continue
+                elif char == b'"':
+                    if expect_value:
+                        if key in ("name", "description"):
+                            current[key] = json.loads(token)
+                        expect_value = False
+                    else:
+                        key = json.loads(token)
+                elif char == b":":
+                    expect_value = True
+                elif char == b",":
+                    # Числа, true, false и null токенами не являются: значение ключа заканчивается на запятой
+                    expect_value = False
+    if depth != 0:
+        raise json.JSONDecodeError("Неожиданный конец файла", "", 0)
+    return {"source": _source_stamp(file_path), "categories": categories}
+
+
+def save_category_index(index: dict, index_name: str):
+    with open(_data_file_path(index_name), "w", encoding="utf-8") as file:
+        json.dump(index, file, ensure_ascii=False)
+
+
+def _read_index(index_path: str, source_path: str):
+    """Возвращает индекс из файла, если он соответствует текущей версии источника, иначе None."""
+    try:
+        with open(index_path, encoding="utf-8") as file:
+            index = json.load(file)
+    except (OSError, ValueError):
+        return None
+    return index if index.get("source") == _source_stamp(source_path) else None
+
+
+def _range_loader(file_path: str, start: int, end: int, stamp: list):
+    def load():
+        if _source_stamp(file_path) != stamp:
+            raise ValueError(f"Файл '{file_path}' изменился после построения индекса, загрузите каталог заново")
+        with open(file_path, "rb") as file:
+            file.seek(start)
+            records = json_backend.loads(file.read(end - start))
+        with bulk_load():
+            return Product.new_products(records)
+
+    return load
+
+
+def load_lazy_categories(file_name: str = "products.json", index_name: str = None) -> list:
+    """
+    Загружает каталог в ленивом режиме: категории (LazyCategory) создаются сразу, их товары -
+    при первом обращении, причем читается и разбирается только фрагмент файла этой категории.
+
+    Без index_name файл один раз просматривается целиком (без создания товаров). С index_name
+    используется сохраненный индекс смещений (относительные пути считаются от data): если он
+    свежий, сам каталог при открытии не читается вовсе; если индекса нет или он устарел,
+    он строится и сохраняется.
+    """
+    file_path = _data_file_path(file_name)
+    index = None
+    if index_name is not None:
+        index = _read_index(_data_file_path(index_name), file_path)
+    if index is None:
+        index = build_category_index(file_name)
+        if index_name is not None:
+            save_category_index(index, index_name)
+
+    stamp = index["source"]
+    categories = []
+    for entry in index["categories"]:
+        if "start" in entry:
+            loader = _range_loader(file_path, entry["start"], entry["end"], stamp)
+        else:
+            loader = list
+        categories.append(LazyCategory(entry["name"], entry["description"], loader))
+    return categories
@@ -1,15 +1,24 @@
 import json
 import os
+from typing import IO, Iterator
+
+from src import json_backend, metrics
+from src.product_logging import bulk_load
+
+
+def _data_file_path(file_name: str) -> str:
+    """Возвращает путь к файлу в каталоге data в корне проекта."""
+    project_root = os.path.abspath(os.path.join(os.path.dirname(__file__), ".."))
+    return os.path.join(project_root, "data", file_name)
 
 
 def load_categories_from_json(file_name: str = "products.json", max_attempts: int = None):
     """
     Загружает данные из JSON-файла и создает объекты Category и Product.
     """
-    from src.main import Category, Product  # Локальный импорт, чтобы избежать циклического импорта
+    from src.main import Category  # Локальный импорт, чтобы избежать циклического импорта
 
-    project_root = os.path.abspath(os.path.join(os.path.dirname(__file__), ".."))  # Вернули изначальный путь
-    file_path = os.path.join(project_root, "data", file_name)  # Теперь путь корректный
+    file_path = _data_file_path(file_name)
     attempts = 0
 
     while not os.path.isfile(file_path):
@@ -17,21 +26,170 @@ def load_categories_from_json(file_name: str = "products.json", max_attempts: in
         if max_attempts is not None and attempts >= max_attempts:
             return []
         file_name = input("Введите имя JSON-файла (по умолчанию 'products.json'): ") or "products.json"
-        file_path = os.path.join(project_root, "data", file_name)
+        file_path = _data_file_path(file_name)
         attempts += 1
 
     try:
-        with open(file_path, "r", encoding="utf-8") as file:
-            data = json.load(file)
+        with metrics.timer("load_json_parse_seconds"):
+            data = json_backend.load_file(file_path, typed=json_backend.typed_available())
 
         categories = []
-        for cat in data:
-            category = Category(
-                cat["name"], cat["description"], [Product.new_product(prod) for prod in cat["products"]]
-            )
-            categories.append(category)
+        with metrics.timer("load_construct_seconds"):
+            for name, description, products in json_backend.iter_categories(data):
+                categories.append(Category(name, description, products))
+        metrics.inc("load_files_total")
         return categories  # Теперь возвращается список объектов Category
 
     except (FileNotFoundError, json.JSONDecodeError) as e:
         print(f"Ошибка загрузки JSON: {e}")
         return []
+
+
+# Ошибка разбора дальше этого числа символов от конца буфера не вызвана обрывом куска:
+# оборванными могут быть только литерал, число или escape-последовательность
+_ERROR_LOOKAHEAD = 32
+
+
+class _JsonStream:
+    """
+    Потоковый читатель JSON: держит в памяти только непрочитанный фрагмент файла,
+    а значения разбирает по одному через JSONDecoder.raw_decode.
+
+    Значение, не поместившееся в буфер, дочитывается кусками растущего размера, поэтому
+    большое значение разбирается за линейное время. Значения больше max_value_size
+    символов считаются ошибкой, чтобы синтаксическая ошибка не приводила к чтению
+    всего файла в память.
+    """
+
+    def __init__(self, file: IO[str], chunk_size: int = 64 * 1024, max_value_size: int = 256 * 2**20):
+        self._file = file
+        self._chunk_size = chunk_size
+        self._max_value_size = max_value_size
+        self._decoder = json.JSONDecoder()
+        self._buffer = ""
+        self._pos = 0
+        self._eof = False
+
+    def _fill(self, size: int = None) -> bool:
+        """Дочитывает следующий кусок файла, отбрасывая уже разобранную часть буфера."""
+        chunk = self._file.read(size or self._chunk_size)
+        if not chunk:
+            self._eof = True
+            return False
+        self._buffer = self._buffer[self._pos:] + chunk
+        self._pos = 0
+        return True
+
+    def _is_incomplete(self, error: json.JSONDecodeError) -> bool:
+        """Может ли ошибка разбора исчезнуть, если дочитать файл."""
+        if self._eof or len(self._buffer) - self._pos > self._max_value_size:
+            return False
+        return error.msg.startswith("Unterminated string") or error.pos >= len(self._buffer) - _ERROR_LOOKAHEAD
+
+    def peek(self) -> str:
+        """Возвращает следующий значащий символ, пропуская пробелы."""
+        while True:
+            while self._pos < len(self._buffer) and self._buffer[self._pos] in " \t\r\n":
+                self._pos += 1
+            if self._pos < len(self._buffer):
+                return self._buffer[self._pos]
+            if not self._fill():
+                raise json.JSONDecodeError("Неожиданный конец файла", self._buffer, self._pos)
+
+    def expect(self, char: str):
+        if self.peek() != char:
+            raise json.JSONDecodeError(f"Ожидался символ {char!r}", self._buffer, self._pos)
+        self._pos += 1
+
+    def value(self):
+        """Разбирает одно JSON-значение целиком."""
+        self.peek()
+        read_size = self._chunk_size
+        while True:
+            try:
+                value, end = self._decoder.raw_decode(self._buffer, self._pos)
+            except json.JSONDecodeError as error:
+                if not self._is_incomplete(error) or not self._fill(read_size):
+                    raise
+                # Размер дочитывания растет вдвое, чтобы повторные разборы и копирования буфера были линейными
+                read_size *= 2
+                continue
+            # Число в конце буфера могло оборваться на границе куска - дочитываем и разбираем заново
+            if end == len(self._buffer) and not self._eof and self._fill():
+                continue
+            self._pos = end
+            return value
+
+    def iter_array(self) -> Iterator[None]:
+        """Проходит по элементам массива; каждый элемент вызывающий код читает сам."""
+        self.expect("[")
+        if self.peek() == "]":
+            self._pos += 1
+            return
+        while True:
+            yield None
+            if self.peek() == ",":
+                self._pos += 1
+                continue
+            self.expect("]")
+            return
+
+    def iter_object(self) -> Iterator[str]:
+        """Проходит по ключам объекта; значение каждого ключа вызывающий код читает сам."""
+        self.expect("{")
+        if self.peek() == "}":
+            self._pos += 1
+            return
+        while True:
+            key = self.value()
+            if not isinstance(key, str):
+                raise json.JSONDecodeError("Ключ объекта должен быть строкой", self._buffer, self._pos)
+            self.expect(":")
+            yield key
+            if self.peek() == ",":
+                self._pos += 1
+                continue
+            self.expect("}")
+            return
+
+
+def iter_categories_from_json(
+    file_name: str = "products.json", products_only: bool = False, compact: bool = False
+):
+    """
+    Потоково читает JSON-файл каталога и по одной отдает категории (объекты Category).
+    Товары внутри категории тоже разбираются по одному, поэтому расход памяти
+    не зависит от размера файла. При products_only=True вместо категорий
+    отдаются словари с данными товаров, объекты не создаются. При compact=True
+    товары категории складываются в колоночное хранилище ProductStore.
+    """
+    from src.main import Category, Product  # Локальный импорт, чтобы избежать циклического импорта
+    from src.product_store import ProductStore
+
+    file_path = _data_file_path(file_name)
+    if not os.path.isfile(file_path):
+        print(f"Ошибка: файл '{file_path}' не найден.")
+        return
+
+    try:
+        with open(file_path, "r", encoding="utf-8") as file:
+            stream = _JsonStream(file)
+            for _ in stream.iter_array():
+                fields = {}
+                products = ProductStore() if compact else []
+                for key in stream.iter_object():
+                    if key != "products":
+                        fields[key] = stream.value()
+                        continue
+                    for _ in stream.iter_array():
+                        product_info = stream.value()
+                        if products_only:
+                            yield product_info
+                        else:
+                            with bulk_load():
+                                products.append(Product.new_product(product_info))
+                if not products_only:
+                    yield Category(fields["name"], fields["description"], products)
+
+    except (FileNotFoundError, json.JSONDecodeError) as e:
+        print(f"Ошибка загрузки JSON: {e}")
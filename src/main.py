@@ -1,15 +1,57 @@
+import gc
+import logging
+import math
+import operator
+import threading
 from abc import ABC, abstractmethod
+from collections import deque
+from itertools import repeat
 from typing import List
 
+import numpy as np
+
+from src import metrics, product_logging
 from src.load_products import load_categories_from_json
+from src.product_store import ProductStore
+from src.render_cache import default_render_cache
+
+
+# Полосы блокировок товаров: отдельная блокировка в каждом товаре стоила бы памяти на каждый объект
+_PRODUCT_LOCKS = tuple(threading.RLock() for _ in range(64))
+
+
+def _product_lock(product):
+    return _PRODUCT_LOCKS[(id(product) >> 4) % len(_PRODUCT_LOCKS)]
+
+
+# Прогоняет итератор до конца без сохранения результатов: циклы map выполняются на C
+_consume = deque(maxlen=0).extend
+
+
+def _slot_descriptor(cls, name: str):
+    for klass in cls.__mro__:
+        if name in klass.__dict__:
+            return klass.__dict__[name]
+    raise AttributeError(name)
 
 
 class BaseProduct(ABC):
+    # Без __dict__ у каждого экземпляра: на миллионах товаров это основная часть памяти
+    __slots__ = ("name", "description", "__price", "quantity", "_listeners", "_version", "__weakref__")
+
+    # Поля товара в порядке аргументов конструктора
+    fields = ("name", "description", "price", "quantity")
+
+    # Режим конкурентного доступа: запись публичного поля берет блокировку товара, чтобы чтение
+    # старого значения, запись и уведомление подписчиков были одной атомарной операцией.
+    # По умолчанию выключен, и однопоточный код не платит за блокировки
+    thread_safe = False
+
     def __init__(self, name: str, description: str, price: float, quantity: int):
-        self.name = name
-        self.description = description
-        self.__price = price
-        self.quantity = quantity
+        # Поля нового товара пишутся прямо в слоты: подписчиков у него еще нет
+        _set_listeners(self, None)
+        _set_version(self, 0)
+        self._init_fields((name, description, price, quantity))
 
     @abstractmethod
     def __str__(self):
@@ -23,22 +65,146 @@ class BaseProduct(ABC):
     def price(self, value):
         if value <= 0:
             raise ValueError("Цена должна быть больше нуля")
-        self.__price = value
+        _set_price(self, value)
+
+    def _init_fields(self, values, start: int = 0):
+        """Записывает значения полей, начиная с fields[start], прямо в слоты (только при создании товара)."""
+        for set_field, value in zip(self._field_setters[start:], values):
+            set_field(self, value)
+
+    def __setattr__(self, key, value):
+        if key[0] == "_":
+            object.__setattr__(self, key, value)
+            return
+        if not self.thread_safe:
+            if self._listeners:
+                self._set_field(key, value)
+            else:
+                object.__setattr__(self, key, value)
+                _set_version(self, self._version + 1)
+            return
+        with _product_lock(self):
+            self._set_field(key, value)
+
+    def _set_field(self, key, value):
+        old = getattr(self, key, None)
+        object.__setattr__(self, key, value)
+        _set_version(self, self._version + 1)
+        if self._listeners:
+            for listener in tuple(self._listeners):
+                listener(self, key, old, value)
+
+    def add_quantity(self, delta: int) -> int:
+        """Атомарно меняет остаток на delta и возвращает новое значение."""
+        with _product_lock(self):
+            self.quantity += delta
+            return self.quantity
+
+    def try_reserve(self, quantity: int) -> bool:
+        """Атомарно списывает quantity, если остатка хватает; возвращает, удалось ли списать."""
+        with _product_lock(self):
+            if self.quantity < quantity:
+                return False
+            self.quantity -= quantity
+            return True
+
+    def add_listener(self, listener):
+        """Подписывает listener(product, field, old, new) на изменения публичных полей товара."""
+        with _product_lock(self):
+            if self._listeners is None:
+                self._listeners = []
+            self._listeners.append(listener)
+
+    def remove_listener(self, listener):
+        with _product_lock(self):
+            self._listeners.remove(listener)
+
+    def to_dict(self) -> dict:
+        """Возвращает поля товара в виде словаря, пригодного для new_product."""
+        return {field: getattr(self, field) for field in self.fields}
+
+    def __init_subclass__(cls, **kwargs):
+        super().__init_subclass__(**kwargs)
+        # Прямые сеттеры слотов в порядке fields: _restore не ищет атрибуты по MRO и не идет через __setattr__
+        cls._field_set = frozenset(cls.fields)
+        cls._field_getter = operator.itemgetter(*cls.fields)
+        cls._field_setters = tuple(
+            _slot_descriptor(cls, "_BaseProduct__price" if field == "price" else field).__set__ for field in cls.fields
+        )
+
+    @classmethod
+    def _restore(cls, product_info: dict):
+        """Создает товар из уже проверенных данных, минуя __init__ (без проверок и логирования)."""
+        return cls._restore_values(cls._field_getter(product_info))
+
+    @classmethod
+    def _restore_values(cls, values):
+        """То же, что _restore, но значения полей передаются последовательностью в порядке fields."""
+        product = object.__new__(cls)
+        _set_listeners(product, None)
+        _set_version(product, 0)
+        for set_field, value in zip(cls._field_setters, values):
+            set_field(product, value)
+        return product
+
+    @classmethod
+    def _restore_many(cls, rows: list) -> list:
+        """То же, что _restore_values, для списка кортежей: поля пишутся по колонкам, без цикла Python по товарам."""
+        products = list(map(object.__new__, repeat(cls, len(rows))))
+        _consume(map(_set_listeners, products, repeat(None)))
+        _consume(map(_set_version, products, repeat(0)))
+        for set_field, column in zip(cls._field_setters, zip(*rows)):
+            _consume(map(set_field, products, column))
+        return products
+
+    def __reduce__(self):
+        # Подписчики не сериализуются: они относятся к объектам текущего процесса
+        return self.__class__._restore, (self.to_dict(),)
+
+
+_set_listeners = BaseProduct._listeners.__set__
+_set_version = BaseProduct._version.__set__
+_set_price = BaseProduct._BaseProduct__price.__set__
 
 
 class ProductLoggerMixin:
+    __slots__ = ()
+
     def __init__(self, *args, **kwargs):
         super().__init__(*args, **kwargs)
-        print(f"Создан объект: {self.__class__.__name__} с параметрами {self.__dict__}")
+        if not product_logging.is_suppressed() and product_logging.logger.isEnabledFor(logging.INFO):
+            product_logging.logger.info(
+                "Создан объект: %s с параметрами %s", self.__class__.__name__, product_logging.ProductParams(self)
+            )
 
 
 class Product(ProductLoggerMixin, BaseProduct):
+    __slots__ = ()
+
+    # Кэш строковых представлений; общий для всех товаров, можно заменить своим RenderCache
+    render_cache = default_render_cache
+
+    # Значение поля "type" в данных товара, которое явно выбирает этот класс
+    product_type = "product"
+    # Поле, по наличию которого класс определяется в данных без "type"
+    marker_field = None
+    # Реестр классов товаров: значение "type" -> класс; подклассы с product_type попадают сюда сами
+    registry = {}
+
+    def __init_subclass__(cls, **kwargs):
+        super().__init_subclass__(**kwargs)
+        if "product_type" in cls.__dict__:
+            Product.registry[cls.product_type] = cls
+
     def __init__(self, name: str, description: str, price: float, quantity: int):
         if quantity <= 0:
             raise ValueError("Товар с нулевым количеством не может быть добавлен.")
         super().__init__(name, description, price, quantity)
 
     def __str__(self):
+        return self.render_cache.render(self)
+
+    def _render(self):
         return f"{self.name}, {self.price} руб. Остаток: {self.quantity} шт."
 
     def __add__(self, other):
@@ -46,24 +212,126 @@ class Product(ProductLoggerMixin, BaseProduct):
             raise TypeError("Нельзя складывать товары разных типов")
         return self.price * self.quantity + other.price * other.quantity
 
+    @classmethod
+    def _resolve_class(cls, product_info: dict):
+        product_type = product_info.get("type")
+        if product_type is not None:
+            try:
+                return Product.registry[product_type]
+            except KeyError:
+                raise ValueError(f"Неизвестный тип товара: {product_type}") from None
+        for candidate in Product.registry.values():
+            if candidate.marker_field is not None and candidate.marker_field in product_info:
+                return candidate
+        return cls
+
     @classmethod
     def new_product(cls, product_info: dict):
-        if "efficiency" in product_info:
-            return Smartphone(**product_info)
-        elif "country" in product_info:
-            return LawnGrass(**product_info)
-        return cls(**product_info)
+        target = cls._resolve_class(product_info)
+        if "type" in product_info:
+            product_info = {key: value for key, value in product_info.items() if key != "type"}
+        return target(**product_info)
+
+    @classmethod
+    def new_products(cls, records) -> list:
+        """
+        Создает товары пачкой. Классы выбираются так же, как в new_product, но векторно на NumPy:
+        по полю "type" и по наличию marker_field у всех записей сразу. Затем вся пачка проверяется
+        целиком (набор полей, цена > 0 и количество > 0), и только после этого товары каждого класса
+        создаются по колонкам (BaseProduct._restore_many) без __init__ и без логирования каждого объекта.
+        При ошибке не создается ни один товар.
+        """
+        records = records if isinstance(records, list) else list(records)
+        count = len(records)
+        # Сборщик мусора на время пачки выключен: иначе он многократно обходит растущий список новых объектов
+        gc_enabled = gc.isenabled()
+        gc.disable()
+        try:
+            classes = [cls]
+            kinds = np.zeros(count, dtype=np.intp)
+            # Маркеры применяются с конца, чтобы у записи с несколькими маркерами победил первый, как в _resolve_class
+            for candidate in reversed(Product.registry.values()):
+                if candidate.marker_field is not None:
+                    marker = candidate.marker_field
+                    has_marker = np.array(list(map(operator.contains, records, repeat(marker))), dtype=bool)
+                    if has_marker.any():
+                        kinds[has_marker] = _class_code(classes, candidate)
+            typed = np.zeros(count, dtype=np.intp)
+            if any(map(operator.contains, records, repeat("type"))):
+                types = np.array(list(map(operator.methodcaller("get", "type"), records)), dtype=object)
+                typed = (types != None).astype(np.intp)  # noqa: E711 - поэлементное сравнение массива
+                for product_type in set(types[typed.astype(bool)].tolist()):
+                    target = cls._resolve_class({"type": product_type})
+                    kinds[types == product_type] = _class_code(classes, target)
+
+            sizes = np.fromiter(map(len, records), dtype=np.intp, count=count) - typed
+            wrong = np.flatnonzero(sizes != np.array([len(c.fields) for c in classes], dtype=np.intp)[kinds])
+            if wrong.size:
+                _raise_fields_error(records, int(wrong[0]), classes[kinds[wrong[0]]])
+
+            batches = []
+            invalid = []
+            for code, target in enumerate(classes):
+                numbers = np.flatnonzero(kinds == code)
+                if not numbers.size:
+                    continue
+                group = list(map(records.__getitem__, numbers.tolist()))
+                try:
+                    rows = list(map(target._field_getter, group))
+                except KeyError:
+                    # Число полей уже совпало, поэтому ошибка - у записи нет какого-то поля класса
+                    number = next(int(n) for n, r in zip(numbers, group) if not r.keys() >= target._field_set)
+                    _raise_fields_error(records, number, target)
+                price, quantity = (operator.itemgetter(target.fields.index(field)) for field in ("price", "quantity"))
+                prices = np.fromiter(map(price, rows), dtype=np.float64, count=len(rows))
+                quantities = np.fromiter(map(quantity, rows), dtype=np.float64, count=len(rows))
+                invalid.extend(numbers[(prices <= 0) | (quantities <= 0)].tolist())
+                batches.append((numbers, target, rows))
+            if invalid:
+                number = min(invalid)
+                name = records[number]["name"]
+                raise ValueError(f"Товар #{number} '{name}': цена и количество должны быть больше нуля")
+
+            products = []
+            for _, target, rows in batches:
+                products.extend(target._restore_many(rows))
+            if len(batches) > 1:
+                # Товары собраны по классам - возвращаем их в порядке записей
+                order = np.concatenate([numbers for numbers, _, _ in batches])
+                positions = np.empty(count, dtype=np.intp)
+                positions[order] = np.arange(count)
+                products = list(map(products.__getitem__, positions.tolist()))
+        finally:
+            if gc_enabled:
+                gc.enable()
+        if not product_logging.is_suppressed() and product_logging.logger.isEnabledFor(logging.INFO):
+            product_logging.logger.info("Создано товаров пачкой: %d", len(products))
+        return products
+
+
+def _class_code(classes: list, target) -> int:
+    if target not in classes:
+        classes.append(target)
+    return classes.index(target)
+
+
+def _raise_fields_error(records: list, number: int, target):
+    raise TypeError(f"Товар #{number}: поля {sorted(records[number])} не соответствуют классу {target.__name__}")
 
 
 class Smartphone(Product):
+    __slots__ = ("efficiency", "model", "memory", "color")
+
+    product_type = "smartphone"
+    marker_field = "efficiency"
+
+    fields = Product.fields + ("efficiency", "model", "memory", "color")
+
     def __init__(self, name, description, price, quantity, efficiency, model, memory, color):
         super().__init__(name, description, price, quantity)
-        self.efficiency = efficiency
-        self.model = model
-        self.memory = memory
-        self.color = color
+        self._init_fields((efficiency, model, memory, color), len(Product.fields))
 
-    def __str__(self):
+    def _render(self):
         return (
             f"{self.name} ({self.model}), {self.memory}GB, {self.color}, "
             f"{self.price} руб. Остаток: {self.quantity} шт."
@@ -71,13 +339,18 @@ class Smartphone(Product):
 
 
 class LawnGrass(Product):
+    __slots__ = ("country", "germination_period", "color")
+
+    product_type = "lawn_grass"
+    marker_field = "country"
+
+    fields = Product.fields + ("country", "germination_period", "color")
+
     def __init__(self, name, description, price, quantity, country, germination_period, color):
         super().__init__(name, description, price, quantity)
-        self.country = country
-        self.germination_period = germination_period
-        self.color = color
+        self._init_fields((country, germination_period, color), len(Product.fields))
 
-    def __str__(self):
+    def _render(self):
         return (
             f"{self.name}, {self.country}, {self.color}, "
             f"срок прорастания: {self.germination_period}, "
@@ -85,6 +358,9 @@ class LawnGrass(Product):
         )
 
 
+Product.registry[Product.product_type] = Product
+
+
 class AbstractEntity(ABC):
     def __init__(self, name: str, description: str):
         self.name = name
@@ -99,40 +375,149 @@ class Category(AbstractEntity):
     category_count = 0
     product_count = 0
 
+    # Блокировка счетчиков класса: += над атрибутом класса не атомарен между потоками
+    _counter_lock = threading.Lock()
+
+    # Сверять накопленные суммы с полным пересчетом при каждом чтении (для отладки)
+    debug = False
+
     def __init__(self, name: str, description: str, products: List[Product]):
         super().__init__(name, description)
+        with Category._counter_lock:
+            Category.category_count += 1
+
+        # Блокировка категории: защищает состав и накопленные суммы.
+        # Порядок захвата всегда: сначала блокировка товара, потом категории
+        self._lock = threading.RLock()
+
+        # Подписчики на изменения категории: получают изменения полей товаров и событие
+        # field="products" при добавлении (old=None, new=товар) и удалении (old=товар, new=None)
+        self._listeners = []
+
+        # Версия состава и товаров категории и закэшированный по ней formatted_products()
+        self._version = 0
+        self._formatted = None
+        self._set_products(products)
+
+    def _set_products(self, products: List[Product]):
         self.products = products
-        Category.category_count += 1
-        Category.product_count += len(products)
+        with Category._counter_lock:
+            Category.product_count += len(products)
+
+        # Накопленные суммы: Σ(цена * остаток) и Σ остатков, обновляются при изменении товаров
+        self._total_value = 0
+        self._total_quantity = 0
+        if isinstance(products, ProductStore):
+            self._total_value, self._total_quantity = products.totals()
+            products.add_listener(self._on_product_change)
+        else:
+            for product in products:
+                with _product_lock(product):
+                    self._track(product)
+
+    def _track(self, product: Product):
+        self._total_value += product.price * product.quantity
+        self._total_quantity += product.quantity
+        if not isinstance(self.products, ProductStore):
+            product.add_listener(self._on_product_change)
+
+    def _untrack(self, product: Product):
+        self._total_value -= product.price * product.quantity
+        self._total_quantity -= product.quantity
+        product.remove_listener(self._on_product_change)
+
+    def _on_product_change(self, product, field, old, new):
+        with self._lock:
+            self._version += 1
+            if field == "price":
+                self._total_value += (new - old) * product.quantity
+            elif field == "quantity":
+                self._total_value += product.price * (new - old)
+                self._total_quantity += new - old
+        for listener in tuple(self._listeners):
+            listener(product, field, old, new)
+
+    def add_listener(self, listener):
+        """Подписывает listener(product, field, old, new) на изменения товаров категории и их состава."""
+        self._listeners.append(listener)
+
+    def remove_listener(self, listener):
+        self._listeners.remove(listener)
+
+    def _totals(self):
+        with self._lock:
+            if self.debug:
+                self._check_totals()
+            return self._total_value, self._total_quantity
+
+    def _check_totals(self):
+        total_value = sum(product.price * product.quantity for product in self.products)
+        total_quantity = sum(product.quantity for product in self.products)
+        if total_quantity != self._total_quantity or not math.isclose(
+            total_value, self._total_value, rel_tol=1e-9, abs_tol=1e-6
+        ):
+            raise AssertionError(f"Накопленные суммы категории '{self.name}' разошлись с пересчетом")
 
     def add_product(self, product: Product):
         if not isinstance(product, Product):
             raise TypeError("Можно добавлять только объекты Product или его подклассов")
-        self.products.append(product)
-        Category.product_count += 1
+        with _product_lock(product), self._lock:
+            self.products.append(product)
+            self._version += 1
+            with Category._counter_lock:
+                Category.product_count += 1
+            self._track(product)
+        for listener in tuple(self._listeners):
+            listener(product, "products", None, product)
+
+    def remove_product(self, product: Product):
+        """Удаляет товар из категории. ValueError, если товара в категории нет."""
+        if isinstance(self.products, ProductStore):
+            raise TypeError("Категория на ProductStore не поддерживает удаление товаров")
+        with _product_lock(product), self._lock:
+            self.products.remove(product)
+            self._version += 1
+            with Category._counter_lock:
+                Category.product_count -= 1
+            self._untrack(product)
+        for listener in tuple(self._listeners):
+            listener(product, "products", product, None)
 
     def __str__(self):
-        total_quantity = sum(product.quantity for product in self.products)
+        _, total_quantity = self._totals()
         return f"{self.name}, количество продуктов: {total_quantity} шт."
 
     def __iter__(self):
         return iter(self.products)
 
-    def formatted_products(self):
-        return "\n".join(str(product) for product in self.products)
+    def __aiter__(self):
+        from src.async_load import aiter_products  # Локальный импорт, чтобы избежать циклического импорта
+
+        return aiter_products(self)
 
+    def formatted_products(self):
+        # Длина списка входит в ключ на случай изменения self.products в обход add_product
+        key = (self._version, len(self.products))
+        if self._formatted is not None and self._formatted[0] == key:
+            return self._formatted[1]
+        text = "\n".join(str(product) for product in self.products)
+        self._formatted = (key, text)
+        return text
+
+    @metrics.instrumented("category_middle_price")
     def middle_price(self):
         try:
-            if not self.products:
-                return 0  # Если в категории нет товаров, возвращаем 0
-
-            total_price = sum(product.price * product.quantity for product in self.products)
-            total_quantity = sum(product.quantity for product in self.products)
-
-            return round(total_price / total_quantity, 2) if total_quantity > 0 else 0
+            total_value, total_quantity = self._totals()
+            return round(total_value / total_quantity, 2) if total_quantity > 0 else 0
         except ZeroDivisionError:
             return 0  # Защита от деления на 0 (на случай ошибок)
 
+    def stats(self, percentiles=(50,)) -> dict:
+        """Сводные показатели категории, посчитанные на NumPy (см. src.aggregates)."""
+        from src.aggregates import category_stats  # Локальный импорт, чтобы избежать циклического импорта
+
+        return category_stats(self, percentiles)
+
 
 class OrderException(Exception):
     """Класс исключения для ошибок при добавлении товаров в заказ."""
@@ -142,6 +527,7 @@ class OrderException(Exception):
 
 
 class Order(AbstractEntity):
+    @metrics.instrumented("order_create")
     def __init__(self, product: Product, quantity: int):
         if quantity <= 0:
             raise OrderException(
@@ -153,12 +539,25 @@ class Order(AbstractEntity):
         self.quantity = quantity
         self.total_price = product.price * quantity
 
+    @classmethod
+    def _restore(cls, product: Product, quantity: int, total_price: float):
+        """Создает заказ из уже проверенных данных с заранее посчитанной стоимостью."""
+        order = cls.__new__(cls)
+        order.name = product.name
+        order.description = f"Заказ на {quantity} шт."
+        order.product = product
+        order.quantity = quantity
+        order.total_price = total_price
+        return order
+
     def __str__(self):
         return f"Заказ: {self.product.name}, Количество: {self.quantity}, Итоговая стоимость: {self.total_price} руб."
 
 
 def main():
-    categories = load_categories_from_json("data/products.json")
+    from src.snapshot import load_catalog  # Локальный импорт, чтобы избежать циклического импорта
+
+    categories = load_catalog("products.json")
     for category in categories:
         print(f"Категория: {category.name}, Описание: {category.description}")
         print(category.formatted_products())
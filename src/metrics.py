@@ -0,0 +1,183 @@
+import cProfile
+import functools
+import io
+import pstats
+import sys
+import threading
+import time
+from bisect import bisect_left
+from contextlib import contextmanager
+
+# Инструментирование выключено по умолчанию: тогда каждая точка замера - одна проверка флага
+enabled = False
+
+PREFIX = "catalog_"
+DEFAULT_BUCKETS = (0.0001, 0.0005, 0.001, 0.005, 0.01, 0.05, 0.1, 0.5, 1.0, 5.0, 10.0)
+
+
+class Counter:
+    def __init__(self):
+        self.value = 0
+        self._lock = threading.Lock()
+
+    def inc(self, amount=1):
+        with self._lock:
+            self.value += amount
+
+
+class Histogram:
+    """Гистограмма с фиксированными верхними границами корзин, как в Prometheus."""
+
+    def __init__(self, buckets=DEFAULT_BUCKETS):
+        self.buckets = tuple(buckets)
+        self.counts = [0] * (len(self.buckets) + 1)
+        self.sum = 0.0
+        self.count = 0
+        self._lock = threading.Lock()
+
+    def observe(self, value: float):
+        position = bisect_left(self.buckets, value)
+        with self._lock:
+            self.counts[position] += 1
+            self.sum += value
+            self.count += 1
+
+
+class Registry:
+    def __init__(self):
+        self.counters = {}
+        self.histograms = {}
+        self._lock = threading.Lock()
+
+    def counter(self, name: str) -> Counter:
+        counter = self.counters.get(name)
+        if counter is None:
+            with self._lock:
+                counter = self.counters.setdefault(name, Counter())
+        return counter
+
+    def histogram(self, name: str) -> Histogram:
+        histogram = self.histograms.get(name)
+        if histogram is None:
+            with self._lock:
+                histogram = self.histograms.setdefault(name, Histogram())
+        return histogram
+
+    def clear(self):
+        with self._lock:
+            self.counters.clear()
+            self.histograms.clear()
+
+
+registry = Registry()
+
+
+def enable():
+    global enabled
+    enabled = True
+
+
+def disable():
+    global enabled
+    enabled = False
+
+
+def inc(name: str, amount=1):
+    if enabled:
+        registry.counter(name).inc(amount)
+
+
+def observe(name: str, value: float):
+    if enabled:
+        registry.histogram(name).observe(value)
+
+
+class timer:
+    """Контекстный менеджер: записывает длительность блока в гистограмму name (в секундах)."""
+
+    __slots__ = ("name", "_start")
+
+    def __init__(self, name: str):
+        self.name = name
+        self._start = None
+
+    def __enter__(self):
+        if enabled:
+            self._start = time.perf_counter()
+        return self
+
+    def __exit__(self, *exc_info):
+        if self._start is not None:
+            registry.histogram(self.name).observe(time.perf_counter() - self._start)
+        return False
+
+
+def instrumented(name: str):
+    """
+    Декоратор точки входа: считает вызовы (name_total), ошибки (name_errors_total)
+    и длительность (name_seconds). При выключенном инструментировании - только проверка флага.
+    """
+
+    def decorator(func):
+        @functools.wraps(func)
+        def wrapper(*args, **kwargs):
+            if not enabled:
+                return func(*args, **kwargs)
+            start = time.perf_counter()
+            try:
+                return func(*args, **kwargs)
+            except Exception:
+                registry.counter(f"{name}_errors_total").inc()
+                raise
+            finally:
+                registry.counter(f"{name}_total").inc()
+                registry.histogram(f"{name}_seconds").observe(time.perf_counter() - start)
+
+        return wrapper
+
+    return decorator
+
+
+def export_prometheus(file_name: str = None) -> str:
+    """Выгружает метрики в текстовом формате Prometheus в файл или, если файл не указан, в stdout."""
+    lines = []
+    for name, counter in sorted(registry.counters.items()):
+        lines.append(f"# TYPE {PREFIX}{name} counter")
+        lines.append(f"{PREFIX}{name} {counter.value}")
+    for name, histogram in sorted(registry.histograms.items()):
+        lines.append(f"# TYPE {PREFIX}{name} histogram")
+        cumulative = 0
+        for bound, count in zip(histogram.buckets + (float("inf"),), histogram.counts):
+            cumulative += count
+            label = "+Inf" if bound == float("inf") else repr(bound)
+            lines.append(f'{PREFIX}{name}_bucket{{le="{label}"}} {cumulative}')
+        lines.append(f"{PREFIX}{name}_sum {histogram.sum}")
+        lines.append(f"{PREFIX}{name}_count {histogram.count}")
+    text = "\n".join(lines) + "\n"
+
+    if file_name is None:
+        sys.stdout.write(text)
+    else:
+        with open(file_name, "w", encoding="utf-8") as file:
+            file.write(text)
+    return text
+
+
+@contextmanager
+def profile(file_name: str = None, sort: str = "cumulative", limit: int = 30):
+    """
+    Снимает cProfile блока операций с каталогом. Если указан file_name, сырые данные
+    сохраняются в файл (для pstats/snakeviz), иначе в stdout печатается топ limit функций.
+    """
+    profiler = cProfile.Profile()
+    profiler.enable()
+    try:
+        yield profiler
+    finally:
+        profiler.disable()
+        if file_name is not None:
+            profiler.dump_stats(file_name)
+        else:
+            stream = io.StringIO()
+            pstats.Stats(profiler, stream=stream).sort_stats(sort).print_stats(limit)
+            sys.stdout.write(stream.getvalue())
@@ -0,0 +1,210 @@
+import threading
+import time
+from array import array
+from bisect import bisect_left
+
+import numpy as np
+
+_GROUPS = ("product", "category")
+
+
+def _empty_totals() -> dict:
+    return {"count": 0, "quantity": 0, "revenue": 0.0}
+
+
+class OrderBook:
+    """
+    Журнал строк заказов с колоночным хранением и накопленными итогами.
+
+    Каждая строка - время, коды товара и категории, количество и стоимость - лежит
+    в параллельных массивах array; сами объекты Order не хранятся. Итоги по товарам и
+    категориям обновляются при добавлении, поэтому totals() не перебирает строки.
+    Агрегаты за интервал времени считаются на NumPy по отсортированной по времени колонке:
+    строки, добавленные не по порядку (или после merge), сортируются один раз перед запросом.
+
+    Товары и категории различаются по имени, поэтому журналы, собранные в разных потоках или
+    процессах (журнал сериализуется pickle), можно объединить через merge().
+    Категория строки берется из categories (по имени товара) или передается явно; иначе None.
+    """
+
+    def __init__(self, categories=()):
+        self._category_of = {product.name: category.name for category in categories for product in category.products}
+        self._timestamps = array("d")
+        self._product_codes = array("q")
+        self._category_codes = array("q")
+        self._quantities = array("q")
+        self._revenues = array("d")
+        self._keys = {"product": [], "category": []}
+        self._codes = {"product": {}, "category": {}}
+        self._totals = {"product": {}, "category": {}}
+        self._sorted = True
+        self._lock = threading.Lock()
+
+    def __getstate__(self):
+        state = self.__dict__.copy()
+        del state["_lock"]
+        return state
+
+    def __setstate__(self, state):
+        self.__dict__.update(state)
+        self._lock = threading.Lock()
+
+    def __len__(self):
+        return len(self._quantities)
+
+    def _code(self, group: str, key) -> int:
+        codes = self._codes[group]
+        code = codes.get(key)
+        if code is None:
+            code = codes[key] = len(self._keys[group])
+            self._keys[group].append(key)
+        return code
+
+    def _accumulate(self, group: str, key, count: int, quantity: int, revenue: float):
+        totals = self._totals[group].get(key)
+        if totals is None:
+            totals = self._totals[group][key] = _empty_totals()
+        totals["count"] += count
+        totals["quantity"] += quantity
+        totals["revenue"] += revenue
+
+    def add(self, order, timestamp: float = None, category: str = None):
+        """Добавляет строку заказа; timestamp по умолчанию - текущее время (time.time())."""
+        self.extend((order,), timestamp, category)
+
+    def extend(self, orders, timestamp: float = None, category: str = None):
+        """Добавляет строки заказов с общим временем timestamp (по умолчанию текущее время)."""
+        if timestamp is None:
+            timestamp = time.time()
+        with self._lock:
+            for order in orders:
+                product = order.product.name
+                category_name = category if category is not None else self._category_of.get(product)
+                if self._timestamps and timestamp < self._timestamps[-1]:
+                    self._sorted = False
+                self._timestamps.append(timestamp)
+                self._product_codes.append(self._code("product", product))
+                self._category_codes.append(self._code("category", category_name))
+                self._quantities.append(order.quantity)
+                self._revenues.append(order.total_price)
+                self._accumulate("product", product, 1, order.quantity, order.total_price)
+                self._accumulate("category", category_name, 1, order.quantity, order.total_price)
+
+    def record(self, index: int) -> dict:
+        """Возвращает строку журнала по индексу (строки упорядочены по времени после первого запроса за интервал)."""
+        with self._lock:
+            return {
+                "timestamp": self._timestamps[index],
+                "product": self._keys["product"][self._product_codes[index]],
+                "category": self._keys["category"][self._category_codes[index]],
+                "quantity": self._quantities[index],
+                "total_price": self._revenues[index],
+            }
+
+    def totals(self, by: str = None) -> dict:
+        """
+        Накопленные итоги count, quantity, revenue: по всему журналу (by=None)
+        или словарь {товар или категория: итоги} при by="product" / "category".
+        """
+        if by is None:
+            with self._lock:
+                return {
+                    "count": len(self),
+                    "quantity": sum(total["quantity"] for total in self._totals["product"].values()),
+                    "revenue": sum(total["revenue"] for total in self._totals["product"].values()),
+                }
+        self._check_group(by)
+        with self._lock:
+            return {key: dict(total) for key, total in self._totals[by].items()}
+
+    @staticmethod
+    def _check_group(by: str):
+        if by not in _GROUPS:
+            raise ValueError(f"Группировка возможна только по {', '.join(_GROUPS)}, получено '{by}'")
+
+    def _ensure_sorted(self):
+        """Упорядочивает строки по времени (устойчиво), если они добавлялись не по порядку."""
+        if self._sorted:
+            return
+        order = np.argsort(np.frombuffer(self._timestamps, dtype=np.float64), kind="stable")
+        for name in ("_timestamps", "_product_codes", "_category_codes", "_quantities", "_revenues"):
+            column = getattr(self, name)
+            values = np.frombuffer(column, dtype=np.float64 if column.typecode == "d" else np.int64)[order]
+            setattr(self, name, array(column.typecode, values.tobytes()))
+        self._sorted = True
+
+    def window(self, start: float = None, end: float = None, by: str = None) -> dict:
+        """
+        Итоги count, quantity, revenue по строкам с временем в [start, end) - по всему интервалу
+        (by=None) или по товарам/категориям (by="product" / "category"), как totals().
+        """
+        if by is not None:
+            self._check_group(by)
+        with self._lock:
+            self._ensure_sorted()
+            low = 0 if start is None else bisect_left(self._timestamps, start)
+            high = len(self) if end is None else bisect_left(self._timestamps, end)
+            high = max(low, high)
+            # Срезы array - копии, поэтому журнал можно пополнять, пока идет подсчет
+            quantities = np.frombuffer(self._quantities[low:high], dtype=np.int64)
+            revenues = np.frombuffer(self._revenues[low:high], dtype=np.float64)
+            if by is None:
+                return {"count": high - low, "quantity": int(quantities.sum()), "revenue": float(revenues.sum())}
+            column = self._product_codes if by == "product" else self._category_codes
+            codes = np.frombuffer(column[low:high], dtype=np.int64)
+            keys = list(self._keys[by])
+
+        counts = np.bincount(codes, minlength=len(keys))
+        quantity_sums = np.bincount(codes, weights=quantities, minlength=len(keys))
+        revenue_sums = np.bincount(codes, weights=revenues, minlength=len(keys))
+        return {
+            keys[code]: {
+                "count": int(counts[code]),
+                "quantity": int(quantity_sums[code]),
+                "revenue": float(revenue_sums[code]),
+            }
+            for code in np.flatnonzero(counts).tolist()
+        }
+
+    def top(self, k: int, by: str = "product", start: float = None, end: float = None) -> list:
+        """Возвращает k пар (товар или категория, выручка) с наибольшей выручкой за интервал [start, end)."""
+        if start is None and end is None:
+            self._check_group(by)
+            with self._lock:
+                revenues = [(key, total["revenue"]) for key, total in self._totals[by].items()]
+        else:
+            revenues = [(key, total["revenue"]) for key, total in self.window(start, end, by).items()]
+        return sorted(revenues, key=lambda item: item[1], reverse=True)[:k]
+
+    def merge(self, other: "OrderBook") -> "OrderBook":
+        """Добавляет строки и итоги другого журнала (например, собранного в другом процессе); возвращает self."""
+        with other._lock:
+            timestamps = other._timestamps[:]
+            product_codes = np.frombuffer(other._product_codes[:], dtype=np.int64)
+            category_codes = np.frombuffer(other._category_codes[:], dtype=np.int64)
+            quantities = other._quantities[:]
+            revenues = other._revenues[:]
+            keys = {group: list(other._keys[group]) for group in _GROUPS}
+            totals = {group: {key: dict(total) for key, total in other._totals[group].items()} for group in _GROUPS}
+            category_of = dict(other._category_of)
+            other_sorted = other._sorted
+
+        with self._lock:
+            for product, category in category_of.items():
+                self._category_of.setdefault(product, category)
+            remap = {
+                group: np.array([self._code(group, key) for key in keys[group]] or [0], dtype=np.int64)
+                for group in _GROUPS
+            }
+            if timestamps and self._timestamps and timestamps[0] < self._timestamps[-1]:
+                self._sorted = False
+            self._sorted = self._sorted and other_sorted
+            self._timestamps.extend(timestamps)
+            self._product_codes.frombytes(remap["product"][product_codes].tobytes())
+            self._category_codes.frombytes(remap["category"][category_codes].tobytes())
+            self._quantities.extend(quantities)
+            self._revenues.extend(revenues)
+            for group in _GROUPS:
+                for key, total in totals[group].items():
+                    self._accumulate(group, key, total["count"], total["quantity"], total["revenue"])
+        return self
@@ -0,0 +1,68 @@
+import numpy as np
+
+from src import metrics
+from src.main import Order, OrderException, Product, _product_lock
+
+
+class OrderEngine:
+    """
+    Пакетная обработка заказов с резервированием остатков.
+
+    Все строки пакета проверяются за один проход: ошибка в строке дает OrderException
+    для этой строки и не отменяет остальные. Проверка остатка и списание выполняются
+    одним шагом под блокировкой товара (BaseProduct.try_reserve), поэтому ни другой движок,
+    ни прямая запись в товар не продадут тот же остаток дважды. Если во время списания
+    упал подписчик товара, списанное по пакету возвращается. Стоимости строк считаются
+    векторно на NumPy. Если передан book (OrderBook), созданные заказы записываются в него.
+    """
+
+    def __init__(self, book=None):
+        self.book = book
+
+    def process(self, lines):
+        """
+        Обрабатывает пакет строк заказа - пар (товар, количество).
+        Возвращает (orders, errors): список созданных Order в порядке строк
+        и словарь {номер строки: OrderException}.
+        """
+        lines = list(lines)
+        errors = {}
+        accepted = []
+        try:
+            for number, (product, quantity) in enumerate(lines):
+                if not isinstance(product, Product):
+                    errors[number] = OrderException("В заказ можно добавить только объекты Product.")
+                    continue
+                if quantity <= 0:
+                    errors[number] = OrderException("Нельзя добавить в заказ товар с нулевым количеством.")
+                    continue
+                with _product_lock(product):
+                    # Цена читается до списания: стоимость соответствует моменту резервирования
+                    price = product.price
+                    # Запись остатка происходит до уведомления подписчиков, поэтому строка считается списанной заранее
+                    accepted.append((product, quantity, price))
+                    if not product.try_reserve(quantity):
+                        accepted.pop()
+                        errors[number] = OrderException(
+                            f"Недостаточно товара '{product.name}': доступно {product.quantity} шт."
+                        )
+        except Exception:
+            for product, quantity, _ in reversed(accepted):
+                product.add_quantity(quantity)
+            raise
+
+        metrics.inc("order_create_total", len(lines))
+        metrics.inc("order_create_errors_total", len(errors))
+        if not accepted:
+            return [], errors
+        prices = np.fromiter((price for _, _, price in accepted), dtype=np.float64, count=len(accepted))
+        quantities = np.fromiter((quantity for _, quantity, _ in accepted), dtype=np.int64, count=len(accepted))
+        totals = (prices * quantities).tolist()
+        # Целые цены умножаются точно, как в Order.__init__: стоимость остается int
+        orders = [
+            Order._restore(product, quantity, price * quantity if type(price) is int else total)
+            for (product, quantity, price), total in zip(accepted, totals)
+        ]
+        if self.book is not None:
+            self.book.extend(orders)
+        return orders, errors
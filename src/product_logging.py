@@ -0,0 +1,131 @@
+import logging
+import queue
+import threading
+import time
+from contextlib import contextmanager
+from logging.handlers import QueueHandler, QueueListener
+
+logger = logging.getLogger("src.products")
+
+_bulk_depth = 0
+_bulk_lock = threading.Lock()
+_listener = None
+_handler = None
+
+
+_UNSET = object()
+
+
+class ProductParams:
+    """
+    Поля товара для записи лога: значения снимаются в момент вызова (в потоке, создающем товар),
+    а строка собирается только при форматировании записи в потоке QueueListener.
+    """
+
+    __slots__ = ("items",)
+
+    def __init__(self, product):
+        items = []
+        for field in product.fields:
+            value = getattr(product, field, _UNSET)
+            if value is not _UNSET:
+                items.append((field, value))
+        self.items = tuple(items)
+
+    def __str__(self):
+        return str(dict(self.items))
+
+
+def is_suppressed() -> bool:
+    """Возвращает True, пока активен режим массовой загрузки."""
+    return _bulk_depth > 0
+
+
+@contextmanager
+def bulk_load():
+    """Режим массовой загрузки: логирование создания отдельных товаров полностью отключено."""
+    global _bulk_depth
+    with _bulk_lock:
+        _bulk_depth += 1
+    try:
+        yield
+    finally:
+        with _bulk_lock:
+            _bulk_depth -= 1
+
+
+class SamplingFilter(logging.Filter):
+    """Пропускает каждую every-ю запись и не больше max_per_second записей в секунду."""
+
+    def __init__(self, every: int = 1, max_per_second: int = None):
+        super().__init__()
+        self.every = every
+        self.max_per_second = max_per_second
+        self._seen = 0
+        self._window = None
+        self._in_window = 0
+        self._lock = threading.Lock()
+
+    def filter(self, record) -> bool:
+        with self._lock:
+            self._seen += 1
+            if (self._seen - 1) % self.every:
+                return False
+            if self.max_per_second is None:
+                return True
+            window = int(time.monotonic())
+            if window != self._window:
+                self._window = window
+                self._in_window = 0
+            if self._in_window >= self.max_per_second:
+                return False
+            self._in_window += 1
+            return True
+
+
+class _LazyQueueHandler(QueueHandler):
+    """QueueHandler, который не форматирует запись в вызывающем потоке: это делает QueueListener."""
+
+    def prepare(self, record):
+        return record
+
+
+def setup_product_logging(
+    level: int = logging.INFO,
+    stream=None,
+    file_name: str = None,
+    every: int = 1,
+    max_per_second: int = None,
+) -> QueueListener:
+    """
+    Включает логирование товаров через очередь: запись в терминал или файл
+    выполняет отдельный поток QueueListener, а не поток загрузки.
+    Повторный вызов заменяет предыдущую настройку.
+    """
+    global _listener, _handler
+    shutdown_product_logging()
+
+    target = logging.FileHandler(file_name, encoding="utf-8") if file_name else logging.StreamHandler(stream)
+    target.setFormatter(logging.Formatter("%(asctime)s %(levelname)s %(name)s: %(message)s"))
+
+    _handler = _LazyQueueHandler(queue.SimpleQueue())
+    _handler.addFilter(SamplingFilter(every, max_per_second))
+    logger.addHandler(_handler)
+    logger.setLevel(level)
+
+    _listener = QueueListener(_handler.queue, target, respect_handler_level=True)
+    _listener.start()
+    return _listener
+
+
+def shutdown_product_logging():
+    """Дописывает накопленные в очереди записи и отключает логирование товаров."""
+    global _listener, _handler
+    if _listener is not None:
+        _listener.stop()
+        for handler in _listener.handlers:
+            handler.close()
+        _listener = None
+    if _handler is not None:
+        logger.removeHandler(_handler)
+        _handler = None
@@ -0,0 +1,122 @@
+import operator
+import sys
+import weakref
+from array import array
+from functools import partial
+
+
+def _intern(value):
+    return sys.intern(value) if type(value) is str else value
+
+
+class ProductStore:
+    """
+    Колоночное хранилище товаров категории.
+
+    Цены и остатки лежат в параллельных массивах array, строковые поля - в списках
+    интернированных строк. Объекты Product не хранятся: при обращении по индексу
+    создается представление (обычный объект Product нужного класса), изменения цены
+    и других полей которого записываются обратно в колонки. Пока на представление
+    есть ссылки, по тому же индексу возвращается тот же объект.
+
+    Цены хранятся как float, а отдельная колонка флагов помнит, была ли цена int:
+    целая цена 200000 возвращается как 200000, и строковое представление товара не меняется.
+    """
+
+    def __init__(self, products=()):
+        self._classes = []
+        self._kinds = array("B")
+        self._prices = array("d")
+        self._int_prices = array("B")
+        self._quantities = array("q")
+        self._columns = {}
+        self._views = weakref.WeakValueDictionary()
+        self._listeners = []
+        self.extend(products)
+
+    def __len__(self):
+        return len(self._kinds)
+
+    def __getitem__(self, index: int):
+        if index < 0:
+            index += len(self)
+        if not 0 <= index < len(self):
+            raise IndexError("Индекс товара вне диапазона")
+        product = self._views.get(index)
+        if product is None:
+            product = self._classes[self._kinds[index]]._restore(self.record(index))
+            self._attach(index, product)
+        return product
+
+    def __iter__(self):
+        for index in range(len(self)):
+            yield self[index]
+
+    def append(self, product):
+        cls = type(product)
+        if cls not in self._classes:
+            self._classes.append(cls)
+        index = len(self)
+        self._kinds.append(self._classes.index(cls))
+        self._prices.append(product.price)
+        self._int_prices.append(type(product.price) is int)
+        self._quantities.append(product.quantity)
+        for field in cls.fields[4:]:
+            column = self._columns.get(field)
+            if column is None:
+                column = self._columns[field] = [None] * index
+            column.append(_intern(getattr(product, field)))
+        for field in ("name", "description"):
+            self._columns.setdefault(field, []).append(_intern(getattr(product, field)))
+        for column in self._columns.values():
+            if len(column) == index:
+                column.append(None)
+        self._attach(index, product)
+
+    def extend(self, products):
+        for product in products:
+            self.append(product)
+
+    def _price(self, index: int):
+        """Цена по индексу в исходном типе (int или float)."""
+        price = self._prices[index]
+        return int(price) if self._int_prices[index] else price
+
+    def record(self, index: int) -> dict:
+        """Возвращает поля товара по индексу в виде словаря, не создавая объект."""
+        cls = self._classes[self._kinds[index]]
+        product_info = {"price": self._price(index), "quantity": self._quantities[index]}
+        for field in cls.fields:
+            if field not in product_info:
+                product_info[field] = self._columns[field][index]
+        return product_info
+
+    def columns(self):
+        """Возвращает (classes, kinds, prices, quantities): список классов и массивы колонок без копирования."""
+        return self._classes, self._kinds, self._prices, self._quantities
+
+    def totals(self):
+        """Возвращает (Σ цена * остаток, Σ остатков) по всем товарам хранилища."""
+        return sum(map(operator.mul, self._prices, self._quantities)), sum(self._quantities)
+
+    def add_listener(self, listener):
+        """Подписывает listener(product, field, old, new) на изменения любого товара хранилища."""
+        self._listeners.append(listener)
+
+    def remove_listener(self, listener):
+        self._listeners.remove(listener)
+
+    def _attach(self, index: int, product):
+        self._views[index] = product
+        product.add_listener(partial(self._write_back, index))
+
+    def _write_back(self, index, product, field, old, new):
+        if field == "price":
+            self._prices[index] = new
+            self._int_prices[index] = type(new) is int
+        elif field == "quantity":
+            self._quantities[index] = new
+        elif field in self._columns:
+            self._columns[field][index] = _intern(new)
+        for listener in tuple(self._listeners):
+            listener(product, field, old, new)
@@ -0,0 +1,260 @@
+import heapq
+import operator
+
+import numpy as np
+
+from src.aggregates import _columns, _middle_price
+from src.product_store import ProductStore
+
+_OPERATORS = {
+    "==": operator.eq,
+    "!=": operator.ne,
+    "<": operator.lt,
+    "<=": operator.le,
+    ">": operator.gt,
+    ">=": operator.ge,
+    "in": None,
+}
+
+# Поля, для которых есть массивы NumPy: условия по ним проверяются векторно
+_NUMERIC = ("price", "quantity")
+
+
+def _stable_smallest(values: np.ndarray, k: int) -> np.ndarray:
+    """Позиции k наименьших значений в порядке возрастания (равные - по позиции), без сортировки всего массива."""
+    if k <= 0:
+        return np.empty(0, dtype=np.intp)
+    if k >= len(values):
+        return np.argsort(values, kind="stable")
+    kth = np.partition(values, k - 1)[k - 1]
+    less = np.flatnonzero(values < kth)
+    equal = np.flatnonzero(values == kth)[: k - len(less)]
+    chosen = np.concatenate((less, equal))
+    return chosen[np.argsort(values[chosen], kind="stable")]
+
+
+class Query:
+    """
+    Запрос к загруженным категориям: фильтры, сортировка, top-k и группировка.
+
+    Методы where, of_type, order_by и limit возвращают новый запрос, исходный не меняется.
+    При выполнении условия по цене, остатку и классу товара проверяются векторно на
+    колонках NumPy (для категорий на ProductStore - без создания объектов), остальные
+    условия - в Python и только для строк, прошедших колоночные условия. Объекты
+    товаров создаются только для итоговой выборки.
+
+        Query(categories).of_type(Smartphone).where("quantity", ">", 0).top(20, "price")
+    """
+
+    def __init__(self, categories):
+        self._categories = list(categories)
+        self._types = None
+        self._conditions = []
+        self._order = None
+        self._limit = None
+
+    def _copy(self, **changes):
+        query = Query.__new__(Query)
+        query.__dict__.update(self.__dict__, **changes)
+        return query
+
+    def of_type(self, *classes):
+        """Оставляет товары указанных классов (и их подклассов)."""
+        return self._copy(_types=classes)
+
+    def where(self, field: str, op: str, value):
+        """
+        Добавляет условие field op value; op - одно из ==, !=, <, <=, >, >=, in.
+        Товары без поля field (например, country у смартфона) условию не удовлетворяют.
+        """
+        if op not in _OPERATORS:
+            raise ValueError(f"Неизвестная операция сравнения: {op}")
+        return self._copy(_conditions=self._conditions + [(field, op, value)])
+
+    def order_by(self, field: str, descending: bool = False):
+        """Сортирует выборку по полю; товары без этого поля идут в конце."""
+        return self._copy(_order=(field, descending))
+
+    def limit(self, count: int):
+        """Ограничивает выборку; вместе с order_by выбираются первые count без полной сортировки."""
+        if count < 0:
+            raise ValueError("Размер выборки не может быть отрицательным")
+        return self._copy(_limit=count)
+
+    def explain(self) -> list:
+        """Описывает план выполнения запроса по шагам."""
+        plan = []
+        columnar = [f"{f} {op} {v!r}" for f, op, v in self._conditions if f in _NUMERIC]
+        if self._types:
+            columnar.insert(0, "type in " + ", ".join(cls.__name__ for cls in self._types))
+        if columnar:
+            plan.append("колонки NumPy: " + "; ".join(columnar))
+        python = [f"{f} {op} {v!r}" for f, op, v in self._conditions if f not in _NUMERIC]
+        if python:
+            plan.append("Python по прошедшим строкам: " + "; ".join(python))
+        if self._order is not None:
+            field, descending = self._order
+            order = f"{field} {'по убыванию' if descending else 'по возрастанию'}"
+            if self._limit is None:
+                plan.append(f"сортировка: {order}")
+            elif field in _NUMERIC:
+                plan.append(f"top-{self._limit} выбором на NumPy: {order}")
+            else:
+                plan.append(f"top-{self._limit} через кучу: {order}")
+        elif self._limit is not None:
+            plan.append(f"первые {self._limit}")
+        return plan
+
+    def _scan(self):
+        """Собирает колонки всех категорий и возвращает (колонки, индексы строк, прошедших условия)."""
+        frame = _Frame(self._categories)
+        mask = np.ones(len(frame.codes), dtype=bool)
+        if self._types:
+            allowed = [code for code, cls in enumerate(frame.classes) if issubclass(cls, self._types)]
+            mask &= np.isin(frame.codes, allowed)
+        for field, op, value in self._conditions:
+            if field in _NUMERIC:
+                column = frame.numeric(field)
+                mask &= np.isin(column, list(value)) if op == "in" else _OPERATORS[op](column, value)
+        indices = np.flatnonzero(mask)
+
+        for field, op, value in self._conditions:
+            if field not in _NUMERIC and len(indices):
+                values = frame.values(field, indices)
+                if op == "in":
+                    value = set(value)
+                    keep = [v is not None and v in value for v in values]
+                else:
+                    compare = _OPERATORS[op]
+                    keep = [v is not None and compare(v, value) for v in values]
+                indices = indices[np.array(keep, dtype=bool)]
+        return frame, indices
+
+    def _ordered(self, frame, indices: np.ndarray) -> np.ndarray:
+        if self._order is None:
+            return indices if self._limit is None else indices[: self._limit]
+        field, descending = self._order
+        limit = len(indices) if self._limit is None else self._limit
+
+        if field in _NUMERIC:
+            column = frame.numeric(field)[indices]
+            return indices[_stable_smallest(-column if descending else column, limit)]
+
+        values = frame.values(field, indices)
+        present = [position for position, value in enumerate(values) if value is not None]
+        missing = [position for position, value in enumerate(values) if value is None]
+        key = values.__getitem__
+        if self._limit is None:
+            chosen = sorted(present, key=key, reverse=descending)
+        elif descending:
+            chosen = heapq.nlargest(limit, present, key=key)
+        else:
+            chosen = heapq.nsmallest(limit, present, key=key)
+        return indices[np.array((chosen + missing)[:limit], dtype=np.intp)]
+
+    def all(self) -> list:
+        """Выполняет запрос и возвращает список товаров."""
+        frame, indices = self._scan()
+        return frame.products(self._ordered(frame, indices))
+
+    def __iter__(self):
+        return iter(self.all())
+
+    def count(self) -> int:
+        return len(self._scan()[1])
+
+    def top(self, k: int, field: str = "price", largest: bool = True) -> list:
+        """k товаров с наибольшими (или наименьшими) значениями поля, без полной сортировки."""
+        return self.order_by(field, descending=largest).limit(k).all()
+
+    def group_by(self, field: str) -> dict:
+        """
+        Группирует отобранные товары по полю (а также по "category" или "type") и считает
+        для каждой группы count, total_quantity, total_value, middle_price (как
+        Category.middle_price), min_price и max_price. Группы идут в порядке первого появления.
+        """
+        frame, indices = self._scan()
+        keys = {}
+        codes = np.fromiter(
+            (keys.setdefault(value, len(keys)) for value in frame.values(field, indices)),
+            dtype=np.intp,
+            count=len(indices),
+        )
+        prices = frame.prices[indices]
+        quantities = frame.quantities[indices]
+        size = len(keys)
+        counts = np.bincount(codes, minlength=size)
+        total_quantities = np.bincount(codes, weights=quantities, minlength=size)
+        total_values = np.bincount(codes, weights=prices * quantities, minlength=size)
+        min_prices = np.full(size, np.inf)
+        max_prices = np.full(size, -np.inf)
+        np.minimum.at(min_prices, codes, prices)
+        np.maximum.at(max_prices, codes, prices)
+
+        return {
+            key: {
+                "count": int(counts[code]),
+                "total_quantity": int(total_quantities[code]),
+                "total_value": float(total_values[code]),
+                "middle_price": _middle_price(float(total_values[code]), int(total_quantities[code])),
+                "min_price": float(min_prices[code]),
+                "max_price": float(max_prices[code]),
+            }
+            for key, code in keys.items()
+        }
+
+
+class _Frame:
+    """Колонки NumPy по всем товарам списка категорий с общей нумерацией строк."""
+
+    def __init__(self, categories: list):
+        self.categories = categories
+        self.classes: list = []
+        columns = [_columns(category.products, self.classes) for category in categories]
+        self.starts = np.concatenate(([0], np.cumsum([len(c[0]) for c in columns]))).astype(np.intp)
+        self.prices = np.concatenate([c[0] for c in columns] or [np.empty(0)]).astype(np.float64, copy=False)
+        self.quantities = np.concatenate([c[1] for c in columns] or [np.empty(0, dtype=np.int64)])
+        self.codes = np.concatenate([c[2] for c in columns] or [np.empty(0, dtype=np.intp)])
+
+    def numeric(self, field: str) -> np.ndarray:
+        return self.prices if field == "price" else self.quantities
+
+    def locate(self, indices: np.ndarray):
+        """Разбивает возрастающие общие индексы по категориям: отдает (номер категории, локальные индексы)."""
+        sources = np.searchsorted(self.starts, indices, side="right") - 1
+        bounds = np.flatnonzero(np.diff(sources)) + 1
+        for chunk in np.split(np.arange(len(indices)), bounds):
+            if len(chunk):
+                source = int(sources[chunk[0]])
+                yield source, (indices[chunk] - self.starts[source]).tolist()
+
+    def values(self, field: str, indices: np.ndarray) -> list:
+        """Значения поля для строк indices (None, если у товара такого поля нет)."""
+        if field in _NUMERIC:
+            return self.numeric(field)[indices].tolist()
+        if field == "type":
+            return [self.classes[code].product_type for code in self.codes[indices].tolist()]
+        values = []
+        for source, local in self.locate(indices):
+            category = self.categories[source]
+            products = category.products
+            if field == "category":
+                values.extend([category.name] * len(local))
+            elif isinstance(products, ProductStore):
+                # Строковые поля хранилища читаются прямо из колонок, без создания объектов
+                column = products._columns.get(field)
+                values.extend([column[i] for i in local] if column is not None else [None] * len(local))
+            else:
+                values.extend(getattr(products[i], field, None) for i in local)
+        return values
+
+    def products(self, indices: np.ndarray) -> list:
+        """Объекты товаров для строк indices в заданном порядке."""
+        order = np.argsort(indices, kind="stable")
+        products = [None] * len(indices)
+        positions = iter(order.tolist())
+        for source, local in self.locate(indices[order]):
+            category_products = self.categories[source].products
+            for i in local:
+                products[next(positions)] = category_products[i]
+        return products
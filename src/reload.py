@@ -0,0 +1,122 @@
+from src import json_backend
+from src.load_products import _data_file_path
+from src.product_logging import bulk_load
+from src.product_store import ProductStore
+
+
+def _group_by_name(items, name_of):
+    groups = {}
+    for item in items:
+        groups.setdefault(name_of(item), []).append(item)
+    return groups
+
+
+def _is_unchanged(product, record) -> bool:
+    from src.main import Product  # Локальный импорт, чтобы избежать циклического импорта
+
+    target = Product._resolve_class(record)
+    if type(product) is not target or len(record) - ("type" in record) != len(target.fields):
+        return False
+    if not record.keys() >= target._field_set:
+        return False
+    return target._field_getter(record) == tuple(getattr(product, field) for field in target.fields)
+
+
+def reload_categories_from_json(categories: list, file_name: str = "products.json") -> dict:
+    """
+    Применяет к загруженному каталогу изменения из новой версии JSON-файла.
+
+    Категории сопоставляются по имени, товары внутри категории - по имени (одноименные - по порядку).
+    Изменившиеся поля переносятся в существующие товары через сеттеры, так что неизменные
+    и обновленные товары сохраняют идентичность, а подписчики получают обычные события.
+    Новые товары и категории добавляются, исчезнувшие - удаляются, счетчики Category
+    остаются равными числу категорий и товаров каталога. Список categories меняется на месте.
+
+    Все новые и изменившиеся записи проверяются до первого изменения каталога: при ошибке
+    (TypeError, ValueError) каталог остается прежним. Объекты создаются и меняются только
+    для изменившихся записей. Возвращает словарь с числом добавленных, обновленных и
+    удаленных товаров и категорий.
+    """
+    from src.main import Category, Product  # Локальный импорт, чтобы избежать циклического импорта
+
+    data = json_backend.load_file(_data_file_path(file_name))
+    current = {category.name: category for category in categories}
+    incoming = {cat["name"]: cat for cat in data}
+
+    # План изменений: (категория, товар или None, запись или None) для каждой изменившейся позиции
+    changes = []
+    changed_records = []
+    for name, cat in incoming.items():
+        category = current.get(name)
+        if category is None:
+            continue
+        old_groups = _group_by_name(category.products, lambda product: product.name)
+        new_groups = _group_by_name(cat["products"], lambda record: record["name"])
+        # Порядок файла, затем исчезнувшие имена: новые товары добавляются в порядке записей
+        for product_name in list(new_groups) + [n for n in old_groups if n not in new_groups]:
+            old_products = old_groups.get(product_name, [])
+            new_records = new_groups.get(product_name, [])
+            for position in range(max(len(old_products), len(new_records))):
+                product = old_products[position] if position < len(old_products) else None
+                record = new_records[position] if position < len(new_records) else None
+                if product is not None and record is not None and _is_unchanged(product, record):
+                    continue
+                if product is not None and isinstance(category.products, ProductStore) and (
+                    record is None or type(product) is not Product._resolve_class(record)
+                ):
+                    raise TypeError(f"Категория '{name}' на ProductStore не поддерживает удаление товаров")
+                changes.append((category, product, record))
+                if record is not None:
+                    changed_records.append(record)
+
+    removed_categories = [category for category in categories if category.name not in incoming]
+    for category in removed_categories:
+        if isinstance(category.products, ProductStore):
+            raise TypeError(f"Категория '{category.name}' на ProductStore не поддерживает удаление товаров")
+
+    new_categories = [cat for name, cat in incoming.items() if name not in current]
+    with bulk_load():
+        # Проверка и создание всех новых объектов до первого изменения каталога
+        fresh = iter(Product.new_products(changed_records))
+        created = [(cat, Product.new_products(cat["products"])) for cat in new_categories]
+
+    summary = {"added": 0, "updated": 0, "removed": 0, "categories_added": 0, "categories_removed": 0}
+    for category, product, record in changes:
+        new_product = next(fresh) if record is not None else None
+        if product is None:
+            category.add_product(new_product)
+            summary["added"] += 1
+        elif new_product is None:
+            category.remove_product(product)
+            summary["removed"] += 1
+        elif type(product) is type(new_product):
+            for field in product.fields:
+                value = getattr(new_product, field)
+                if getattr(product, field) != value:
+                    setattr(product, field, value)
+            summary["updated"] += 1
+        else:
+            # Сменился класс товара: заменяем объект целиком
+            category.remove_product(product)
+            category.add_product(new_product)
+            summary["updated"] += 1
+
+    for name, cat in incoming.items():
+        if name in current and current[name].description != cat["description"]:
+            current[name].description = cat["description"]
+
+    for cat, products in created:
+        categories.append(Category(cat["name"], cat["description"], products))
+        summary["categories_added"] += 1
+        summary["added"] += len(products)
+
+    for category in removed_categories:
+        for product in list(category.products):
+            category.remove_product(product)
+            summary["removed"] += 1
+        categories.remove(category)
+        with Category._counter_lock:
+            Category.category_count -= 1
+        summary["categories_removed"] += 1
+
+    return summary
@@ -0,0 +1,50 @@
+import threading
+import weakref
+from collections import OrderedDict
+
+
+class RenderCache:
+    """
+    Ограниченный LRU-кэш строковых представлений товаров.
+
+    Запись хранится по id товара вместе со слабой ссылкой на него и версией товара:
+    любое изменение публичного поля (цены, остатка, цвета и т. д.) увеличивает версию,
+    и следующее обращение перерисовывает строку. Сами товары кэш в памяти не удерживает.
+    """
+
+    def __init__(self, maxsize: int = 100_000):
+        self.maxsize = maxsize
+        self.hits = 0
+        self.misses = 0
+        self._entries = OrderedDict()
+        self._lock = threading.Lock()
+
+    def __len__(self):
+        return len(self._entries)
+
+    def render(self, product) -> str:
+        key = id(product)
+        version = product._version
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None and entry[0]() is product and entry[1] == version:
+                self._entries.move_to_end(key)
+                self.hits += 1
+                return entry[2]
+            self.misses += 1
+
+        text = product._render()
+        with self._lock:
+            self._entries[key] = (weakref.ref(product), version, text)
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.maxsize:
+                self._entries.popitem(last=False)
+        return text
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+            self.hits = self.misses = 0
+
+
+default_render_cache = RenderCache()
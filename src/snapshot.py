@@ -0,0 +1,307 @@
+import hashlib
+import json
+import mmap
+import os
+import struct
+from array import array
+
+from src.load_products import _data_file_path, load_categories_from_json
+from src.product_store import ProductStore
+
+MAGIC = b"CATSNAP1"
+VERSION = 2
+
+# magic, версия, резерв, mtime исходного JSON в наносекундах, sha256 исходного JSON
+_HEADER = struct.Struct("<8sIIq32s")
+_MTIME_OFFSET = 16
+_LENGTH = struct.Struct("<Q")
+_NO_VALUE = 0xFFFFFFFF
+
+
+def _file_sha256(file_path: str) -> bytes:
+    digest = hashlib.sha256()
+    with open(file_path, "rb") as file:
+        for chunk in iter(lambda: file.read(1024 * 1024), b""):
+            digest.update(chunk)
+    return digest.digest()
+
+
+def _product_classes() -> dict:
+    from src.main import Product  # Локальный импорт, чтобы избежать циклического импорта
+
+    classes = {}
+    pending = [Product]
+    while pending:
+        cls = pending.pop()
+        classes[cls.__name__] = cls
+        pending.extend(cls.__subclasses__())
+    return classes
+
+
+def _records(products):
+    """Отдает (класс, словарь полей) для каждого товара, не создавая объекты для ProductStore."""
+    if isinstance(products, ProductStore):
+        classes, kinds, _, _ = products.columns()
+        for index in range(len(products)):
+            yield classes[kinds[index]], products.record(index)
+    else:
+        for product in products:
+            yield type(product), product.to_dict()
+
+
+class _StringTable:
+    """Таблица строк снимка: значения хранятся один раз в виде JSON и декодируются при первом обращении."""
+
+    def __init__(self, offsets: memoryview, blob: memoryview):
+        self._offsets = offsets
+        self._blob = blob
+        self._cache = {}
+
+    def __getitem__(self, index: int):
+        value = self._cache.get(index, self)
+        if value is self:
+            value = json.loads(bytes(self._blob[self._offsets[index]:self._offsets[index + 1]]))
+            self._cache[index] = value
+        return value
+
+
+class _LazyColumn:
+    """Колонка-индекс в таблицу строк, которая ведет себя для ProductStore как список."""
+
+    def __init__(self, indexes: memoryview, strings: _StringTable):
+        self._indexes = indexes
+        self._strings = strings
+        self._overrides = {}
+        self._appended = []
+
+    def __len__(self):
+        return len(self._indexes) + len(self._appended)
+
+    def __getitem__(self, index: int):
+        if index in self._overrides:
+            return self._overrides[index]
+        if index >= len(self._indexes):
+            return self._appended[index - len(self._indexes)]
+        value_index = self._indexes[index]
+        return None if value_index == _NO_VALUE else self._strings[value_index]
+
+    def __setitem__(self, index: int, value):
+        if index >= len(self._indexes):
+            self._appended[index - len(self._indexes)] = value
+        else:
+            self._overrides[index] = value
+
+    def append(self, value):
+        self._appended.append(value)
+
+
+class SnapshotStore(ProductStore):
+    """
+    ProductStore поверх отображенного в память снимка: колонки читаются прямо из файла,
+    товары создаются только при обращении. При первом добавлении товара числовые колонки
+    копируются в обычные массивы. Изменения товаров в файл снимка не записываются.
+    """
+
+    def __init__(self, classes, kinds, prices, int_prices, quantities, columns, totals):
+        super().__init__()
+        self._classes = list(classes)
+        self._kinds = kinds
+        self._prices = prices
+        self._int_prices = int_prices
+        self._quantities = quantities
+        self._columns = columns
+        self._snapshot_totals = totals
+
+    def totals(self):
+        if self._snapshot_totals is not None:
+            return self._snapshot_totals
+        return super().totals()
+
+    def append(self, product):
+        if isinstance(self._kinds, memoryview):
+            self._kinds = array("B", self._kinds)
+            self._prices = array("d", self._prices)
+            self._int_prices = array("B", self._int_prices)
+            self._quantities = array("q", self._quantities)
+        self._snapshot_totals = None
+        super().append(product)
+
+    def _write_back(self, index, product, field, old, new):
+        if field in ("price", "quantity"):
+            self._snapshot_totals = None
+        super()._write_back(index, product, field, old, new)
+
+
+def save_snapshot(categories, snapshot_path: str, source_path: str):
+    """
+    Записывает категории в бинарный снимок: заголовок со сведениями об исходном JSON,
+    затем секции с префиксом длины - метаданные, таблица строк и колонки товаров.
+    """
+    strings = {}
+    blob = bytearray()
+    offsets = array("Q", [0])
+
+    def string_index(value) -> int:
+        key = json.dumps(value, ensure_ascii=False)
+        index = strings.get(key)
+        if index is None:
+            index = strings[key] = len(offsets) - 1
+            blob.extend(key.encode("utf-8"))
+            offsets.append(len(blob))
+        return index
+
+    class_names = []
+    field_names = []
+    kinds = array("B")
+    prices = array("d")
+    int_prices = array("B")
+    quantities = array("q")
+    field_columns = {}
+    category_meta = []
+
+    for category in categories:
+        start = len(kinds)
+        for cls, product_info in _records(category.products):
+            if cls.__name__ not in class_names:
+                class_names.append(cls.__name__)
+            kinds.append(class_names.index(cls.__name__))
+            prices.append(product_info["price"])
+            int_prices.append(type(product_info["price"]) is int)
+            quantities.append(product_info["quantity"])
+            for field in cls.fields:
+                if field in ("price", "quantity"):
+                    continue
+                if field not in field_columns:
+                    field_names.append(field)
+                    field_columns[field] = array("I", [_NO_VALUE] * (len(kinds) - 1))
+                field_columns[field].append(string_index(product_info[field]))
+            for column in field_columns.values():
+                if len(column) < len(kinds):
+                    column.append(_NO_VALUE)
+        total_value, total_quantity = category._totals()
+        category_meta.append(
+            [category.name, category.description, start, len(kinds) - start, total_value, total_quantity]
+        )
+
+    meta = {"classes": class_names, "fields": field_names, "categories": category_meta, "strings": len(strings)}
+    meta_bytes = json.dumps(meta, ensure_ascii=False).encode("utf-8")
+    sections = [meta_bytes, offsets, blob, kinds, prices, quantities, int_prices]
+    sections.extend(field_columns[field] for field in field_names)
+
+    header = _HEADER.pack(MAGIC, VERSION, 0, os.stat(source_path).st_mtime_ns, _file_sha256(source_path))
+    tmp_path = snapshot_path + ".tmp"
+    try:
+        with open(tmp_path, "wb") as file:
+            file.write(header)
+            for section in sections:
+                payload = bytes(section)
+                file.write(_LENGTH.pack(len(payload)))
+                file.write(payload)
+                file.write(b"\0" * (-len(payload) % 8))  # Выравнивание колонок по 8 байт
+        os.replace(tmp_path, snapshot_path)
+    except OSError:
+        if os.path.exists(tmp_path):
+            os.remove(tmp_path)
+        raise
+
+
+def _read_header(snapshot_path: str):
+    with open(snapshot_path, "rb") as file:
+        magic, version, _, mtime_ns, sha256 = _HEADER.unpack(file.read(_HEADER.size))
+    if magic != MAGIC or version != VERSION:
+        raise ValueError("Файл не является снимком каталога этой версии")
+    return mtime_ns, sha256
+
+
+def is_snapshot_fresh(snapshot_path: str, source_path: str) -> bool:
+    """
+    Проверяет, что снимок сделан с текущей версии исходного JSON. Сначала сравнивается mtime;
+    если он изменился, сравнивается sha256, и при совпадении mtime в снимке обновляется.
+    """
+    try:
+        mtime_ns, sha256 = _read_header(snapshot_path)
+    except (OSError, ValueError, struct.error):
+        return False
+    source_mtime_ns = os.stat(source_path).st_mtime_ns
+    if mtime_ns == source_mtime_ns:
+        return True
+    if _file_sha256(source_path) != sha256:
+        return False
+    try:
+        with open(snapshot_path, "r+b") as file:
+            file.seek(_MTIME_OFFSET)
+            file.write(struct.pack("<q", source_mtime_ns))
+    except OSError:
+        pass  # Снимок свежий; без записи mtime sha256 просто посчитается и в следующий раз
+    return True
+
+
+def load_snapshot(snapshot_path: str):
+    """
+    Открывает снимок через mmap и возвращает список Category, товары которых
+    лежат в SnapshotStore и создаются только при обращении.
+    """
+    from src.main import Category  # Локальный импорт, чтобы избежать циклического импорта
+
+    with open(snapshot_path, "rb") as file:
+        # ACCESS_COPY: изменения товаров попадают в копию страниц в памяти, а не в файл
+        data = memoryview(mmap.mmap(file.fileno(), 0, access=mmap.ACCESS_COPY))
+
+    if bytes(data[:len(MAGIC)]) != MAGIC:
+        raise ValueError("Файл не является снимком каталога этой версии")
+    position = _HEADER.size
+    sections = []
+    while position < len(data):
+        (length,) = _LENGTH.unpack_from(data, position)
+        position += _LENGTH.size
+        sections.append(data[position:position + length])
+        position += length + (-length % 8)
+
+    meta = json.loads(bytes(sections[0]))
+    strings = _StringTable(sections[1].cast("Q"), sections[2])
+    kinds = sections[3]
+    prices = sections[4].cast("d")
+    quantities = sections[5].cast("q")
+    int_prices = sections[6]
+    field_indexes = {field: sections[7 + i].cast("I") for i, field in enumerate(meta["fields"])}
+    known_classes = _product_classes()
+    classes = [known_classes[name] for name in meta["classes"]]
+
+    categories = []
+    for name, description, start, count, total_value, total_quantity in meta["categories"]:
+        end = start + count
+        columns = {field: _LazyColumn(indexes[start:end], strings) for field, indexes in field_indexes.items()}
+        store = SnapshotStore(
+            classes,
+            kinds[start:end],
+            prices[start:end],
+            int_prices[start:end],
+            quantities[start:end],
+            columns,
+            (total_value, total_quantity),
+        )
+        categories.append(Category(name, description, store))
+    return categories
+
+
+def load_catalog(file_name: str = "products.json", snapshot_name: str = None):
+    """
+    Загружает каталог из снимка, если он свежий, иначе из JSON с последующей записью снимка.
+    Снимок по умолчанию лежит рядом с JSON: data/<file_name>.snapshot. Если JSON не загрузился,
+    снимок не пишется; ошибка записи снимка (каталог только для чтения, нет места) не мешает загрузке.
+    """
+    source_path = _data_file_path(file_name)
+    snapshot_path = _data_file_path(snapshot_name or file_name + ".snapshot")
+    if not os.path.isfile(source_path):
+        return load_categories_from_json(file_name)
+    if os.path.isfile(snapshot_path) and is_snapshot_fresh(snapshot_path, source_path):
+        return load_snapshot(snapshot_path)
+
+    categories = load_categories_from_json(file_name)
+    if not categories:
+        return categories  # При ошибке разбора JSON возвращается пустой список - такой снимок не нужен
+    try:
+        save_snapshot(categories, snapshot_path, source_path)
+    except OSError as e:
+        print(f"Ошибка записи снимка каталога: {e}")
+    return categories
@@ -0,0 +1,277 @@
+import queue
+import sqlite3
+import threading
+import weakref
+from contextlib import contextmanager
+from functools import partial
+
+from src import json_backend
+from src.aggregates import _middle_price
+from src.load_products import _data_file_path
+from src.product_logging import bulk_load
+
+
+def _product_fields() -> list:
+    """Поля всех зарегистрированных классов товаров: общие поля Product, затем поля подклассов."""
+    from src.main import Product  # Локальный импорт, чтобы избежать циклического импорта
+
+    fields = list(Product.fields)
+    for cls in Product.registry.values():
+        fields.extend(field for field in cls.fields if field not in fields)
+    return fields
+
+
+class ConnectionPool:
+    """
+    Пул соединений SQLite для многопоточной работы: каждый поток берет свое соединение
+    на время операции. Соединения открываются по мере надобности, не больше size;
+    база работает в режиме WAL, поэтому читатели не блокируются пишущим потоком.
+    """
+
+    def __init__(self, path: str, size: int = 4):
+        self.path = path
+        self.size = size
+        self._idle = queue.LifoQueue()
+        self._connections = []
+        self._lock = threading.Lock()
+
+    def _connect(self):
+        connection = sqlite3.connect(self.path, check_same_thread=False, cached_statements=256, timeout=30)
+        connection.execute("PRAGMA journal_mode=WAL")
+        connection.execute("PRAGMA synchronous=NORMAL")
+        connection.execute("PRAGMA foreign_keys=ON")
+        return connection
+
+    @contextmanager
+    def connection(self):
+        """Выдает соединение; при выходе транзакция фиксируется (или откатывается при ошибке)."""
+        try:
+            connection = self._idle.get_nowait()
+        except queue.Empty:
+            with self._lock:
+                connection = None
+                if len(self._connections) < self.size:
+                    connection = self._connect()
+                    self._connections.append(connection)
+            if connection is None:
+                connection = self._idle.get()
+        try:
+            with connection:
+                yield connection
+        finally:
+            self._idle.put(connection)
+
+    def close(self):
+        with self._lock:
+            for connection in self._connections:
+                connection.close()
+            self._connections.clear()
+            self._idle = queue.LifoQueue()
+
+
+class SqliteCatalog:
+    """
+    Каталог в файле SQLite: категории и товары переживают перезапуск процесса.
+
+    Поля подклассов хранятся в колонках, допускающих NULL. Импорт идет пачками через
+    executemany в одной транзакции, поиск и агрегаты (в том числе средняя цена, как у
+    Category.middle_price) считаются запросами SQL с параметрами по индексам.
+    load_categories возвращает обычные объекты Category, изменения которых
+    (поля товаров, add_product, remove_product) сразу записываются в базу.
+
+    Относительный path считается от каталога data.
+    """
+
+    def __init__(self, path: str = "catalog.db", pool_size: int = 4):
+        self.path = _data_file_path(path)
+        self.pool = ConnectionPool(self.path, pool_size)
+        self._fields = _product_fields()
+        self._ids = weakref.WeakKeyDictionary()
+        self._positions = {}
+        self._create_schema()
+
+        columns = ", ".join(f'"{field}"' for field in self._fields)
+        placeholders = ", ".join("?" for _ in self._fields)
+        self._insert_sql = (
+            f"INSERT INTO products (category_id, position, type, {columns}) VALUES (?, ?, ?, {placeholders})"
+        )
+        self._select_sql = f"SELECT id, type, {columns} FROM products"
+
+    def _create_schema(self):
+        with self.pool.connection() as connection:
+            connection.execute(
+                "CREATE TABLE IF NOT EXISTS categories ("
+                "id INTEGER PRIMARY KEY, name TEXT NOT NULL UNIQUE, description TEXT NOT NULL)"
+            )
+            # У price нет типа колонки: SQLite хранит INTEGER и REAL как переданы, и целая цена остается int
+            connection.execute(
+                "CREATE TABLE IF NOT EXISTS products ("
+                "id INTEGER PRIMARY KEY, "
+                "category_id INTEGER NOT NULL REFERENCES categories (id) ON DELETE CASCADE, "
+                "position INTEGER NOT NULL, type TEXT NOT NULL, "
+                "name TEXT NOT NULL, description TEXT NOT NULL, price NOT NULL, quantity INTEGER NOT NULL)"
+            )
+            # Колонки для полей подклассов, зарегистрированных после создания базы, добавляются на лету
+            existing = {row[1] for row in connection.execute("PRAGMA table_info(products)")}
+            for field in self._fields:
+                if field not in existing:
+                    connection.execute(f'ALTER TABLE products ADD COLUMN "{field}"')
+            connection.execute("CREATE INDEX IF NOT EXISTS products_category ON products (category_id, position)")
+            connection.execute("CREATE INDEX IF NOT EXISTS products_name ON products (name)")
+            connection.execute("CREATE INDEX IF NOT EXISTS products_price ON products (price)")
+
+    def close(self):
+        self.pool.close()
+
+    def _row(self, category_id: int, position: int, product) -> tuple:
+        return (category_id, position, product.product_type, *(getattr(product, f, None) for f in self._fields))
+
+    def _write(self, categories) -> int:
+        """Заменяет содержимое категорий (name, description, products) в одной транзакции."""
+        count = 0
+        with self.pool.connection() as connection:
+            for name, description, products in categories:
+                connection.execute(
+                    "INSERT INTO categories (name, description) VALUES (?, ?) "
+                    "ON CONFLICT (name) DO UPDATE SET description = excluded.description",
+                    (name, description),
+                )
+                (category_id,) = connection.execute("SELECT id FROM categories WHERE name = ?", (name,)).fetchone()
+                connection.execute("DELETE FROM products WHERE category_id = ?", (category_id,))
+                connection.executemany(
+                    self._insert_sql,
+                    (self._row(category_id, position, product) for position, product in enumerate(products)),
+                )
+                count += len(products)
+        return count
+
+    def import_json(self, file_name: str = "products.json") -> int:
+        """
+        Импортирует JSON-файл каталога. Все товары проверяются теми же правилами, что и в
+        Product.new_products, до записи в базу; категории с тем же именем заменяются.
+        Возвращает число импортированных товаров.
+        """
+        from src.main import Product  # Локальный импорт, чтобы избежать циклического импорта
+
+        data = json_backend.load_file(_data_file_path(file_name))
+        with bulk_load():
+            categories = [(cat["name"], cat["description"], Product.new_products(cat["products"])) for cat in data]
+        return self._write(categories)
+
+    def save_categories(self, categories) -> int:
+        """Сохраняет категории из памяти; категории с тем же именем заменяются."""
+        return self._write((category.name, category.description, category.products) for category in categories)
+
+    def counts(self) -> tuple:
+        """Возвращает (число категорий, число товаров) в базе - постоянный аналог счетчиков Category."""
+        with self.pool.connection() as connection:
+            return connection.execute(
+                "SELECT (SELECT COUNT(*) FROM categories), (SELECT COUNT(*) FROM products)"
+            ).fetchone()
+
+    def category_names(self) -> list:
+        with self.pool.connection() as connection:
+            return [name for (name,) in connection.execute("SELECT name FROM categories ORDER BY id")]
+
+    def middle_price(self, category_name: str):
+        """Средняя цена категории с учетом остатков, как Category.middle_price; суммы считает SQLite."""
+        with self.pool.connection() as connection:
+            total_value, total_quantity = connection.execute(
+                "SELECT SUM(p.price * p.quantity), SUM(p.quantity) FROM products p "
+                "JOIN categories c ON c.id = p.category_id WHERE c.name = ?",
+                (category_name,),
+            ).fetchone()
+        return _middle_price(total_value or 0, total_quantity or 0)
+
+    def category_stats(self) -> dict:
+        """Возвращает {имя категории: count, total_quantity, total_value, middle_price, min_price, max_price}."""
+        with self.pool.connection() as connection:
+            rows = connection.execute(
+                "SELECT c.name, COUNT(p.id), COALESCE(SUM(p.quantity), 0), COALESCE(SUM(p.price * p.quantity), 0), "
+                "COALESCE(MIN(p.price), 0), COALESCE(MAX(p.price), 0) "
+                "FROM categories c LEFT JOIN products p ON p.category_id = c.id GROUP BY c.id ORDER BY c.id"
+            ).fetchall()
+        return {
+            name: {
+                "count": count,
+                "total_quantity": total_quantity,
+                "total_value": float(total_value),
+                "middle_price": _middle_price(total_value, total_quantity),
+                "min_price": float(min_price),
+                "max_price": float(max_price),
+            }
+            for name, count, total_quantity, total_value, min_price, max_price in rows
+        }
+
+    def _products(self, rows) -> list:
+        """Создает товары из строк базы: данные уже проверены при записи, поэтому без повторной валидации."""
+        from src.main import Product  # Локальный импорт, чтобы избежать циклического импорта
+
+        products = []
+        for row in rows:
+            cls = Product.registry[row[1]]
+            positions = self._positions.get(cls)
+            if positions is None:
+                positions = self._positions[cls] = [self._fields.index(field) + 2 for field in cls.fields]
+            product = cls._restore_values([row[i] for i in positions])
+            self._ids[product] = row[0]
+            products.append(product)
+        return products
+
+    def find_products(self, name: str) -> list:
+        """Товары с указанным именем (поиск по индексу)."""
+        with self.pool.connection() as connection:
+            rows = connection.execute(f"{self._select_sql} WHERE name = ? ORDER BY id", (name,)).fetchall()
+        return self._products(rows)
+
+    def price_range(self, low: float = None, high: float = None) -> list:
+        """Товары с ценой в диапазоне [low, high] в порядке возрастания цены (поиск по индексу)."""
+        low = float("-inf") if low is None else low
+        high = float("inf") if high is None else high
+        with self.pool.connection() as connection:
+            rows = connection.execute(
+                f"{self._select_sql} WHERE price BETWEEN ? AND ? ORDER BY price, id", (low, high)
+            ).fetchall()
+        return self._products(rows)
+
+    def load_categories(self, names=None, write_through: bool = True) -> list:
+        """
+        Загружает категории (все или с именами из names) как обычные объекты Category.
+        С write_through изменения полей товаров и состава категорий сразу пишутся в базу.
+        """
+        from src.main import Category  # Локальный импорт, чтобы избежать циклического импорта
+
+        with self.pool.connection() as connection:
+            rows = connection.execute("SELECT id, name, description FROM categories ORDER BY id").fetchall()
+            if names is not None:
+                names = set(names)
+                rows = [row for row in rows if row[1] in names]
+            loaded = [
+                (row, connection.execute(
+                    f"{self._select_sql} WHERE category_id = ? ORDER BY position", (row[0],)
+                ).fetchall())
+                for row in rows
+            ]
+
+        categories = []
+        for (category_id, name, description), product_rows in loaded:
+            category = Category(name, description, self._products(product_rows))
+            if write_through:
+                category.add_listener(partial(self._on_change, category_id))
+            categories.append(category)
+        return categories
+
+    def _on_change(self, category_id: int, product, field, old, new):
+        with self.pool.connection() as connection:
+            if field == "products" and new is not None:
+                (position,) = connection.execute(
+                    "SELECT COALESCE(MAX(position) + 1, 0) FROM products WHERE category_id = ?", (category_id,)
+                ).fetchone()
+                cursor = connection.execute(self._insert_sql, self._row(category_id, position, new))
+                self._ids[new] = cursor.lastrowid
+            elif field == "products":
+                row_id = self._ids.pop(old, None)
+                if row_id is not None:
+                    connection.execute("DELETE FROM products WHERE id = ?", (row_id,))
+            elif field in self._fields and product in self._ids:
+                connection.execute(f'UPDATE products SET "{field}" = ? WHERE id = ?', (new, self._ids[product]))
@@ -0,0 +1,222 @@
+import json
+import os
+import sqlite3
+import sys
+import tempfile
+import threading
+import weakref
+from collections import OrderedDict
+from functools import partial
+
+from src.product_store import ProductStore
+
+_PREFETCH = 1000
+
+
+def _sizeof(product) -> int:
+    """Оценка памяти, которую занимает товар вместе со значениями полей."""
+    return sys.getsizeof(product) + sum(sys.getsizeof(getattr(product, field)) for field in product.fields)
+
+
+def _close(connection, path, remove):
+    connection.close()
+    if remove:
+        for suffix in ("", "-journal"):
+            if os.path.exists(path + suffix):
+                os.remove(path + suffix)
+
+
+class _DiskColumn:
+    """Строковая колонка TieredStore: значение берется у товара в памяти или из записи на диске."""
+
+    def __init__(self, store, field: str):
+        self._store = store
+        self._field = field
+
+    def __getitem__(self, index: int):
+        return self._store.record(index).get(self._field)
+
+    def __setitem__(self, index: int, value):
+        pass  # Запись на диск делает TieredStore._write_back
+
+
+class TieredStore(ProductStore):
+    """
+    Хранилище товаров категории для каталогов, которые не помещаются в память.
+
+    Все товары записываются в SQLite-файл, в памяти остаются только массивы цен, остатков
+    и классов (для сумм, агрегатов и запросов) и ограниченный LRU-кэш объектов товаров.
+    Кэш ограничен бюджетом в байтах (оценка по sys.getsizeof товара и его полей):
+    давно не использованные товары вытесняются, а при следующем обращении по индексу или
+    при переборе заново создаются из записи на диске без повторной валидации (как в SqliteCatalog).
+    Изменения товаров сразу записываются в массивы и на диск. Пока на вытесненный товар
+    есть внешние ссылки, по его индексу возвращается тот же объект.
+
+    path - файл базы (его содержимое перезаписывается); по умолчанию временный файл, который удаляется в close().
+    """
+
+    def __init__(self, products=(), budget_bytes: int = 64 * 2**20, path: str = None):
+        self.budget_bytes = budget_bytes
+        self.memory_bytes = 0
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self._hot = OrderedDict()
+        # Порядок захвата как в Category.add_product: блокировка товара, затем блокировка хранилища;
+        # под блокировкой хранилища товары не блокируются, _db_lock - только вокруг SQLite
+        self._lock = threading.RLock()
+        self._db_lock = threading.Lock()
+
+        remove = path is None
+        if path is None:
+            handle, path = tempfile.mkstemp(suffix=".sqlite", prefix="products-")
+            os.close(handle)
+        self.path = path
+        self._db = sqlite3.connect(path, check_same_thread=False)
+        self._db.execute("DROP TABLE IF EXISTS products")
+        self._db.execute("CREATE TABLE products (id INTEGER PRIMARY KEY, data TEXT NOT NULL)")
+        self._finalizer = weakref.finalize(self, _close, self._db, path, remove)
+        super().__init__(products)
+
+    def close(self):
+        """Закрывает базу и удаляет временный файл."""
+        self._finalizer()
+
+    def append(self, product):
+        self.extend((product,))
+
+    def extend(self, products):
+        from src.main import _product_lock  # Локальный импорт, чтобы избежать циклического импорта
+
+        rows = []
+        # Ссылки на добавленные товары держатся до записи на диск, чтобы вытесненный из LRU товар
+        # находился через _views, пока его строки еще нет в базе
+        added = []
+        for product in products:
+            with _product_lock(product), self._lock:
+                cls = type(product)
+                if cls not in self._classes:
+                    self._classes.append(cls)
+                index = len(self)
+                self._kinds.append(self._classes.index(cls))
+                self._prices.append(product.price)
+                self._int_prices.append(type(product.price) is int)
+                self._quantities.append(product.quantity)
+                for field in cls.fields:
+                    if field not in ("price", "quantity") and field not in self._columns:
+                        self._columns[field] = _DiskColumn(self, field)
+                rows.append((index, json.dumps(self._stored(product), ensure_ascii=False)))
+                self._attach(index, product)
+                self._remember(index, product)
+            added.append(product)
+        with self._db_lock:
+            self._db.executemany("INSERT INTO products (id, data) VALUES (?, ?)", rows)
+            self._db.commit()
+
+    @staticmethod
+    def _stored(product) -> dict:
+        record = {field: getattr(product, field) for field in product.fields if field not in ("price", "quantity")}
+        record["type"] = product.product_type
+        return record
+
+    def _remember(self, index: int, product):
+        """Кладет товар в LRU и вытесняет давно не использованные, пока не уложимся в бюджет."""
+        entry = self._hot.get(index)
+        if entry is not None:
+            self._hot.move_to_end(index)
+            return
+        size = _sizeof(product)
+        self._hot[index] = (product, size)
+        self.memory_bytes += size
+        while self.memory_bytes > self.budget_bytes and self._hot:
+            _, (_, evicted_size) = self._hot.popitem(last=False)
+            self.memory_bytes -= evicted_size
+            self.evictions += 1
+
+    def _rows(self, start: int, stop: int) -> dict:
+        with self._db_lock:
+            rows = self._db.execute("SELECT id, data FROM products WHERE id >= ? AND id < ?", (start, stop)).fetchall()
+        return {index: json.loads(data) for index, data in rows}
+
+    def _rehydrate(self, index: int, stored: dict):
+        # Данные проверены при добавлении, а остаток мог стать нулевым: new_product такой товар не пропустит
+        product_info = dict(stored, price=self._price(index), quantity=self._quantities[index])
+        product = self._classes[self._kinds[index]]._restore(product_info)
+        # Товар еще не виден другим потокам, поэтому подписка (блокировка товара) идет без блокировки хранилища
+        product.add_listener(partial(self._write_back, index))
+        return product
+
+    def _get(self, index: int, rows: dict = None):
+        with self._lock:
+            entry = self._hot.get(index)
+            if entry is not None:
+                self._hot.move_to_end(index)
+                self.hits += 1
+                return entry[0]
+            product = self._views.get(index)
+            if product is not None:
+                self.hits += 1
+                self._remember(index, product)
+                return product
+            self.misses += 1
+
+        stored = rows[index] if rows is not None else self._rows(index, index + 1)[index]
+        product = self._rehydrate(index, stored)
+        with self._lock:
+            # Другой поток мог успеть восстановить тот же товар - тогда отдаем его объект
+            existing = self._views.get(index)
+            if existing is not None:
+                product = existing
+            else:
+                self._views[index] = product
+            self._remember(index, product)
+            return product
+
+    def __getitem__(self, index: int):
+        if index < 0:
+            index += len(self)
+        if not 0 <= index < len(self):
+            raise IndexError("Индекс товара вне диапазона")
+        return self._get(index)
+
+    def __iter__(self):
+        # Отсутствующие в памяти товары читаются с диска блоками, одним запросом на блок
+        for start in range(0, len(self), _PREFETCH):
+            stop = min(start + _PREFETCH, len(self))
+            with self._lock:
+                missing = any(i not in self._hot and i not in self._views for i in range(start, stop))
+                rows = self._rows(start, stop) if missing else None
+            for index in range(start, stop):
+                yield self._get(index, rows)
+
+    def record(self, index: int) -> dict:
+        with self._lock:
+            entry = self._hot.get(index)
+            product = entry[0] if entry is not None else self._views.get(index)
+            if product is not None:
+                return product.to_dict()
+            stored = self._rows(index, index + 1)[index]
+        del stored["type"]
+        stored.update(price=self._price(index), quantity=self._quantities[index])
+        return stored
+
+    def _write_back(self, index, product, field, old, new):
+        if field not in ("price", "quantity"):
+            # Вызывается под блокировкой товара, поэтому блокировку хранилища здесь брать нельзя
+            with self._db_lock:
+                self._db.execute(
+                    "UPDATE products SET data = ? WHERE id = ?",
+                    (json.dumps(self._stored(product), ensure_ascii=False), index),
+                )
+                self._db.commit()
+        super()._write_back(index, product, field, old, new)
+
+    def stats(self) -> dict:
+        return {
+            "hits": self.hits,
+            "misses": self.misses,
+            "evictions": self.evictions,
+            "hot": len(self._hot),
+            "memory_bytes": self.memory_bytes,
+            "budget_bytes": self.budget_bytes,
+        }
@@ -0,0 +1,55 @@
+import unittest
+
+from src.aggregates import categories_stats, category_stats
+from src.main import Category, LawnGrass, Product, Smartphone
+from src.product_store import ProductStore
+
+
+class TestAggregates(unittest.TestCase):
+    def setUp(self):
+        self.products = [
+            Product("Товар 1", "Описание", 100, 2),
+            Smartphone("iPhone 15", "512GB", 200.0, 3, "A16", "Pro", 512, "Gray"),
+            Smartphone("iPhone 14", "256GB", 300.0, 1, "A15", "Pro", 256, "Gray"),
+        ]
+        self.category = Category("Категория", "Описание", self.products)
+
+    def test_category_stats(self):
+        """Проверка сводных показателей одной категории."""
+        stats = self.category.stats(percentiles=(0, 50, 100))
+        self.assertEqual(stats["count"], 3)
+        self.assertEqual(stats["total_quantity"], 6)
+        self.assertEqual(stats["total_value"], 100 * 2 + 200 * 3 + 300 * 1)
+        self.assertEqual(stats["middle_price"], self.category.middle_price())
+        self.assertEqual((stats["min_price"], stats["max_price"]), (100.0, 300.0))
+        self.assertEqual(stats["percentiles"], {0: 100.0, 50: 200.0, 100: 300.0})
+        self.assertEqual(
+            stats["by_type"]["Product"], {"count": 1, "total_quantity": 2, "total_value": 200.0, "middle_price": 100.0}
+        )
+        self.assertEqual(stats["by_type"]["Smartphone"]["total_quantity"], 4)
+        self.assertEqual(stats["by_type"]["Smartphone"]["middle_price"], 225.0)
+
+    def test_empty_category(self):
+        """Проверка, что для пустой категории показатели нулевые."""
+        stats = category_stats(Category("Пустая", "Описание", []))
+        self.assertEqual(stats["count"], 0)
+        self.assertEqual(stats["middle_price"], 0)
+        self.assertEqual(stats["by_type"], {})
+
+    def test_batch_matches_single(self):
+        """Проверка, что пакетный расчет совпадает с расчетом по одной категории."""
+        grass = LawnGrass("GreenField", "Газонная трава", 1500.0, 20, "Нидерланды", "2 недели", "Зелёный")
+        categories = [
+            self.category,
+            Category("Пустая", "Описание", []),
+            Category("Хранилище", "Описание", ProductStore([grass, self.products[0]])),
+        ]
+        batch = categories_stats(categories)
+        self.assertEqual(batch, [category_stats(category) for category in categories])
+        self.assertEqual(batch[2]["min_price"], 100.0)
+        self.assertEqual(batch[2]["middle_price"], categories[2].middle_price())
+        self.assertEqual(set(batch[2]["by_type"]), {"LawnGrass", "Product"})
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,93 @@
+import asyncio
+import json
+import os
+import tempfile
+import unittest
+from unittest.mock import patch
+
+from src import json_backend
+from src.async_load import aiter_products, aload_categories_from_json, aload_many
+from src.main import Category, Product, Smartphone
+
+
+class TestAsyncLoad(unittest.IsolatedAsyncioTestCase):
+    def setUp(self):
+        self.tmp = tempfile.TemporaryDirectory()
+        self.source = os.path.join(self.tmp.name, "catalog.json")
+        with open(self.source, "w", encoding="utf-8") as file:
+            json.dump(
+                [
+                    {
+                        "name": "Смартфоны",
+                        "description": "Категория телефонов",
+                        "products": [
+                            {
+                                "name": "iPhone 15",
+                                "description": "512GB",
+                                "price": 210000.0,
+                                "quantity": 8,
+                                "efficiency": "A16",
+                                "model": "Pro",
+                                "memory": 512,
+                                "color": "Gray",
+                            }
+                        ],
+                    }
+                ],
+                file,
+            )
+
+    def tearDown(self):
+        self.tmp.cleanup()
+
+    async def test_load(self):
+        """Проверка асинхронной загрузки каталога."""
+        categories = await aload_categories_from_json(self.source)
+        self.assertEqual(categories[0].name, "Смартфоны")
+        self.assertIsInstance(categories[0].products[0], Smartphone)
+
+    async def test_load_uses_sync_path(self):
+        """Проверка, что асинхронная загрузка идет через json_backend.load_file, как синхронная."""
+        with patch("src.json_backend.load_file", wraps=json_backend.load_file) as load_file:
+            categories = await aload_categories_from_json(self.source)
+        load_file.assert_called_once_with(self.source, typed=json_backend.typed_available())
+        self.assertIsInstance(categories[0].products[0], Smartphone)
+
+    async def test_missing_file_without_prompt(self):
+        """Проверка, что при отсутствии файла выбрасывается ошибка, а не запрашивается ввод."""
+        with patch("builtins.input") as mock_input:
+            with self.assertRaises(FileNotFoundError):
+                await aload_categories_from_json(os.path.join(self.tmp.name, "nonexistent.json"))
+            mock_input.assert_not_called()
+
+    async def test_load_many(self):
+        """Проверка параллельной загрузки нескольких источников с ошибками по файлам."""
+        missing = os.path.join(self.tmp.name, "nonexistent.json")
+        categories, errors = await aload_many([self.source, missing, "products.json"], limit=2)
+        self.assertEqual(categories[0].name, "Смартфоны")
+        self.assertEqual(len(categories), 4)
+        self.assertEqual(list(errors), [missing])
+        self.assertIn("FileNotFoundError", errors[missing])
+
+    async def test_async_iteration(self):
+        """Проверка асинхронного перебора товаров категории с уступками циклу событий."""
+        products = [Product(f"Товар {i}", "Описание", 100.0, 1) for i in range(5)]
+        category = Category("Категория", "Описание", products)
+        ticks = []
+
+        async def ticker():
+            while True:
+                ticks.append(1)
+                await asyncio.sleep(0)
+
+        task = asyncio.create_task(ticker())
+        await asyncio.sleep(0)
+        seen = [product async for product in aiter_products(category, batch_size=2)]
+        task.cancel()
+        self.assertEqual(seen, products)
+        self.assertGreater(len(ticks), 1)
+        self.assertEqual([product async for product in category], products)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,50 @@
+import unittest
+
+from benchmarks.bench_catalog import _measure, compare_results, generate_catalog, run
+
+
+class TestBenchmarks(unittest.TestCase):
+    def test_generate_catalog(self):
+        """Проверка синтетического каталога: число товаров и смесь типов."""
+        data = generate_catalog(1000, categories=4)
+        records = [record for category in data for record in category["products"]]
+        self.assertEqual(len(data), 4)
+        self.assertEqual(len(records), 1000)
+        self.assertTrue(any("efficiency" in record for record in records))
+        self.assertTrue(any("country" in record for record in records))
+
+    def test_run_small(self):
+        """Проверка, что прогон на маленьком каталоге возвращает все замеры."""
+        results = run(200, categories=2, repeat=1)
+        self.assertEqual(
+            set(results["results"]),
+            {
+                "load_categories_from_json",
+                "new_product",
+                "new_products",
+                "middle_price",
+                "formatted_products",
+                "order_creation",
+            },
+        )
+        self.assertIn("peak_bytes", results["results"]["load_categories_from_json"])
+
+    def test_measure_setup(self):
+        """Проверка, что setup вызывается перед каждым запуском, включая замер памяти."""
+        calls = []
+        result = _measure(lambda: calls.append("run"), memory=True, repeat=2, setup=lambda: calls.append("setup"))
+        self.assertEqual(calls, ["setup", "run"] * 3)
+        self.assertIn("peak_bytes", result)
+
+    def test_compare_results(self):
+        """Проверка обнаружения регрессий по порогу."""
+        baseline = {"results": {"a": {"seconds": 1.0, "peak_bytes": 100}, "b": {"seconds": 1.0}}}
+        current = {"results": {"a": {"seconds": 1.1, "peak_bytes": 200}, "b": {"seconds": 1.5}, "c": {"seconds": 9}}}
+        regressions = compare_results(current, baseline, threshold=0.2)
+        self.assertEqual(len(regressions), 2)
+        self.assertTrue(regressions[0].startswith("a.peak_bytes"))
+        self.assertTrue(regressions[1].startswith("b.seconds"))
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,56 @@
+import unittest
+
+from src.catalog_index import CatalogIndex
+from src.main import Category, LawnGrass, Product, Smartphone
+
+
+class TestCatalogIndex(unittest.TestCase):
+    def setUp(self):
+        self.phone1 = Smartphone("iPhone 15", "512GB", 210000.0, 8, "A16", "Pro", 512, "Gray")
+        self.phone2 = Smartphone("Xiaomi", "256GB", 31000.0, 14, "SD", "Note", 256, "Gray")
+        self.grass = LawnGrass("GreenField", "Газонная трава", 1500.0, 20, "Нидерланды", "2 недели", "Зелёный")
+        self.tv = Product("TV", "55", 123000.0, 7)
+        self.phones = Category("Смартфоны", "Описание", [self.phone1, self.phone2])
+        self.other = Category("Разное", "Описание", [self.grass, self.tv])
+        self.index = CatalogIndex([self.phones, self.other])
+
+    def test_lookup_by_name(self):
+        """Проверка поиска товара по имени."""
+        self.assertEqual(self.index.get("Xiaomi"), [self.phone2])
+        self.assertEqual(self.index.get("Нет такого"), [])
+
+    def test_ranges(self):
+        """Проверка поиска по диапазонам цены и остатка."""
+        self.assertEqual(self.index.price_range(1500.0, 123000.0), [self.grass, self.phone2, self.tv])
+        self.assertEqual(self.index.price_range(low=200000), [self.phone1])
+        self.assertEqual(self.index.quantity_range(high=8), [self.tv, self.phone1])
+
+    def test_find_attributes(self):
+        """Проверка вторичных индексов по полям подклассов."""
+        self.assertEqual(self.index.find(color="Gray", memory=512), [self.phone1])
+        self.assertEqual(self.index.find(country="Нидерланды"), [self.grass])
+        with self.assertRaises(ValueError):
+            self.index.find(model="Pro")
+
+    def test_index_follows_changes(self):
+        """Проверка, что индексы обновляются при add_product и изменении полей товаров."""
+        phone3 = Smartphone("Pixel", "128GB", 90000.0, 3, "Tensor", "8", 128, "Black")
+        self.phones.add_product(phone3)
+        self.assertEqual(self.index.get("Pixel"), [phone3])
+
+        self.phone1.price = 1000.0
+        self.phone2.color = "Black"
+        self.assertEqual(self.index.price_range(high=1500.0), [self.phone1, self.grass])
+        self.assertCountEqual(self.index.find(color="Black"), [self.phone2, phone3])
+        self.assertEqual(self.index.find(color="Gray"), [self.phone1])
+
+    def test_product_in_several_categories(self):
+        """Проверка, что товар из нескольких категорий индексируется один раз."""
+        self.other.add_product(self.phone1)
+        self.phone1.quantity = 1
+        self.assertEqual(len(self.index), 4)
+        self.assertEqual(self.index.quantity_range(high=1), [self.phone1])
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,88 @@
+import random
+import sys
+import threading
+import unittest
+from unittest.mock import patch
+
+from src.main import BaseProduct, Category, Product, Smartphone
+from src.product_logging import bulk_load
+
+
+def run_stress(threads: int = 8, operations: int = 2000, seed: int = 0):
+    """
+    Нагрузочный прогон: потоки параллельно добавляют товары, меняют цены и остатки
+    в общих категориях. Возвращает категории и число добавленных товаров.
+    """
+    with bulk_load():
+        shared = [Product(f"Общий {i}", "Описание", 100.0, 1000) for i in range(20)]
+    categories = [Category(f"Категория {i}", "Описание", shared[i::4]) for i in range(4)]
+    added = []
+    barrier = threading.Barrier(threads)
+
+    def worker(number: int):
+        rng = random.Random(seed + number)
+        count = 0
+        barrier.wait()
+        for step in range(operations):
+            action = rng.random()
+            if action < 0.2:
+                with bulk_load():
+                    product = Product(f"Новый {number}-{step}", "Описание", rng.uniform(1, 500), rng.randint(1, 50))
+                rng.choice(categories).add_product(product)
+                count += 1
+            elif action < 0.6:
+                rng.choice(shared).price = rng.uniform(1, 500)
+            else:
+                rng.choice(shared).add_quantity(rng.randint(-5, 5))
+            if action > 0.95:
+                rng.choice(categories).middle_price()
+        added.append(count)
+
+    pool = [threading.Thread(target=worker, args=(number,)) for number in range(threads)]
+    switch_interval = sys.getswitchinterval()
+    sys.setswitchinterval(1e-6)  # Частые переключения потоков повышают конкуренцию
+    try:
+        for thread in pool:
+            thread.start()
+        for thread in pool:
+            thread.join()
+    finally:
+        sys.setswitchinterval(switch_interval)
+    return categories, sum(added)
+
+
+class TestConcurrentMutation(unittest.TestCase):
+    def setUp(self):
+        Category.category_count = 0
+        Category.product_count = 0
+        BaseProduct.thread_safe = True
+
+    def tearDown(self):
+        BaseProduct.thread_safe = False
+
+    def test_counts_and_totals_stay_exact(self):
+        """Проверка, что под конкурентной нагрузкой счетчики и суммы категорий не расходятся."""
+        categories, added = run_stress()
+
+        self.assertEqual(Category.category_count, 4)
+        self.assertEqual(Category.product_count, 20 + added)
+        self.assertEqual(sum(len(category.products) for category in categories), 20 + added)
+        for category in categories:
+            category.debug = True
+            category.middle_price()  # Сверка накопленных сумм с полным пересчетом
+            _, total_quantity = category._totals()
+            self.assertEqual(total_quantity, sum(product.quantity for product in category))
+
+
+class TestThreadSafeMode(unittest.TestCase):
+    def test_no_locks_outside_mode(self):
+        """Проверка, что без режима thread_safe создание и изменение товара не берут блокировок."""
+        with patch("src.main._product_lock", side_effect=AssertionError("блокировка вне режима")):
+            phone = Smartphone("iPhone 15", "512GB", 210000.0, 8, "A16", "Pro", 512, "Gray")
+            phone.quantity = 3
+            phone.price = 1000.0
+        self.assertEqual((phone.quantity, phone.price, phone.color, phone._version), (3, 1000.0, "Gray", 2))
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,111 @@
+import os
+import tempfile
+import unittest
+from unittest.mock import patch
+
+from openpyxl import load_workbook
+
+from src import export
+from src.load_products import iter_categories_from_json, load_categories_from_json
+from src.main import Category, LawnGrass, Product, Smartphone
+from src.product_logging import bulk_load
+
+
+def _dump(categories):
+    return [(c.name, c.description, [(type(p), p.to_dict()) for p in c.products]) for c in categories]
+
+
+class TestExport(unittest.TestCase):
+    def setUp(self):
+        self.tmp = tempfile.TemporaryDirectory()
+        with bulk_load():
+            phone = Smartphone("iPhone 15", "512GB", 210000.0, 8, "A16", "Pro", 512, "Gray")
+            case = Product("Чехол", "Силикон, черный", 990.0, 3)
+            grass = LawnGrass("GreenField", "Газонная трава", 1500.0, 20, "Нидерланды", "2 недели", "Зелёный")
+            self.categories = [
+                Category("Смартфоны", "Категория телефонов", [phone, case]),
+                Category("Газонная трава", "Категория трав", [grass]),
+            ]
+
+    def tearDown(self):
+        self.tmp.cleanup()
+
+    def _path(self, name):
+        return os.path.join(self.tmp.name, name)
+
+    def test_frames(self):
+        """Проверка пакетов DataFrame: общая схема, поля подклассов - пустые колонки у остальных товаров."""
+        frames = list(export.iter_frames(self.categories, chunk_size=2))
+        self.assertEqual([len(frame) for frame in frames], [2, 1])
+        self.assertEqual(list(frames[0].columns), export.export_columns())
+        self.assertEqual(frames[0].dtypes.to_dict(), frames[1].dtypes.to_dict())
+        self.assertEqual(str(frames[0]["memory"].dtype), "Int64")
+        self.assertEqual(frames[0]["memory"].tolist()[0], 512)
+        self.assertTrue(frames[0]["memory"].isna().tolist()[1])
+        self.assertEqual(frames[1]["country"].tolist(), ["Нидерланды"])
+        self.assertEqual(frames[0]["type"].tolist(), ["smartphone", "product"])
+
+    def test_csv_round_trip(self):
+        """Проверка выгрузки в CSV пакетами и обратной загрузки."""
+        file_path = self._path("catalog.csv")
+        self.assertEqual(export.export_csv(self.categories, file_path, chunk_size=1), 3)
+        with open(file_path, encoding="utf-8") as file:
+            self.assertEqual(file.readline().strip(), ",".join(export.export_columns()))
+        self.assertEqual(_dump(export.load_categories_from_csv(file_path, chunk_size=2)), _dump(self.categories))
+
+    def test_csv_from_product_store(self):
+        """Проверка выгрузки категорий на ProductStore без создания объектов товаров."""
+        with bulk_load():
+            compact = list(iter_categories_from_json("products.json", compact=True))
+            expected = load_categories_from_json("products.json")
+        file_path = self._path("store.csv")
+        export.export_csv(compact, file_path)
+        self.assertEqual(_dump(export.load_categories_from_csv(file_path)), _dump(expected))
+
+    def test_xlsx(self):
+        """Проверка потоковой выгрузки в XLSX с переносом на новый лист."""
+        file_path = self._path("catalog.xlsx")
+        with patch.object(export, "XLSX_MAX_ROWS", 2):
+            self.assertEqual(export.export_xlsx(self.categories, file_path, chunk_size=2), 3)
+
+        workbook = load_workbook(file_path)
+        self.assertEqual(workbook.sheetnames, ["catalog", "catalog_2"])
+        first = list(workbook["catalog"].values)
+        self.assertEqual(list(first[0]), export.export_columns())
+        self.assertEqual(
+            first[1][:7], ("Смартфоны", "Категория телефонов", "smartphone", "iPhone 15", "512GB", 210000, 8)
+        )
+        self.assertIsNone(first[2][export.export_columns().index("memory")])
+        self.assertEqual(list(workbook["catalog_2"].values)[1][3], "GreenField")
+
+    @unittest.skipUnless(export.pyarrow, "pyarrow не установлен")
+    def test_parquet_round_trip(self):
+        """Проверка выгрузки в Parquet группами строк и обратной загрузки."""
+        file_path = self._path("catalog.parquet")
+        self.assertEqual(export.export_parquet(self.categories, file_path, chunk_size=2), 3)
+        self.assertEqual(_dump(export.load_categories_from_parquet(file_path)), _dump(self.categories))
+
+    def test_int_price_round_trip(self):
+        """Проверка, что целая цена остается int после выгрузки в CSV и Parquet и обратной загрузки."""
+        with bulk_load():
+            products = [Product("TV", "4K", 200000, 2), Product("Пульт", "ИК", 990.0, 1)]
+            categories = [Category("Техника", "Телевизоры", products)]
+        loaders = [(export.export_csv, export.load_categories_from_csv, "catalog.csv")]
+        if export.pyarrow is not None:
+            loaders.append((export.export_parquet, export.load_categories_from_parquet, "catalog.parquet"))
+        for save, load, name in loaders:
+            with self.subTest(name):
+                save(categories, self._path(name))
+                (loaded,) = load(self._path(name))
+                self.assertEqual([type(p.price) for p in loaded.products], [int, float])
+                self.assertEqual(str(loaded.products[0]), "TV, 200000 руб. Остаток: 2 шт.")
+
+    @unittest.skipIf(export.pyarrow, "pyarrow установлен")
+    def test_parquet_requires_pyarrow(self):
+        """Проверка понятной ошибки при отсутствии pyarrow."""
+        with self.assertRaises(ImportError):
+            export.export_parquet(self.categories, self._path("catalog.parquet"))
+
+
+if __name__ == "__main__":
+    unittest.main()
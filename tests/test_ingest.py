@@ -0,0 +1,91 @@
+import json
+import os
+import tempfile
+import unittest
+
+from src.ingest import load_categories_from_dir
+from src.main import Category, Smartphone
+
+
+class TestLoadCategoriesFromDir(unittest.TestCase):
+    def setUp(self):
+        Category.category_count = 0
+        Category.product_count = 0
+        self.tmp = tempfile.TemporaryDirectory()
+        self.files = {
+            "supplier1.json": [
+                {
+                    "name": "Смартфоны",
+                    "description": "Категория телефонов",
+                    "products": [
+                        {
+                            "name": "iPhone 15",
+                            "description": "512GB",
+                            "price": 210000.0,
+                            "quantity": 8,
+                            "efficiency": "A16",
+                            "model": "Pro",
+                            "memory": 512,
+                            "color": "Gray",
+                        }
+                    ],
+                }
+            ],
+            "supplier2.json": [
+                {
+                    "name": "Смартфоны",
+                    "description": "Другое описание",
+                    "products": [{"name": "Xiaomi", "description": "1024GB", "price": 31000.0, "quantity": 14}],
+                },
+                {
+                    "name": "Телевизоры",
+                    "description": "Категория телевизоров",
+                    "products": [{"name": "TV", "description": "55", "price": 123000.0, "quantity": 7}],
+                },
+            ],
+            "broken.json": [{"name": "Сломанная", "description": "Без товаров"}],
+            "zero.json": [
+                {
+                    "name": "Нулевая",
+                    "description": "Нулевой остаток",
+                    "products": [{"name": "Брак", "description": "Нет", "price": 1.0, "quantity": 0}],
+                }
+            ],
+        }
+        for file_name, data in self.files.items():
+            with open(os.path.join(self.tmp.name, file_name), "w", encoding="utf-8") as file:
+                json.dump(data, file, ensure_ascii=False)
+
+    def tearDown(self):
+        self.tmp.cleanup()
+
+    def test_load_directory(self):
+        """Проверка параллельной загрузки каталога с объединением категорий и ошибками по файлам."""
+        categories, errors = load_categories_from_dir(self.tmp.name, max_workers=2)
+
+        self.assertEqual([category.name for category in categories], ["Смартфоны", "Телевизоры"])
+        phones = categories[0]
+        self.assertEqual([product.name for product in phones], ["iPhone 15", "Xiaomi"])
+        self.assertIsInstance(phones.products[0], Smartphone)
+        self.assertEqual(phones.middle_price(), round((210000.0 * 8 + 31000.0 * 14) / 22, 2))
+
+        self.assertEqual(Category.category_count, 2)
+        self.assertEqual(Category.product_count, 3)
+
+        self.assertEqual(sorted(os.path.basename(path) for path in errors), ["broken.json", "zero.json"])
+        self.assertIn("KeyError", errors[os.path.join(self.tmp.name, "broken.json")])
+        self.assertIn("ValueError", errors[os.path.join(self.tmp.name, "zero.json")])
+
+    def test_glob_pattern(self):
+        """Проверка загрузки по glob-шаблону."""
+        categories, errors = load_categories_from_dir(os.path.join(self.tmp.name, "supplier1*.json"))
+        self.assertEqual(len(categories), 1)
+        self.assertEqual(errors, {})
+
+    def test_no_files(self):
+        """Проверка, что при отсутствии файлов возвращается пустой результат."""
+        self.assertEqual(load_categories_from_dir(os.path.join(self.tmp.name, "*.xml")), ([], {}))
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,135 @@
+import json
+import os
+import tempfile
+import unittest
+
+from src import json_backend
+from src.load_products import load_categories_from_json
+from src.main import LawnGrass, Product, Smartphone
+from src.product_logging import bulk_load
+
+CATALOG = [
+    {
+        "name": "Смартфоны",
+        "description": "Категория телефонов",
+        "products": [
+            {
+                "name": "iPhone 15",
+                "description": "512GB, Gray",
+                "price": 210000.0,
+                "quantity": 8,
+                "efficiency": "A16",
+                "model": "Pro Max",
+                "memory": 512,
+                "color": "Space Gray",
+            },
+            {"name": "Чехол", "description": "Силикон", "price": 990.0, "quantity": 3},
+        ],
+    },
+    {
+        "name": "Газонная трава",
+        "description": "Категория трав",
+        "products": [
+            {
+                "name": "GreenField",
+                "description": "Газонная трава",
+                "price": 1500.0,
+                "quantity": 20,
+                "country": "Нидерланды",
+                "germination_period": "2 недели",
+                "color": "Зелёный",
+            }
+        ],
+    },
+]
+
+
+class TestJsonBackend(unittest.TestCase):
+    def setUp(self):
+        self.tmp = tempfile.TemporaryDirectory()
+        self.file_path = self._write("catalog.json", json.dumps(CATALOG, ensure_ascii=False))
+        self.backend = json_backend.get_backend()
+
+    def tearDown(self):
+        json_backend.set_backend(self.backend)
+        self.tmp.cleanup()
+
+    def _write(self, name, text):
+        file_path = os.path.join(self.tmp.name, name)
+        with open(file_path, "w", encoding="utf-8") as file:
+            file.write(text)
+        return file_path
+
+    def test_backends(self):
+        """Проверка выбора парсера: stdlib доступен всегда, msgspec не выбирается по умолчанию."""
+        self.assertEqual(json_backend.available_backends()[-1], "json")
+        self.assertEqual(json_backend.get_backend(), "orjson" if json_backend.orjson else "json")
+        with self.assertRaises(ValueError):
+            json_backend.set_backend("simdjson")
+
+    def test_load_file_same_for_all_backends(self):
+        """Проверка, что все доступные парсеры читают файл через mmap одинаково."""
+        for backend in json_backend.available_backends():
+            with self.subTest(backend=backend):
+                self.assertEqual(json_backend.load_file(self.file_path, backend), CATALOG)
+                self.assertEqual(json_backend.loads(b"[1, 2.5]", backend), [1, 2.5])
+
+    def test_decode_errors(self):
+        """Проверка, что ошибки разбора любого парсера приводятся к json.JSONDecodeError."""
+        broken = self._write("broken.json", '[{"name": ')
+        empty = self._write("empty.json", "")
+        for backend in json_backend.available_backends():
+            for file_path in (broken, empty):
+                with self.subTest(backend=backend, file=file_path):
+                    with self.assertRaises(json.JSONDecodeError):
+                        json_backend.load_file(file_path, backend)
+
+    def test_loader_with_each_backend(self):
+        """Проверка load_categories_from_json с каждым доступным парсером."""
+        for backend in json_backend.available_backends():
+            with self.subTest(backend=backend):
+                json_backend.set_backend(backend)
+                with bulk_load():
+                    categories = load_categories_from_json(self.file_path)
+                self.assertEqual([category.name for category in categories], ["Смартфоны", "Газонная трава"])
+                phone, case = categories[0].products
+                self.assertIsInstance(phone, Smartphone)
+                self.assertEqual(phone.memory, 512)
+                self.assertIs(type(case), Product)
+                self.assertIsInstance(categories[1].products[0], LawnGrass)
+
+    def test_int_price_with_each_backend(self):
+        """Проверка, что целая цена остается int при любом парсере и строка товара не меняется."""
+        catalog = [dict(CATALOG[0], products=[dict(CATALOG[0]["products"][1], price=990)])]
+        file_path = self._write("int.json", json.dumps(catalog, ensure_ascii=False))
+        for backend in json_backend.available_backends():
+            with self.subTest(backend=backend):
+                json_backend.set_backend(backend)
+                with bulk_load():
+                    (category,) = load_categories_from_json(file_path)
+                self.assertEqual(str(category.products[0]), "Чехол, 990 руб. Остаток: 3 шт.")
+
+    @unittest.skipUnless(json_backend.msgspec, "msgspec не установлен")
+    def test_typed_records(self):
+        """Проверка разбора в типизированные записи msgspec и тех же проверок, что у new_products."""
+        json_backend.set_backend("msgspec")
+        data = json_backend.load_file(self.file_path, typed=True)
+        with bulk_load():
+            parsed = list(json_backend.iter_categories(data))
+        self.assertEqual(
+            [[product.to_dict() for product in products] for _, _, products in parsed],
+            [[product for product in category["products"]] for category in CATALOG],
+        )
+
+        mixed = dict(CATALOG[0]["products"][1], country="Россия", efficiency="A16")
+        bad = self._write("bad.json", json.dumps([dict(CATALOG[0], products=[mixed])]))
+        with self.assertRaises(TypeError):
+            list(json_backend.iter_categories(json_backend.load_file(bad, typed=True)))
+
+        free = self._write("free.json", json.dumps([dict(CATALOG[0], products=[dict(mixed, price=0)])]))
+        with self.assertRaises((TypeError, ValueError)):
+            list(json_backend.iter_categories(json_backend.load_file(free, typed=True)))
+
+
+if __name__ == "__main__":
+    unittest.main()
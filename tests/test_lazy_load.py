@@ -0,0 +1,123 @@
+import json
+import os
+import tempfile
+import unittest
+from unittest.mock import patch
+
+from src import lazy_load
+from src.lazy_load import LazyCategory, build_category_index, load_lazy_categories
+from src.load_products import load_categories_from_json
+from src.main import Category, Product, Smartphone
+from src.product_logging import bulk_load
+
+CATALOG = [
+    {
+        "name": "Смартфоны",
+        "description": "Категория телефонов: [новинки] и {хиты}",
+        "products": [
+            {
+                "name": "iPhone 15",
+                "description": 'Экран 6.1", {512GB} [Gray]',
+                "price": 210000.0,
+                "quantity": 8,
+                "efficiency": "A16",
+                "model": "Pro",
+                "memory": 512,
+                "color": "Gray",
+            },
+            {"name": "Чехол", "description": "Силикон", "price": 990.0, "quantity": 3},
+        ],
+    },
+    {"name": "Пустая", "description": "Без товаров", "products": []},
+    {
+        "name": "Телевизоры",
+        "description": "Категория телевизоров",
+        "products": [{"name": '55" QLED 4K', "description": "Фоновая подсветка", "price": 123000.0, "quantity": 7}],
+    },
+]
+
+
+class TestLazyLoad(unittest.TestCase):
+    def setUp(self):
+        Category.category_count = 0
+        Category.product_count = 0
+        self.tmp = tempfile.TemporaryDirectory()
+        self.file_path = os.path.join(self.tmp.name, "catalog.json")
+        with open(self.file_path, "w", encoding="utf-8") as file:
+            json.dump(CATALOG, file, ensure_ascii=False, indent=2)
+
+    def tearDown(self):
+        self.tmp.cleanup()
+
+    def test_index(self):
+        """Проверка байтовых смещений: фрагмент файла разбирается в товары категории."""
+        index = build_category_index(self.file_path)
+        self.assertEqual([entry["name"] for entry in index["categories"]], [c["name"] for c in CATALOG])
+        self.assertEqual(index["categories"][0]["description"], CATALOG[0]["description"])
+        with open(self.file_path, "rb") as file:
+            data = file.read()
+        for entry, category in zip(index["categories"], CATALOG):
+            self.assertEqual(json.loads(data[entry["start"]:entry["end"]]), category["products"])
+
+    def test_index_scalar_fields(self):
+        """Проверка, что числа, true, false и null перед products не сбивают разбор ключей категории."""
+        catalog = [
+            {"id": 1, "name": "А", "rank": 5.5, "description": "Первая", "products": CATALOG[0]["products"]},
+            {"name": "Б", "hidden": False, "description": "Вторая", "note": None, "products": CATALOG[2]["products"]},
+            {"name": "В", "description": "Третья", "top": True, "products": [], "size": -1},
+        ]
+        with open(self.file_path, "w", encoding="utf-8") as file:
+            json.dump(catalog, file, ensure_ascii=False)
+
+        categories = load_lazy_categories(self.file_path)
+        names = [(category.name, category.description) for category in categories]
+        self.assertEqual(names, [("А", "Первая"), ("Б", "Вторая"), ("В", "Третья")])
+        self.assertEqual([len(category.products) for category in categories], [2, 1, 0])
+
+    def test_lazy_materialization(self):
+        """Проверка, что товары создаются при первом обращении и только для нужной категории."""
+        categories = load_lazy_categories(self.file_path)
+        phones, empty, tvs = categories
+        self.assertEqual((Category.category_count, Category.product_count), (3, 0))
+        self.assertFalse(any(category.is_loaded for category in categories))
+
+        self.assertEqual(tvs.middle_price(), 123000.0)
+        self.assertEqual([category.is_loaded for category in categories], [False, False, True])
+        self.assertEqual(Category.product_count, 1)
+
+        self.assertIn("iPhone 15", phones.formatted_products())
+        self.assertIsInstance(phones.products[0], Smartphone)
+        self.assertEqual(list(empty), [])
+
+        with bulk_load():
+            new_category = LazyCategory("Аксессуары", "Мелочи", list)
+            new_category.add_product(Product("Кабель", "USB-C", 500.0, 2))
+        self.assertEqual(str(new_category), "Аксессуары, количество продуктов: 2 шт.")
+
+        with bulk_load():
+            expected = load_categories_from_json(self.file_path)
+        for lazy, eager in zip(categories, expected):
+            self.assertEqual([p.to_dict() for p in lazy], [p.to_dict() for p in eager])
+            self.assertEqual(lazy.middle_price(), eager.middle_price())
+
+    def test_saved_index(self):
+        """Проверка, что свежий индекс используется без просмотра файла, а устаревший перестраивается."""
+        index_path = os.path.join(self.tmp.name, "catalog.index.json")
+        load_lazy_categories(self.file_path, index_path)
+        self.assertTrue(os.path.isfile(index_path))
+
+        with patch.object(lazy_load, "build_category_index", side_effect=AssertionError("файл не должен читаться")):
+            categories = load_lazy_categories(self.file_path, index_path)
+        self.assertEqual(len(categories[0].products), 2)
+
+        stale = load_lazy_categories(self.file_path, index_path)
+        with open(self.file_path, "a", encoding="utf-8") as file:
+            file.write("\n")
+        with self.assertRaises(ValueError):
+            stale[0].products
+        self.assertFalse(stale[0].is_loaded)
+        self.assertEqual(len(load_lazy_categories(self.file_path, index_path)[2].products), 1)
+
+
+if __name__ == "__main__":
+    unittest.main()
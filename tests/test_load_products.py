@@ -1,9 +1,12 @@
+import io
 import json
+import os
+import tempfile
 import unittest
 from unittest.mock import mock_open, patch
 
-from src.load_products import load_categories_from_json
-from src.main import LawnGrass, Smartphone
+from src.load_products import _JsonStream, iter_categories_from_json, load_categories_from_json
+from src.main import Category, LawnGrass, Smartphone
 
 
 class TestLoadProducts(unittest.TestCase):
@@ -24,11 +27,20 @@ class TestLoadProducts(unittest.TestCase):
                 ],
             }
         ]
+        self.tmp = tempfile.TemporaryDirectory()
 
-    @patch(
-        "builtins.open",
-        new_callable=mock_open,
-        read_data=json.dumps(
+    def tearDown(self):
+        self.tmp.cleanup()
+
+    def _write_json(self, data) -> str:
+        file_path = os.path.join(self.tmp.name, "products.json")
+        with open(file_path, "w", encoding="utf-8") as file:
+            json.dump(data, file, ensure_ascii=False)
+        return file_path
+
+    def test_load_smartphone_and_lawngrass(self):
+        """Проверка загрузки смартфона и газонной травы из JSON."""
+        file_path = self._write_json(
             [
                 {
                     "name": "Смартфоны",
@@ -62,12 +74,8 @@ class TestLoadProducts(unittest.TestCase):
                     ],
                 },
             ]
-        ),
-    )
-    @patch("os.path.isfile", return_value=True)
-    def test_load_smartphone_and_lawngrass(self, mock_isfile, mock_open):
-        """Проверка загрузки смартфона и газонной травы из JSON."""
-        categories = load_categories_from_json("products.json")
+        )
+        categories = load_categories_from_json(file_path)
 
         self.assertEqual(len(categories), 2)
 
@@ -88,13 +96,102 @@ class TestLoadProducts(unittest.TestCase):
             categories = load_categories_from_json("nonexistent.json", max_attempts=2)
             self.assertEqual(categories, [])
 
-    @patch("builtins.open", new_callable=mock_open, read_data="invalid json")
-    @patch("os.path.isfile", return_value=True)
-    def test_invalid_json_format(self, mock_isfile, mock_open):
+    def test_invalid_json_format(self):
         """Проверка обработки ошибки при некорректном формате JSON."""
-        categories = load_categories_from_json("products.json")
+        file_path = os.path.join(self.tmp.name, "invalid.json")
+        with open(file_path, "w", encoding="utf-8") as file:
+            file.write("invalid json")
+        categories = load_categories_from_json(file_path)
         self.assertEqual(categories, [])
 
 
+class TestIterCategoriesFromJson(unittest.TestCase):
+    def setUp(self):
+        self.data = [
+            {
+                "name": "Смартфоны",
+                "description": "Категория телефонов",
+                "products": [
+                    {
+                        "name": "iPhone 15",
+                        "description": "512GB, Gray",
+                        "price": 210000.0,
+                        "quantity": 8,
+                        "efficiency": "A16",
+                        "model": "Pro Max",
+                        "memory": 512,
+                        "color": "Space Gray",
+                    },
+                    {"name": "Xiaomi", "description": "1024GB", "price": 31000.0, "quantity": 14},
+                ],
+            },
+            {"products": [], "name": "Пустая", "description": "Без товаров"},
+        ]
+
+    def test_json_stream_small_chunks(self):
+        """Проверка, что разбор не ломается на границах маленьких кусков файла."""
+        stream = _JsonStream(io.StringIO(json.dumps([12345, {"a": [1.5, "x"]}, 7])), chunk_size=3)
+        values = []
+        for _ in stream.iter_array():
+            values.append(stream.value())
+        self.assertEqual(values, [12345, {"a": [1.5, "x"]}, 7])
+
+        big = {"items": list(range(5000)), "text": "я" * 10000}
+        stream = _JsonStream(io.StringIO(json.dumps([big, "tail"])), chunk_size=16)
+        self.assertEqual([stream.value() for _ in stream.iter_array()], [big, "tail"])
+
+    def test_json_stream_errors_stop_early(self):
+        """Проверка, что синтаксическая ошибка и слишком большое значение не дочитывают файл до конца."""
+        file = io.StringIO('[{"a": 1 "b": 2}, ' + "1, " * 200_000 + "1]")
+        stream = _JsonStream(file, chunk_size=64)
+        with self.assertRaises(json.JSONDecodeError):
+            for _ in stream.iter_array():
+                stream.value()
+        self.assertLess(file.tell(), 1024)
+
+        file = io.StringIO('["' + "x" * 200_000 + '"]')
+        stream = _JsonStream(file, chunk_size=64, max_value_size=1000)
+        with self.assertRaises(json.JSONDecodeError):
+            for _ in stream.iter_array():
+                stream.value()
+        self.assertLess(file.tell(), 10_000)
+
+    def test_iter_categories(self):
+        """Проверка потоковой загрузки категорий."""
+        with patch("builtins.open", mock_open(read_data=json.dumps(self.data))), patch(
+            "os.path.isfile", return_value=True
+        ):
+            categories = list(iter_categories_from_json("products.json"))
+
+        self.assertEqual(len(categories), 2)
+        self.assertIsInstance(categories[0], Category)
+        self.assertIsInstance(categories[0].products[0], Smartphone)
+        self.assertEqual(categories[0].products[1].name, "Xiaomi")
+        self.assertEqual(categories[1].name, "Пустая")
+        self.assertEqual(categories[1].products, [])
+
+    def test_iter_products_only(self):
+        """Проверка выдачи словарей товаров без создания объектов."""
+        with patch("builtins.open", mock_open(read_data=json.dumps(self.data))), patch(
+            "os.path.isfile", return_value=True
+        ):
+            records = list(iter_categories_from_json("products.json", products_only=True))
+
+        self.assertEqual([record["name"] for record in records], ["iPhone 15", "Xiaomi"])
+
+    @patch("os.path.isfile", return_value=False)
+    def test_iter_file_not_found(self, mock_isfile):
+        """Проверка, что при отсутствии файла генератор ничего не отдает и не спрашивает имя файла."""
+        with patch("builtins.input") as mock_input:
+            self.assertEqual(list(iter_categories_from_json("nonexistent.json")), [])
+            mock_input.assert_not_called()
+
+    @patch("builtins.open", new_callable=mock_open, read_data='[{"name": "Сломанная", ')
+    @patch("os.path.isfile", return_value=True)
+    def test_iter_invalid_json(self, mock_isfile, mock_open):
+        """Проверка обработки оборванного JSON."""
+        self.assertEqual(list(iter_categories_from_json("products.json")), [])
+
+
 if __name__ == "__main__":
     unittest.main()
@@ -1,4 +1,4 @@
-import io
+import gc
 import os
 import sys
 import unittest
@@ -69,15 +69,12 @@ class TestProduct(unittest.TestCase):
         self.assertEqual(product1 + product2, (100.0 * 2 + 200.0 * 3))
 
     def test_product_logger_mixin(self):
-        """Проверяем, что при создании объекта выводится информация в консоль."""
-        captured_output = io.StringIO()  # Перехватываем вывод в консоль
-        sys.stdout = captured_output
-
-        phone = Smartphone("iPhone 15", "512GB", 210000.0, 8, "A16", "Pro", 512, "Gray")
-        _ = phone
-        sys.stdout = sys.__stdout__  # Восстанавливаем стандартный вывод
-        assert "Создан объект: Smartphone" in captured_output.getvalue()
-        assert "'name': 'iPhone 15'" in captured_output.getvalue()
+        """Проверяем, что при создании объекта пишется запись в лог."""
+        with self.assertLogs("src.products", level="INFO") as captured:
+            phone = Smartphone("iPhone 15", "512GB", 210000.0, 8, "A16", "Pro", 512, "Gray")
+            _ = phone
+        assert "Создан объект: Smartphone" in captured.output[0]
+        assert "'name': 'iPhone 15'" in captured.output[0]
 
     def test_product_quantity_zero(self):
         """Проверка, что при создании товара с нулевым количеством выбрасывается ValueError"""
@@ -225,6 +222,34 @@ class TestCategory(unittest.TestCase):
         category = Category("Категория с одним товаром", "Описание", [product])
         self.assertEqual(category.middle_price(), 500)
 
+    def test_category_totals_follow_changes(self):
+        """Проверка, что накопленные суммы обновляются при изменении цены и остатка."""
+        product1 = Product("Товар 1", "Описание", 100, 2)
+        product2 = Product("Товар 2", "Описание", 200, 3)
+        category = Category("Тестовая категория", "Описание", [product1])
+        category.add_product(product2)
+
+        product1.price = 400
+        product2.quantity = 1
+        self.assertEqual(category.middle_price(), round((400 * 2 + 200 * 1) / 3, 2))
+        self.assertEqual(str(category), "Тестовая категория, количество продуктов: 3 шт.")
+
+    def test_category_totals_duplicate_product(self):
+        """Проверка сумм, когда один товар входит в категорию дважды."""
+        product = Product("Товар", "Описание", 100, 2)
+        category = Category("Категория", "Описание", [product, product])
+        product.quantity = 5
+        self.assertEqual(str(category), "Категория, количество продуктов: 10 шт.")
+
+    def test_category_debug_check(self):
+        """Проверка, что в режиме отладки расхождение сумм с пересчетом обнаруживается."""
+        category = Category("Категория", "Описание", [Product("Товар", "Описание", 100, 2)])
+        category.debug = True
+        self.assertEqual(category.middle_price(), 100)
+        category.products.append(Product("Товар 2", "Описание", 200, 3))  # Мимо add_product
+        with self.assertRaises(AssertionError):
+            category.middle_price()
+
 
 class TestProductMethods(unittest.TestCase):
     def test_smartphone_str(self):
@@ -253,6 +278,78 @@ class TestProductMethods(unittest.TestCase):
             _ = phone + grass
 
 
+class TestProductFactory(unittest.TestCase):
+    def setUp(self):
+        self.records = [
+            {"name": "Товар", "description": "Описание", "price": 100.0, "quantity": 2},
+            {
+                "type": "smartphone",
+                "name": "iPhone 15",
+                "description": "512GB",
+                "price": 210000.0,
+                "quantity": 8,
+                "efficiency": "A16",
+                "model": "Pro",
+                "memory": 512,
+                "color": "Gray",
+            },
+            {
+                "name": "GreenField",
+                "description": "Газонная трава",
+                "price": 1500.0,
+                "quantity": 20,
+                "country": "Нидерланды",
+                "germination_period": "2 недели",
+                "color": "Зелёный",
+            },
+        ]
+
+    def test_registry(self):
+        """Проверка реестра классов товаров."""
+        self.assertEqual(Product.registry, {"product": Product, "smartphone": Smartphone, "lawn_grass": LawnGrass})
+
+    def test_new_product_discriminator(self):
+        """Проверка выбора класса по полю type и по характерному полю."""
+        self.assertIsInstance(Product.new_product(self.records[1]), Smartphone)
+        self.assertIsInstance(Product.new_product(self.records[2]), LawnGrass)
+        with self.assertRaises(ValueError):
+            Product.new_product({"type": "tv", "name": "TV", "description": "", "price": 1.0, "quantity": 1})
+
+    def test_new_products(self):
+        """Проверка пакетного создания товаров."""
+        products = Product.new_products(self.records)
+        self.assertEqual([type(product) for product in products], [Product, Smartphone, LawnGrass])
+        self.assertEqual(
+            [str(product) for product in products],
+            [str(Product.new_product(record)) for record in self.records],
+        )
+        products[0].price = 50.0
+        self.assertEqual(products[0].price, 50.0)
+
+    def test_new_products_grouping(self):
+        """Проверка порядка товаров разных классов, приоритета type над маркером и включения сборщика мусора."""
+        records = [self.records[2], self.records[0], self.records[1], self.records[0]]
+        products = Product.new_products(records)
+        self.assertEqual([type(product) for product in products], [LawnGrass, Product, Smartphone, Product])
+        self.assertEqual([product.name for product in products], [record["name"] for record in records])
+        # type важнее маркера country: у Product другой набор полей
+        with self.assertRaises(TypeError):
+            Product.new_products([self.records[0], dict(self.records[2], type="product")])
+        self.assertTrue(gc.isenabled())
+
+    def test_new_products_validation(self):
+        """Проверка, что пакет с ошибкой отклоняется целиком."""
+        bad_quantity = dict(self.records[0], quantity=0)
+        with self.assertRaisesRegex(ValueError, "Товар #1"):
+            Product.new_products([self.records[0], bad_quantity])
+        with self.assertRaises(ValueError):
+            Product.new_products([dict(self.records[0], price=-1.0)])
+        with self.assertRaises(TypeError):
+            Product.new_products([dict(self.records[0], color="Gray")])
+        with self.assertRaises(TypeError):
+            Product.new_products([{"name": "Товар", "price": 1.0, "quantity": 1}])
+
+
 class TestOrder(unittest.TestCase):
     def test_order_creation(self):
         """Проверка создания заказа и расчета итоговой стоимости."""
@@ -0,0 +1,89 @@
+import contextlib
+import io
+import os
+import tempfile
+import unittest
+
+from src import metrics
+from src.load_products import load_categories_from_json
+from src.main import Category, Order, OrderException, Product
+from src.product_logging import bulk_load
+
+
+class TestMetrics(unittest.TestCase):
+    def setUp(self):
+        metrics.registry.clear()
+        with bulk_load():
+            self.product = Product("Товар", "Описание", 100.0, 10)
+            self.category = Category("Категория", "Описание", [self.product])
+
+    def tearDown(self):
+        metrics.disable()
+        metrics.registry.clear()
+
+    def test_disabled_records_nothing(self):
+        """Проверка, что при выключенном инструментировании метрики не собираются."""
+        self.category.middle_price()
+        Order(self.product, 1)
+        load_categories_from_json("products.json")
+        self.assertEqual(metrics.registry.counters, {})
+        self.assertEqual(metrics.registry.histograms, {})
+
+    def test_entry_points(self):
+        """Проверка счетчиков и таймеров загрузки, средней цены и создания заказов."""
+        metrics.enable()
+        load_categories_from_json("products.json")
+        self.category.middle_price()
+        Order(self.product, 1)
+        with self.assertRaises(OrderException):
+            Order(self.product, 0)
+
+        counters = {name: counter.value for name, counter in metrics.registry.counters.items()}
+        self.assertEqual(counters["load_files_total"], 1)
+        self.assertEqual(counters["category_middle_price_total"], 1)
+        self.assertEqual(counters["order_create_total"], 2)
+        self.assertEqual(counters["order_create_errors_total"], 1)
+        for name in ("load_json_parse_seconds", "load_construct_seconds", "order_create_seconds"):
+            self.assertIn(name, metrics.registry.histograms)
+        self.assertEqual(metrics.registry.histograms["order_create_seconds"].count, 2)
+
+    def test_export_prometheus(self):
+        """Проверка текстового формата Prometheus в stdout и в файл."""
+        metrics.enable()
+        metrics.inc("orders_total", 3)
+        metrics.observe("latency_seconds", 0.002)
+        metrics.observe("latency_seconds", 20.0)
+
+        stdout = io.StringIO()
+        with contextlib.redirect_stdout(stdout):
+            text = metrics.export_prometheus()
+        self.assertEqual(stdout.getvalue(), text)
+        self.assertIn("# TYPE catalog_orders_total counter\ncatalog_orders_total 3\n", text)
+        self.assertIn('catalog_latency_seconds_bucket{le="0.001"} 0\n', text)
+        self.assertIn('catalog_latency_seconds_bucket{le="0.005"} 1\n', text)
+        self.assertIn('catalog_latency_seconds_bucket{le="+Inf"} 2\n', text)
+        self.assertIn("catalog_latency_seconds_count 2\n", text)
+
+        with tempfile.TemporaryDirectory() as tmp:
+            file_path = os.path.join(tmp, "metrics.prom")
+            metrics.export_prometheus(file_path)
+            with open(file_path, encoding="utf-8") as file:
+                self.assertEqual(file.read(), text)
+
+    def test_profile(self):
+        """Проверка снятия cProfile блока операций в stdout и в файл."""
+        stdout = io.StringIO()
+        with contextlib.redirect_stdout(stdout):
+            with metrics.profile(limit=5):
+                self.category.middle_price()
+        self.assertIn("middle_price", stdout.getvalue())
+
+        with tempfile.TemporaryDirectory() as tmp:
+            file_path = os.path.join(tmp, "catalog.prof")
+            with metrics.profile(file_path):
+                self.category.middle_price()
+            self.assertGreater(os.path.getsize(file_path), 0)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,93 @@
+import pickle
+import unittest
+from concurrent.futures import ThreadPoolExecutor
+
+from src.main import Category, Order, Product, Smartphone
+from src.order_book import OrderBook
+from src.order_engine import OrderEngine
+
+
+class TestOrderBook(unittest.TestCase):
+    def setUp(self):
+        self.phone = Smartphone("iPhone 15", "512GB", 210000.0, 100, "A16", "Pro", 512, "Gray")
+        self.case = Product("Чехол", "Силикон", 990.0, 100)
+        self.cable = Product("Кабель", "USB-C", 500.0, 100)
+        self.phones = Category("Смартфоны", "Смартфоны для связи", [self.phone, self.case])
+
+    def test_running_totals(self):
+        """Проверка итогов по товарам и категориям, которые обновляются при добавлении."""
+        book = OrderBook([self.phones])
+        book.add(Order(self.phone, 2), timestamp=10)
+        book.extend([Order(self.case, 3), Order(self.cable, 4)], timestamp=20)
+        book.add(Order(self.case, 1), timestamp=30, category="Аксессуары")
+
+        self.assertEqual(len(book), 4)
+        self.assertEqual(book.totals(), {"count": 4, "quantity": 10, "revenue": 420000.0 + 3960.0 + 2000.0})
+        self.assertEqual(book.totals("product")["Чехол"], {"count": 2, "quantity": 4, "revenue": 3960.0})
+        by_category = book.totals("category")
+        self.assertEqual(by_category["Смартфоны"], {"count": 2, "quantity": 5, "revenue": 422970.0})
+        self.assertEqual(by_category[None]["revenue"], 2000.0)
+        self.assertEqual(by_category["Аксессуары"]["quantity"], 1)
+        self.assertEqual(book.top(1), [("iPhone 15", 420000.0)])
+        self.assertEqual(book.record(3)["category"], "Аксессуары")
+        with self.assertRaises(ValueError):
+            book.totals("color")
+
+    def test_windows(self):
+        """Проверка агрегатов за интервал времени, в том числе для строк, добавленных не по порядку."""
+        book = OrderBook([self.phones])
+        for timestamp in (50, 10, 30, 20, 40):
+            book.add(Order(self.case, timestamp // 10), timestamp=timestamp)
+        book.add(Order(self.phone, 1), timestamp=25)
+
+        self.assertEqual(book.window(20, 40), {"count": 3, "quantity": 6, "revenue": 990.0 * 5 + 210000.0})
+        self.assertEqual(book.window(20, 40, by="product")["Чехол"], {"count": 2, "quantity": 5, "revenue": 4950.0})
+        expected = {"Смартфоны": {"count": 1, "quantity": 1, "revenue": 990.0}}
+        self.assertEqual(book.window(end=20, by="category"), expected)
+        self.assertEqual(book.window(60), {"count": 0, "quantity": 0, "revenue": 0.0})
+        self.assertEqual(book.window(60, by="product"), {})
+        self.assertEqual([book.record(i)["timestamp"] for i in range(len(book))], [10, 20, 25, 30, 40, 50])
+        self.assertEqual(book.window(), book.totals())
+        self.assertEqual(book.top(1, start=30), [("Чехол", 990.0 * 12)])
+
+    def test_merge_parallel_books(self):
+        """Проверка объединения журналов, собранных в разных потоках и переданных через pickle."""
+        def build(offset):
+            book = OrderBook([self.phones])
+            for i in range(100):
+                product = (self.phone, self.case, self.cable)[i % 3]
+                book.add(Order(product, 1 + i % 2), timestamp=offset + i * 4)
+            return pickle.loads(pickle.dumps(book))
+
+        with ThreadPoolExecutor(max_workers=4) as executor:
+            books = list(executor.map(build, range(4)))
+        merged = OrderBook()
+        for book in books:
+            merged.merge(book)
+
+        single = OrderBook([self.phones])
+        for book in books:
+            for i in range(len(book)):
+                record = book.record(i)
+                product = {"iPhone 15": self.phone, "Чехол": self.case, "Кабель": self.cable}[record["product"]]
+                single.add(Order(product, record["quantity"]), timestamp=record["timestamp"])
+
+        self.assertEqual(len(merged), 400)
+        for by in ("product", "category"):
+            self.assertEqual(merged.totals(by), single.totals(by))
+            self.assertEqual(merged.window(100, 200, by), single.window(100, 200, by))
+        timestamps = [merged.record(i)["timestamp"] for i in range(len(merged))]
+        self.assertEqual(timestamps, sorted(timestamps))
+
+    def test_engine_records_orders(self):
+        """Проверка, что OrderEngine записывает созданные заказы в журнал."""
+        book = OrderBook([self.phones])
+        engine = OrderEngine(book)
+        orders, errors = engine.process([(self.phone, 2), (self.case, 0), (self.cable, 3)])
+        self.assertEqual(len(errors), 1)
+        self.assertEqual(book.totals()["revenue"], sum(order.total_price for order in orders))
+        self.assertEqual(book.totals("category")["Смартфоны"]["quantity"], 2)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,107 @@
+import threading
+import unittest
+
+from src.main import Category, Order, OrderException, Product, Smartphone
+from src.order_engine import OrderEngine
+
+
+class TestOrderEngine(unittest.TestCase):
+    def setUp(self):
+        self.phone = Smartphone("iPhone 15", "512GB", 210000.0, 8, "A16", "Pro", 512, "Gray")
+        self.product = Product("Товар", "Описание", 100, 5)
+        self.engine = OrderEngine()
+
+    def test_batch_with_errors(self):
+        """Проверка, что ошибочные строки не отменяют остальные и остатки списываются."""
+        orders, errors = self.engine.process(
+            [(self.phone, 2), (self.product, 0), (self.phone, 7), ("не товар", 1), (self.product, 5)]
+        )
+
+        self.assertEqual([order.quantity for order in orders], [2, 5])
+        self.assertIsInstance(orders[0], Order)
+        self.assertEqual(orders[0].total_price, 420000.0)
+        self.assertEqual(orders[1].total_price, 500)
+        self.assertEqual(str(orders[0]), "Заказ: iPhone 15, Количество: 2, Итоговая стоимость: 420000.0 руб.")
+
+        self.assertEqual(sorted(errors), [1, 2, 3])
+        self.assertTrue(all(isinstance(error, OrderException) for error in errors.values()))
+        self.assertIn("доступно 6 шт.", str(errors[2]))
+
+        self.assertEqual(self.phone.quantity, 6)
+        self.assertEqual(self.product.quantity, 0)
+
+    def test_totals_match_order(self):
+        """Проверка, что стоимость совпадает с Order по типу и берется по цене на момент резервирования."""
+        (order,), _ = self.engine.process([(self.product, 5)])
+        self.assertIs(type(order.total_price), int)
+        self.assertEqual(str(order), str(Order(Product("Товар", "Описание", 100, 5), 5)))
+
+        def reprice(product, field, old, new):
+            if field == "quantity":
+                product.price = 1.0
+
+        self.phone.add_listener(reprice)
+        (order,), _ = self.engine.process([(self.phone, 2)])
+        self.assertEqual(order.total_price, 420000.0)
+
+    def test_reservation_updates_category(self):
+        """Проверка, что списание остатков отражается в категории."""
+        category = Category("Категория", "Описание", [self.product])
+        self.engine.process([(self.product, 3)])
+        self.assertEqual(str(category), "Категория, количество продуктов: 2 шт.")
+
+    def test_rollback_on_listener_error(self):
+        """Проверка, что при сбое во время списания уже списанное возвращается."""
+
+        def failing_listener(product, field, old, new):
+            if new == 2:
+                raise RuntimeError("сбой подписчика")
+
+        self.product.add_listener(failing_listener)
+        with self.assertRaises(RuntimeError):
+            self.engine.process([(self.phone, 1), (self.product, 3)])
+        self.assertEqual(self.phone.quantity, 8)
+        self.assertEqual(self.product.quantity, 5)
+
+    def test_reserve_against_other_engine(self):
+        """Проверка, что остаток, проданный другим движком во время пакета, не уходит в минус."""
+        last = Product("Последний", "Описание", 10.0, 1)
+        other = OrderEngine()
+
+        def sell_last(product, field, old, new):
+            if field == "quantity":
+                other.process([(last, 1)])
+
+        self.product.add_listener(sell_last)
+        orders, errors = self.engine.process([(self.product, 1), (last, 1)])
+        self.assertEqual([order.product for order in orders], [self.product])
+        self.assertIn("доступно 0 шт.", str(errors[1]))
+        self.assertEqual(last.quantity, 0)
+
+    def test_try_reserve(self):
+        """Проверка атомарного списания остатка товара."""
+        self.assertTrue(self.product.try_reserve(3))
+        self.assertFalse(self.product.try_reserve(3))
+        self.assertEqual(self.product.quantity, 2)
+
+    def test_concurrent_batches_do_not_oversell(self):
+        """Проверка, что параллельные пакеты не продают больше остатка."""
+        product = Product("Дефицит", "Описание", 10.0, 100)
+        sold = []
+
+        # У каждого потока свой движок: остаток защищает блокировка товара, а не движка
+        def worker():
+            orders, _ = OrderEngine().process([(product, 1)] * 30)
+            sold.append(sum(order.quantity for order in orders))
+
+        threads = [threading.Thread(target=worker) for _ in range(8)]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+        self.assertEqual(sum(sold), 100)
+        self.assertEqual(product.quantity, 0)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,59 @@
+import io
+import logging
+import unittest
+
+from src.load_products import load_categories_from_json
+from src.main import Product
+from src.product_logging import SamplingFilter, bulk_load, setup_product_logging, shutdown_product_logging
+
+
+class TestProductLogging(unittest.TestCase):
+    def tearDown(self):
+        shutdown_product_logging()
+        logging.getLogger("src.products").setLevel(logging.NOTSET)
+
+    def test_bulk_load_suppresses_logging(self):
+        """Проверка, что в режиме массовой загрузки записи о создании товаров не пишутся."""
+        with self.assertNoLogs("src.products", level="INFO"):
+            with bulk_load():
+                Product("Товар", "Описание", 100.0, 1)
+
+    def test_loader_does_not_log_products(self):
+        """Проверка, что загрузка каталога пишет только итог по пачке, а не запись на каждый товар."""
+        with self.assertLogs("src.products", level="INFO") as captured:
+            categories = load_categories_from_json("products.json")
+        self.assertTrue(categories)
+        self.assertEqual(len(captured.output), len(categories))
+        self.assertTrue(all("Создано товаров пачкой" in line for line in captured.output))
+
+    def test_sampling_filter(self):
+        """Проверка прореживания и ограничения частоты записей."""
+        record = logging.makeLogRecord({"msg": "запись"})
+        every_third = SamplingFilter(every=3)
+        self.assertEqual([every_third.filter(record) for _ in range(6)], [True, False, False, True, False, False])
+
+        limited = SamplingFilter(max_per_second=2)
+        self.assertEqual(sum(limited.filter(record) for _ in range(10)), 2)
+
+    def test_queue_logging(self):
+        """Проверка, что записи через очередь доходят до потока вывода."""
+        stream = io.StringIO()
+        setup_product_logging(stream=stream)
+        Product("Товар", "Описание", 100.0, 1)
+        shutdown_product_logging()
+        self.assertIn("Создан объект: Product с параметрами {'name': 'Товар'", stream.getvalue())
+
+    def test_params_captured_at_creation(self):
+        """Проверка, что в запись попадают значения полей на момент создания, а не на момент вывода."""
+        stream = io.StringIO()
+        setup_product_logging(stream=stream)
+        products = [Product(f"Товар {i}", "Описание", 100.0, 5) for i in range(50)]
+        for product in products:
+            product.quantity = 1
+        shutdown_product_logging()
+        self.assertEqual(stream.getvalue().count("'quantity': 5"), 50)
+        self.assertNotIn("'quantity': 1", stream.getvalue())
+
+
+if __name__ == "__main__":
+    unittest.main()
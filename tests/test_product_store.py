@@ -0,0 +1,92 @@
+import gc
+import unittest
+
+from src.main import Category, LawnGrass, Product, Smartphone
+from src.product_store import ProductStore
+
+
+class TestProductStore(unittest.TestCase):
+    def setUp(self):
+        self.products = [
+            Product("Товар 1", "Описание", 100.0, 2),
+            Smartphone("iPhone 15", "512GB", 210000.0, 8, "A16", "Pro", 512, "Gray"),
+            LawnGrass("GreenField", "Газонная трава", 1500.0, 20, "Нидерланды", "2 недели", "Зелёный"),
+        ]
+
+    def test_identity_while_referenced(self):
+        """Проверка, что пока товар жив, хранилище возвращает тот же объект."""
+        store = ProductStore(self.products)
+        self.assertEqual(len(store), 3)
+        self.assertEqual(list(store), self.products)
+        self.assertIs(store[-1], self.products[2])
+
+    def test_views_materialized_from_columns(self):
+        """Проверка восстановления товаров из колонок после удаления исходных объектов."""
+        expected = [str(product) for product in self.products]
+        store = ProductStore(self.products)
+        self.products = None
+        gc.collect()
+
+        views = list(store)
+        self.assertEqual([str(view) for view in views], expected)
+        self.assertIsInstance(views[1], Smartphone)
+        self.assertIsInstance(views[2], LawnGrass)
+        self.assertEqual(
+            store.record(0), {"name": "Товар 1", "description": "Описание", "price": 100.0, "quantity": 2}
+        )
+
+    def test_write_back(self):
+        """Проверка, что изменения представления записываются в колонки."""
+        store = ProductStore(self.products)
+        view = store[1]
+        view.price = 150000.0
+        view.quantity = 3
+        view.color = "Black"
+        record = store.record(1)
+        self.assertEqual((record["price"], record["quantity"], record["color"]), (150000.0, 3, "Black"))
+
+    def test_index_error(self):
+        store = ProductStore()
+        with self.assertRaises(IndexError):
+            _ = store[0]
+
+    def test_category_with_store(self):
+        """Проверка, что категория работает поверх колоночного хранилища."""
+        Category.product_count = 0
+        category = Category("Категория", "Описание", ProductStore(self.products[:1]))
+        category.add_product(Product("Товар 2", "Описание", 200.0, 3))
+        self.assertEqual(Category.product_count, 2)
+        self.assertEqual(str(category), "Категория, количество продуктов: 5 шт.")
+        self.assertEqual(category.middle_price(), 160.0)
+        self.assertIn("Товар 2, 200.0 руб. Остаток: 3 шт.", category.formatted_products())
+
+        category.debug = True
+        category.products[0].price = 300.0
+        self.assertEqual(category.middle_price(), 240.0)
+
+    def test_int_price_type(self):
+        """Проверка, что целая цена остается int и строковое представление товара не меняется."""
+        product = Product("Телевизор", "4K", 200000, 2)
+        expected = str(product)
+        store = ProductStore([product, Product("Пульт", "ИК", 990.5, 1)])
+        del product
+        self.assertEqual(str(store[0]), expected)
+        self.assertIs(type(store.record(0)["price"]), int)
+        self.assertEqual(store.record(1)["price"], 990.5)
+
+        store[1].price = 1000
+        self.assertIs(type(store.record(1)["price"]), int)
+        store[0].price = 150000.5
+        self.assertEqual(store.record(0)["price"], 150000.5)
+
+
+class TestProductSlots(unittest.TestCase):
+    def test_no_instance_dict(self):
+        """Проверка, что у товаров нет __dict__."""
+        phone = Smartphone("iPhone 15", "512GB", 210000.0, 8, "A16", "Pro", 512, "Gray")
+        self.assertFalse(hasattr(phone, "__dict__"))
+        self.assertEqual(Product.new_product(phone.to_dict()).to_dict(), phone.to_dict())
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,92 @@
+import unittest
+
+import numpy as np
+
+from src.main import Category, LawnGrass, Product, Smartphone
+from src.product_logging import bulk_load
+from src.product_store import ProductStore
+from src.query import Query, _stable_smallest
+
+
+class TestQuery(unittest.TestCase):
+    def setUp(self):
+        with bulk_load():
+            self.phones = [
+                Smartphone("iPhone 15", "512GB", 210000.0, 8, "A16", "Pro", 512, "Gray"),
+                Smartphone("Xiaomi", "256GB", 31000.0, 3, "SD8", "Note", 256, "Black"),
+                Smartphone("Pixel", "128GB", 90000.0, 4, "Tensor", "8", 128, "White"),
+            ]
+            self.phones[1].quantity = 0  # Товар закончился
+            self.case = Product("Чехол", "Силикон", 990.0, 30)
+            self.grass = [
+                LawnGrass("GreenField", "Газонная трава", 1500.0, 20, "Нидерланды", "2 недели", "Зелёный"),
+                LawnGrass("LawnMix", "Газонная трава", 2500.0, 15, "Германия", "7 дней", "Темно-зеленый"),
+                LawnGrass("Луг", "Газонная трава", 500.0, 100, "Нидерланды", "3 недели", "Зелёный"),
+            ]
+            self.categories = [
+                Category("Смартфоны", "Телефоны", self.phones + [self.case]),
+                Category("Трава", "Газоны", ProductStore(self.grass)),
+            ]
+        self.query = Query(self.categories)
+
+    def test_filters(self):
+        """Проверка условий по колонкам и по прочим полям, в том числе из ProductStore."""
+        self.assertEqual(self.query.count(), 7)
+        in_stock = self.query.of_type(Smartphone).where("quantity", ">", 0).all()
+        self.assertEqual(in_stock, [self.phones[0], self.phones[2]])
+
+        cheap = self.query.where("price", "<", 2000).where("country", "==", "Нидерланды").all()
+        self.assertEqual([product.name for product in cheap], ["GreenField", "Луг"])
+        colored = self.query.where("color", "in", {"Gray", "Зелёный"})
+        self.assertEqual([product.name for product in colored], ["iPhone 15", "GreenField", "Луг"])
+        self.assertEqual(self.query.where("type", "==", "lawn_grass").count(), 3)
+        with self.assertRaises(ValueError):
+            self.query.where("price", "~", 1)
+
+    def test_order_and_top(self):
+        """Проверка сортировки и top-k по числовым и строковым полям."""
+        self.assertEqual(self.query.top(2), [self.phones[0], self.phones[2]])
+        cheapest = self.query.top(2, "price", largest=False)
+        self.assertEqual([product.name for product in cheapest], ["Луг", "Чехол"])
+        by_quantity = self.query.where("price", "<", 3000).order_by("quantity").all()
+        self.assertEqual([product.quantity for product in by_quantity], [15, 20, 30, 100])
+
+        # Товары без поля идут в конце
+        by_memory = self.query.order_by("memory", descending=True).limit(5).all()
+        self.assertEqual([product.name for product in by_memory[:3]], ["iPhone 15", "Xiaomi", "Pixel"])
+        self.assertEqual(by_memory[3], self.case)
+        self.assertEqual(self.query.order_by("name").limit(2).explain(), ["top-2 через кучу: name по возрастанию"])
+
+    def test_group_by(self):
+        """Проверка группировки с суммами, как у Category.middle_price."""
+        stats = self.query.of_type(LawnGrass).group_by("country")
+        self.assertEqual(list(stats), ["Нидерланды", "Германия"])
+        self.assertEqual(stats["Нидерланды"]["count"], 2)
+        self.assertEqual(stats["Нидерланды"]["total_value"], 1500.0 * 20 + 500.0 * 100)
+        self.assertEqual(stats["Нидерланды"]["middle_price"], round((1500.0 * 20 + 500.0 * 100) / 120, 2))
+        self.assertEqual((stats["Германия"]["min_price"], stats["Германия"]["max_price"]), (2500.0, 2500.0))
+
+        by_category = self.query.group_by("category")
+        self.assertEqual(by_category["Смартфоны"]["middle_price"], self.categories[0].middle_price())
+        self.assertEqual(by_category["Трава"]["middle_price"], self.categories[1].middle_price())
+
+    def test_stable_smallest(self):
+        """Проверка выбора k наименьших без полной сортировки: равные значения - по позиции."""
+        values = np.array([5, 1, 3, 1, 2, 1])
+        self.assertEqual(_stable_smallest(values, 2).tolist(), [1, 3])
+        self.assertEqual(_stable_smallest(values, 4).tolist(), [1, 3, 5, 4])
+        self.assertEqual(_stable_smallest(values, 10).tolist(), [1, 3, 5, 4, 2, 0])
+        self.assertEqual(_stable_smallest(values, 0).tolist(), [])
+
+    def test_empty_limit(self):
+        """Проверка, что top(0) и limit(0) дают пустую выборку, а отрицательный размер - ошибка."""
+        self.assertEqual(self.query.top(0), [])
+        self.assertEqual(self.query.order_by("price").limit(0).all(), [])
+        self.assertEqual(self.query.order_by("name").limit(0).all(), [])
+        self.assertEqual(self.query.limit(0).all(), [])
+        with self.assertRaises(ValueError):
+            self.query.top(-1)
+
+
+if __name__ == "__main__":
+    unittest.main()
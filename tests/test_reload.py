@@ -0,0 +1,145 @@
+import copy
+import json
+import os
+import tempfile
+import unittest
+
+from src.catalog_index import CatalogIndex
+from src.load_products import load_categories_from_json
+from src.main import Category, LawnGrass, Product, Smartphone
+from src.product_logging import bulk_load
+from src.reload import reload_categories_from_json
+
+CATALOG = [
+    {
+        "name": "Смартфоны",
+        "description": "Категория телефонов",
+        "products": [
+            {
+                "name": "iPhone 15",
+                "description": "512GB",
+                "price": 210000.0,
+                "quantity": 8,
+                "efficiency": "A16",
+                "model": "Pro",
+                "memory": 512,
+                "color": "Gray",
+            },
+            {"name": "Чехол", "description": "Силикон", "price": 990.0, "quantity": 3},
+        ],
+    },
+    {
+        "name": "Газонная трава",
+        "description": "Категория трав",
+        "products": [
+            {
+                "name": "GreenField",
+                "description": "Газонная трава",
+                "price": 1500.0,
+                "quantity": 20,
+                "country": "Нидерланды",
+                "germination_period": "2 недели",
+                "color": "Зелёный",
+            }
+        ],
+    },
+]
+
+
+class TestReload(unittest.TestCase):
+    def setUp(self):
+        Category.category_count = 0
+        Category.product_count = 0
+        self.tmp = tempfile.TemporaryDirectory()
+        self.file_path = os.path.join(self.tmp.name, "products.json")
+        self._write(CATALOG)
+        with bulk_load():
+            self.categories = load_categories_from_json(self.file_path)
+        self.phones, self.grass = self.categories
+
+    def tearDown(self):
+        self.tmp.cleanup()
+
+    def _write(self, data):
+        with open(self.file_path, "w", encoding="utf-8") as file:
+            json.dump(data, file, ensure_ascii=False)
+
+    def test_no_changes(self):
+        """Проверка, что повторная загрузка того же файла ничего не меняет."""
+        products = [product for category in self.categories for product in category.products]
+        summary = reload_categories_from_json(self.categories, self.file_path)
+        self.assertEqual(set(summary.values()), {0})
+        self.assertEqual([product for category in self.categories for product in category.products], products)
+        self.assertEqual((Category.category_count, Category.product_count), (2, 3))
+
+    def test_apply_changes(self):
+        """Проверка обновления, добавления и удаления товаров с сохранением идентичности объектов."""
+        iphone, case = self.phones.products
+        grass = self.grass.products[0]
+        index = CatalogIndex(self.categories)
+        events = []
+        self.phones.add_listener(lambda product, field, old, new: events.append((field, old, new)))
+
+        data = copy.deepcopy(CATALOG)
+        data[0]["products"][0].update(price=190000.0, quantity=5)
+        del data[0]["products"][1]
+        data[0]["products"].append({"name": "Зарядка", "description": "65W", "price": 3500.0, "quantity": 10})
+        self._write(data)
+
+        with bulk_load():
+            summary = reload_categories_from_json(self.categories, self.file_path)
+
+        self.assertEqual(
+            summary, {"added": 1, "updated": 1, "removed": 1, "categories_added": 0, "categories_removed": 0}
+        )
+        self.assertIs(self.phones.products[0], iphone)
+        self.assertEqual((iphone.price, iphone.quantity), (190000.0, 5))
+        self.assertIs(self.grass.products[0], grass)
+        self.assertEqual([product.name for product in self.phones.products], ["iPhone 15", "Зарядка"])
+        self.assertEqual(self.phones.middle_price(), round((190000.0 * 5 + 3500.0 * 10) / 15, 2))
+        self.assertIn(("products", case, None), events)
+        self.assertEqual(index.get("Чехол"), [])
+        self.assertEqual(len(index.get("Зарядка")), 1)
+        self.assertEqual((Category.category_count, Category.product_count), (2, 3))
+
+        # Удаленный товар больше не связан с категорией
+        case.quantity = 100
+        self.assertEqual(self.phones._totals()[1], 15)
+
+    def test_categories_and_class_change(self):
+        """Проверка добавления и удаления категорий и смены класса товара."""
+        data = copy.deepcopy(CATALOG)
+        data[0]["products"][1] = dict(data[0]["products"][0], name="Чехол")
+        del data[1]
+        data.append(
+            {"name": "Ноутбуки", "description": "Категория ноутбуков", "products": [CATALOG[0]["products"][1]]}
+        )
+        self._write(data)
+
+        with bulk_load():
+            summary = reload_categories_from_json(self.categories, self.file_path)
+
+        self.assertEqual(
+            summary, {"added": 1, "updated": 1, "removed": 1, "categories_added": 1, "categories_removed": 1}
+        )
+        self.assertEqual([category.name for category in self.categories], ["Смартфоны", "Ноутбуки"])
+        self.assertIsInstance(self.phones.products[1], Smartphone)
+        self.assertIs(type(self.categories[1].products[0]), Product)
+        self.assertEqual((Category.category_count, Category.product_count), (2, 3))
+
+    def test_invalid_file_keeps_catalog(self):
+        """Проверка, что при ошибке в новых данных каталог не меняется."""
+        data = copy.deepcopy(CATALOG)
+        data[0]["products"][0]["price"] = 200000.0
+        data[1]["products"][0]["price"] = 0
+        self._write(data)
+
+        with self.assertRaises(ValueError):
+            reload_categories_from_json(self.categories, self.file_path)
+        self.assertEqual(self.phones.products[0].price, 210000.0)
+        self.assertIsInstance(self.grass.products[0], LawnGrass)
+        self.assertEqual((Category.category_count, Category.product_count), (2, 3))
+
+
+if __name__ == "__main__":
+    unittest.main()
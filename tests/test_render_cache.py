@@ -0,0 +1,64 @@
+import gc
+import unittest
+
+from src.main import Category, LawnGrass, Product, Smartphone
+from src.render_cache import RenderCache
+
+
+class TestRenderCache(unittest.TestCase):
+    def setUp(self):
+        self.cache = RenderCache(maxsize=2)
+        self.phone = Smartphone("iPhone 15", "512GB", 200000, 5, "A16", "Pro", 512, "Gray")
+
+    def test_hit_and_invalidation(self):
+        """Проверка повторного использования строки и ее перерисовки при изменении полей."""
+        self.assertEqual(self.cache.render(self.phone), "iPhone 15 (Pro), 512GB, Gray, 200000 руб. Остаток: 5 шт.")
+        self.cache.render(self.phone)
+        self.assertEqual((self.cache.hits, self.cache.misses), (1, 1))
+
+        self.phone.price = 150000
+        self.phone.color = "Black"
+        self.assertEqual(self.cache.render(self.phone), "iPhone 15 (Pro), 512GB, Black, 150000 руб. Остаток: 5 шт.")
+        self.phone.quantity = 1
+        self.assertIn("Остаток: 1 шт.", self.cache.render(self.phone))
+        self.assertEqual(self.cache.misses, 3)
+
+    def test_lru_bound(self):
+        """Проверка, что размер кэша ограничен и вытесняются давно не использованные записи."""
+        product = Product("Товар", "Описание", 100.0, 1)
+        grass = LawnGrass("GreenField", "Газонная трава", 1500.0, 20, "Нидерланды", "2 недели", "Зелёный")
+        self.cache.render(self.phone)
+        self.cache.render(product)
+        self.cache.render(self.phone)
+        self.cache.render(grass)
+        self.assertEqual(len(self.cache), 2)
+        self.cache.render(self.phone)
+        self.assertEqual(self.cache.hits, 2)
+
+    def test_dead_product_not_reused(self):
+        """Проверка, что запись умершего товара не отдается новому объекту с тем же id."""
+        product = Product("Старый", "Описание", 100.0, 1)
+        self.cache.render(product)
+        key = id(product)
+        del product
+        gc.collect()
+        entry = self.cache._entries[key]
+        self.assertIsNone(entry[0]())
+
+    def test_formatted_products_cached(self):
+        """Проверка, что formatted_products пересобирается только после изменений."""
+        product = Product("Товар", "Описание", 100.0, 2)
+        category = Category("Категория", "Описание", [product, self.phone])
+        first = category.formatted_products()
+        self.assertIs(category.formatted_products(), first)
+
+        product.price = 300.0
+        self.assertIn("Товар, 300.0 руб. Остаток: 2 шт.", category.formatted_products())
+        category.add_product(Product("Новый", "Описание", 1.0, 1))
+        self.assertTrue(category.formatted_products().endswith("Новый, 1.0 руб. Остаток: 1 шт."))
+        category.products.append(Product("Мимо", "Описание", 1.0, 1))
+        self.assertTrue(category.formatted_products().endswith("Мимо, 1.0 руб. Остаток: 1 шт."))
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,103 @@
+import json
+import os
+import shutil
+import tempfile
+import unittest
+from unittest.mock import patch
+
+from src.load_products import _data_file_path, load_categories_from_json
+from src.main import Category, LawnGrass, Product
+from src.snapshot import SnapshotStore, is_snapshot_fresh, load_catalog, load_snapshot, save_snapshot
+
+
+class TestSnapshot(unittest.TestCase):
+    def setUp(self):
+        self.tmp = tempfile.TemporaryDirectory()
+        self.source = os.path.join(self.tmp.name, "products.json")
+        self.snapshot = os.path.join(self.tmp.name, "products.json.snapshot")
+        shutil.copy(_data_file_path("products.json"), self.source)
+
+    def tearDown(self):
+        self.tmp.cleanup()
+
+    def test_round_trip(self):
+        """Проверка, что каталог из снимка совпадает с загруженным из JSON."""
+        categories = load_categories_from_json(self.source)
+        categories.append(Category("Целые цены", "Описание", [Product("Телевизор", "4K", 200000, 2)]))
+        save_snapshot(categories, self.snapshot, self.source)
+        restored = load_snapshot(self.snapshot)
+
+        self.assertEqual([c.name for c in restored], [c.name for c in categories])
+        self.assertEqual([c.description for c in restored], [c.description for c in categories])
+        self.assertEqual([str(c) for c in restored], [str(c) for c in categories])
+        self.assertEqual([c.middle_price() for c in restored], [c.middle_price() for c in categories])
+        self.assertEqual([c.formatted_products() for c in restored], [c.formatted_products() for c in categories])
+        self.assertIsInstance(restored[2].products[0], LawnGrass)
+
+    def test_lazy_materialization(self):
+        """Проверка, что товары создаются только при обращении и изменения учитываются в категории."""
+        save_snapshot(load_categories_from_json(self.source), self.snapshot, self.source)
+        category = load_snapshot(self.snapshot)[0]
+        self.assertIsInstance(category.products, SnapshotStore)
+        self.assertEqual(len(category.products._views), 0)
+
+        product = category.products[1]
+        product.price = 1000.0
+        self.assertEqual(category.products.record(1)["price"], 1000.0)
+        category.debug = True
+        self.assertEqual(category.middle_price(), round((180000.0 * 5 + 1000.0 * 8 + 31000.0 * 14) / 27, 2))
+
+        category.add_product(Product("Новый", "Описание", 100, 3))
+        self.assertEqual(str(category), "Смартфоны, количество продуктов: 30 шт.")
+        self.assertEqual(category.products[3].name, "Новый")
+        self.assertIn("Новый, 100 руб.", category.formatted_products())
+
+    def test_load_catalog_invalidation(self):
+        """Проверка, что снимок пересоздается при изменении исходного JSON."""
+        categories = load_catalog(self.source, self.snapshot)
+        self.assertIsInstance(categories[0].products, list)
+        self.assertTrue(is_snapshot_fresh(self.snapshot, self.source))
+        self.assertIsInstance(load_catalog(self.source, self.snapshot)[0].products, SnapshotStore)
+
+        # Изменилось только время модификации - снимок остается свежим
+        os.utime(self.source, ns=(0, 10**9))
+        self.assertTrue(is_snapshot_fresh(self.snapshot, self.source))
+
+        with open(self.source, "w", encoding="utf-8") as file:
+            json.dump([{"name": "Новая", "description": "Описание", "products": []}], file)
+        self.assertFalse(is_snapshot_fresh(self.snapshot, self.source))
+        Category.category_count = 0
+        categories = load_catalog(self.source, self.snapshot)
+        self.assertEqual([c.name for c in categories], ["Новая"])
+        self.assertEqual(Category.category_count, 1)
+        self.assertEqual([c.name for c in load_snapshot(self.snapshot)], ["Новая"])
+
+    def test_load_catalog_write_errors(self):
+        """Проверка, что ошибка записи снимка не мешает загрузке, а при ошибке JSON снимок не пишется."""
+        with patch("builtins.open", side_effect=_fail_snapshot_open(open)), patch("builtins.print"):
+            categories = load_catalog(self.source, self.snapshot)
+        self.assertEqual([c.name for c in categories], [c.name for c in load_categories_from_json(self.source)])
+        self.assertFalse(os.path.exists(self.snapshot))
+        self.assertFalse(os.path.exists(self.snapshot + ".tmp"))
+
+        with open(self.source, "w", encoding="utf-8") as file:
+            file.write("[{")
+        with patch("builtins.print"):
+            self.assertEqual(load_catalog(self.source, self.snapshot), [])
+        self.assertFalse(os.path.exists(self.snapshot))
+
+
+def _fail_snapshot_open(real_open):
+    """Обертка open, которая падает с OSError на записи, как в каталоге только для чтения."""
+
+    def fake_open(path, mode="r", *args, **kwargs):
+        if "w" in mode:
+            real_open(path, mode, *args, **kwargs).close()  # Файл успевает появиться, как при нехватке места
+            raise OSError(28, "No space left on device")
+        return real_open(path, mode, *args, **kwargs)
+
+    return fake_open
+
+
+if __name__ == "__main__":
+    unittest.main()
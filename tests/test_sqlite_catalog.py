@@ -0,0 +1,144 @@
+import json
+import os
+import sqlite3
+import tempfile
+import unittest
+from concurrent.futures import ThreadPoolExecutor
+
+from src.load_products import load_categories_from_json
+from src.main import Category, Product, Smartphone
+from src.product_logging import bulk_load
+from src.sqlite_catalog import SqliteCatalog
+
+CATALOG = [
+    {
+        "name": "Смартфоны",
+        "description": "Смартфоны для связи",
+        "products": [
+            {
+                "name": "iPhone 15",
+                "description": "512GB, Gray",
+                "price": 210000.0,
+                "quantity": 8,
+                "efficiency": "A16",
+                "model": "Pro",
+                "memory": 512,
+                "color": "Gray",
+            },
+            {"name": "Чехол", "description": "Силикон", "price": 990.0, "quantity": 3},
+        ],
+    },
+    {"name": "Пустая", "description": "Без товаров", "products": []},
+    {
+        "name": "Телевизоры",
+        "description": "Категория телевизоров",
+        "products": [{"name": '55" QLED 4K', "description": "Фоновая подсветка", "price": 123000.0, "quantity": 7}],
+    },
+]
+
+
+class TestSqliteCatalog(unittest.TestCase):
+    def setUp(self):
+        self.tmp = tempfile.TemporaryDirectory()
+        self.json_path = os.path.join(self.tmp.name, "catalog.json")
+        with open(self.json_path, "w", encoding="utf-8") as file:
+            json.dump(CATALOG, file, ensure_ascii=False)
+        self.db_path = os.path.join(self.tmp.name, "catalog.db")
+        self.catalog = SqliteCatalog(self.db_path)
+        self.assertEqual(self.catalog.import_json(self.json_path), 3)
+
+    def tearDown(self):
+        self.catalog.close()
+        self.tmp.cleanup()
+
+    def test_import_and_aggregates(self):
+        """Проверка импорта и агрегатов SQL: результаты совпадают с категориями в памяти."""
+        with bulk_load():
+            expected = load_categories_from_json(self.json_path)
+        self.assertEqual(self.catalog.counts(), (3, 3))
+        self.assertEqual(self.catalog.category_names(), [c["name"] for c in CATALOG])
+        stats = self.catalog.category_stats()
+        for category in expected:
+            self.assertEqual(self.catalog.middle_price(category.name), category.middle_price())
+            self.assertEqual(stats[category.name]["count"], len(category.products))
+        self.assertEqual(stats["Пустая"]["middle_price"], 0)
+        self.assertEqual(stats["Смартфоны"]["max_price"], 210000.0)
+
+        (phone,) = self.catalog.find_products("iPhone 15")
+        self.assertIsInstance(phone, Smartphone)
+        self.assertEqual(phone.to_dict(), CATALOG[0]["products"][0])
+        self.assertEqual([p.name for p in self.catalog.price_range(1000, 200000)], ['55" QLED 4K'])
+
+        # Повторный импорт заменяет категории, а не дублирует их
+        self.catalog.import_json(self.json_path)
+        self.assertEqual(self.catalog.counts(), (3, 3))
+
+    def test_invalid_import_writes_nothing(self):
+        """Проверка, что ошибка валидации отменяет весь импорт."""
+        product = {"name": "X", "description": "", "price": -1, "quantity": 1}
+        bad = [{"name": "Новая", "description": "Плохая", "products": [product]}]
+        with open(self.json_path, "w", encoding="utf-8") as file:
+            json.dump(bad, file, ensure_ascii=False)
+        with self.assertRaises(ValueError):
+            self.catalog.import_json(self.json_path)
+        self.assertEqual(self.catalog.counts(), (3, 3))
+
+    def test_write_through(self):
+        """Проверка, что изменения категорий из базы сохраняются и видны после повторного открытия."""
+        phones, empty, tvs = self.catalog.load_categories()
+        self.assertEqual([p.to_dict() for p in phones], CATALOG[0]["products"])
+        self.assertEqual(len(self.catalog.load_categories(["Телевизоры"])), 1)
+
+        phones.products[0].price = 150000.0
+        phones.products[0].color = "Black"
+        phones.remove_product(phones.products[1])
+        with bulk_load():
+            empty.add_product(Product("Кабель", "USB-C", 500.0, 2))
+        tvs.products[0].quantity = 0
+
+        reopened = SqliteCatalog(self.db_path)
+        try:
+            phones_db, empty_db, tvs_db = reopened.load_categories(write_through=False)
+            self.assertEqual([(p.name, p.price, p.color) for p in phones_db], [("iPhone 15", 150000.0, "Black")])
+            self.assertEqual([p.name for p in empty_db], ["Кабель"])
+            self.assertEqual(reopened.middle_price("Смартфоны"), phones.middle_price())
+            self.assertEqual(reopened.middle_price("Телевизоры"), 0)
+            self.assertEqual(reopened.counts(), (3, 3))
+        finally:
+            reopened.close()
+
+    def test_int_price_round_trip(self):
+        """Проверка, что целая цена возвращается из базы как int, а дробная - как float."""
+        with bulk_load():
+            products = [Product("TV", "4K", 200000, 2), Product("Пульт", "ИК", 990.5, 1)]
+            category = Category("Техника", "Телевизоры", products)
+        self.catalog.save_categories([category])
+
+        (loaded,) = self.catalog.load_categories(["Техника"])
+        self.assertEqual([type(p.price) for p in loaded], [int, float])
+        self.assertEqual(loaded.formatted_products(), category.formatted_products())
+        self.assertIn("TV, 200000 руб.", loaded.formatted_products())
+        self.assertIs(type(self.catalog.find_products("TV")[0].price), int)
+
+    def test_save_categories_and_wal(self):
+        """Проверка сохранения категорий из памяти, режима WAL и параллельного чтения из пула."""
+        with bulk_load():
+            category = Category("Аксессуары", "Мелочи", [Product("Кабель", "USB-C", 500.0, 2)])
+        self.catalog.save_categories([category])
+        self.assertEqual(self.catalog.middle_price("Аксессуары"), 500.0)
+
+        connection = sqlite3.connect(self.db_path)
+        try:
+            self.assertEqual(connection.execute("PRAGMA journal_mode").fetchone()[0], "wal")
+        finally:
+            connection.close()
+
+        names = ["Смартфоны", "Телевизоры", "Аксессуары"] * 20
+        with ThreadPoolExecutor(max_workers=8) as executor:
+            prices = list(executor.map(self.catalog.middle_price, names))
+        self.assertEqual(prices[:3], [self.catalog.middle_price(name) for name in names[:3]])
+        self.assertLessEqual(len(self.catalog.pool._connections), self.catalog.pool.size)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,120 @@
+import gc
+import os
+import threading
+import unittest
+
+from src.main import BaseProduct, Category, LawnGrass, Product, Smartphone
+from src.order_engine import OrderEngine
+from src.product_logging import bulk_load
+from src.query import Query
+from src.tiered_store import TieredStore, _sizeof
+
+
+class TestTieredStore(unittest.TestCase):
+    def setUp(self):
+        with bulk_load():
+            products = [Product(f"Товар {i}", "Описание", 100.0 + i, i + 1) for i in range(20)]
+            products.append(Smartphone("iPhone 15", "512GB", 210000.0, 5, "A16", "Pro", 512, "Gray"))
+            products.append(LawnGrass("GreenField", "Газонная трава", 1500.0, 20, "Нидерланды", "2 недели", "Зелёный"))
+        self.records = [(type(product), product.to_dict()) for product in products]
+        self.budget = _sizeof(products[0]) * 3
+        self.store = TieredStore(products, budget_bytes=self.budget)
+        del products
+        gc.collect()
+
+    def tearDown(self):
+        self.store.close()
+
+    def test_budget_and_rehydration(self):
+        """Проверка, что в памяти остается не больше бюджета, а вытесненные товары восстанавливаются с диска."""
+        self.assertLessEqual(self.store.memory_bytes, self.budget)
+        self.assertLessEqual(len(self.store._hot), 3)
+        self.assertGreater(self.store.evictions, 0)
+
+        product = self.store[0]
+        self.assertEqual((type(product), product.to_dict()), self.records[0])
+        self.assertEqual(self.store.misses, 1)
+        self.assertIs(self.store[0], product)
+        self.assertEqual(self.store.hits, 1)
+
+        self.assertEqual([(type(p), p.to_dict()) for p in self.store], self.records)
+        self.assertLessEqual(self.store.memory_bytes, self.budget)
+        stats = self.store.stats()
+        self.assertEqual(stats["budget_bytes"], self.budget)
+        self.assertEqual(stats["hits"] + stats["misses"], 2 + len(self.records))
+
+    def test_changes_survive_eviction(self):
+        """Проверка, что изменения товара записываются на диск и видны после вытеснения."""
+        category = Category("Склад", "Товары на диске", self.store)
+        phone = self.store[20]
+        phone.price = 150000.0
+        phone.color = "Black"
+        del phone
+        for product in self.store:
+            pass
+        gc.collect()
+
+        phone = self.store[20]
+        self.assertEqual((phone.price, phone.color), (150000.0, "Black"))
+        self.assertEqual(self.store.record(20)["color"], "Black")
+        expected = sum(record["price"] * record["quantity"] for _, record in self.records[:20])
+        expected += 150000.0 * 5 + 1500.0 * 20
+        quantity = sum(record["quantity"] for _, record in self.records)
+        self.assertEqual(category.middle_price(), round(expected / quantity, 2))
+
+    def test_sold_out_product_survives_eviction(self):
+        """Проверка, что распроданный товар восстанавливается с диска после вытеснения."""
+        category = Category("Склад", "Товары на диске", self.store)
+        product = self.store[0]
+        OrderEngine().process([(product, product.quantity)])
+        del product
+        for _ in self.store:
+            pass
+        gc.collect()
+
+        self.assertEqual(self.store[0].quantity, 0)
+        self.assertIn("Товар 0, 100.0 руб. Остаток: 0 шт.", category.formatted_products())
+
+    def test_concurrent_add_and_rehydrate(self):
+        """Проверка отсутствия взаимной блокировки: добавление в категорию и восстановление товаров с диска."""
+        category = Category("Склад", "Товары на диске", self.store)
+        BaseProduct.thread_safe = True
+        self.addCleanup(setattr, BaseProduct, "thread_safe", False)
+
+        def add(number):
+            for i in range(200):
+                with bulk_load():
+                    category.add_product(Product(f"Новый {number}-{i}", "Описание", 10.0, 1))
+
+        def read():
+            for _ in range(20):
+                for product in self.store:
+                    product.price = product.price
+
+        threads = [threading.Thread(target=add, args=(n,), daemon=True) for n in range(2)]
+        threads += [threading.Thread(target=read, daemon=True) for _ in range(2)]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join(timeout=30)
+        self.assertFalse(any(thread.is_alive() for thread in threads))
+        self.assertEqual(len(self.store), len(self.records) + 400)
+
+    def test_query_without_rehydration(self):
+        """Проверка запросов и группировки по хранилищу: строковые поля читаются из записей."""
+        misses = self.store.misses
+        category = Category("Склад", "Товары на диске", self.store)
+        self.assertEqual(Query([category]).where("country", "==", "Нидерланды").count(), 1)
+        self.assertEqual(Query([category]).of_type(Smartphone).group_by("color")["Gray"]["count"], 1)
+        self.assertEqual(self.store.misses, misses)
+
+    def test_close_removes_file(self):
+        """Проверка удаления временного файла базы при закрытии."""
+        path = self.store.path
+        self.assertTrue(os.path.isfile(path))
+        self.store.close()
+        self.assertFalse(os.path.isfile(path))
+
+
+if __name__ == "__main__":
+    unittest.main()